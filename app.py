@@ -18,6 +18,7 @@ import logging
 # =================================================
 # 외부 라이브러리
 # =================================================
+import click
 import requests
 from flask import Flask, request, jsonify, Response, g, send_from_directory
 from flask_cors import CORS
@@ -28,7 +29,7 @@ from flask_cors import CORS
 from config import (
     API_URLS, HEADERS,
     GOOGLE_SHEET_TITLE, SHEET_KEY,
-    OPENAI_API_KEY, OPENAI_API_URL, MEMBERSLIST_API_URL, openai_client,
+    OPENAI_API_KEY, OPENAI_API_URL, MEMBERSLIST_API_URL,
     SHEET_MAP,
 )
 
@@ -40,6 +41,7 @@ from config import (
 from parser import (
     guess_intent,
     preprocess_user_input,
+    cleanup_lookup_commission_rows,
     
 )
 
@@ -147,6 +149,14 @@ from routes.routes_order import handle_order_save
 from routes.routes_order import parse_and_save_order
 
 from utils.sheets import get_spreadsheet
+from utils.instrument import init_instrumentation, annotate
+from utils.journal import init_journal
+from utils.metrics import init_metrics
+from utils.log import configure_logging
+from utils.response_cache import init_response_cache
+from utils.response_encoding import init_response_encoding
+from utils.row_ids import MANAGED_SHEETS, ensure_id_column
+from utils.unit_of_work import unit_of_work
 
 
 
@@ -170,8 +180,11 @@ PROMPT_VERSION = os.getenv("PROMPT_VERSION")
 # --------------------------------------------------
 MEMBERSLIST_API_URL = os.getenv("MEMBERSLIST_API_URL")
 
-print("✅ OPENAI_API_KEY 세팅됨:", bool(OPENAI_API_KEY))
-print("✅ OPENAI_API_URL:", OPENAI_API_URL)
+# ✅ 로깅 설정 (LOG_LEVEL / LOG_FORMAT 환경변수)
+configure_logging()
+logger = logging.getLogger(__name__)
+
+logger.debug("OPENAI_API_KEY 세팅됨: %s, OPENAI_API_URL: %s", bool(OPENAI_API_KEY), OPENAI_API_URL)
 
 
 
@@ -179,6 +192,19 @@ print("✅ OPENAI_API_URL:", OPENAI_API_URL)
 app = Flask(__name__)
 CORS(app)  # ← 추가
 
+# ✅ 요청 단위 외부 호출 계측 (Server-Timing / 구조화 로그) — 다른 before_request 보다 먼저 등록
+init_instrumentation(app)
+init_metrics(app, INTENT_MAP.keys())
+
+# ✅ JSON 직렬화(orjson, 필드 순서 유지) + gzip/br 압축 — 응답 캐시보다 먼저 등록 (캐시는 압축 전 본문 보관)
+init_response_encoding(app)
+
+# ✅ 읽기 intent 응답 캐시 + ETag (시트 쓰기 시 무효화)
+init_response_cache(app)
+
+# ✅ 일지 write-behind 기록기 — 워커 첫 요청 때 시작 (미반영 행 재생 / 종료된 워커 로그 인수)
+init_journal(app)
+
 # --------------------------------------------------
 # 📌 OpenAPI 스펙 반환
 # --------------------------------------------------
@@ -215,8 +241,8 @@ def plugin_logo():
 
 # ✅ 확인용 출력 (선택)
 if os.getenv("DEBUG", "false").lower() == "true":
-    print("✅ GOOGLE_SHEET_TITLE:", os.getenv("GOOGLE_SHEET_TITLE"))
-    print("✅ GOOGLE_SHEET_KEY 존재 여부:", "Yes" if os.getenv("GOOGLE_SHEET_KEY") else "No")
+    logger.info("GOOGLE_SHEET_TITLE: %s", os.getenv("GOOGLE_SHEET_TITLE"))
+    logger.info("GOOGLE_SHEET_KEY 존재 여부: %s", "Yes" if os.getenv("GOOGLE_SHEET_KEY") else "No")
 
 
 # --------------------------------------------------
@@ -254,18 +280,10 @@ def debug_sheets():
             ws = get_worksheet(target)
             headers = ws.row_values(1)
 
-        # ✅ 여기서 json.dumps + ensure_ascii=False 사용
-        return app.response_class(
-            response=json.dumps({"sheets": sheet_names, "headers": headers}, ensure_ascii=False),
-            status=200,
-            mimetype="application/json"
-        )
+        # ✅ app.json(FastJSONProvider) 이 한글 그대로 출력
+        return jsonify({"sheets": sheet_names, "headers": headers}), 200
     except Exception as e:
-        return app.response_class(
-            response=json.dumps({"error": str(e)}, ensure_ascii=False),
-            status=500,
-            mimetype="application/json"
-        )
+        return jsonify({"error": str(e)}), 500
 
 
 
@@ -356,23 +374,23 @@ def preprocess_member_query(text: str) -> str:
 
     # 1. 회원번호 (숫자만)
     if text.isdigit():
-        print(f"[preprocess_member_query] 회원번호 감지 → {text}")
+        logger.debug("[preprocess_member_query] 회원번호 감지 → %s", text)
         return text
 
     # 2. 휴대폰 번호 (010-xxxx-xxxx or 010xxxxxxxx)
     phone_pattern = r"^010[-]?\d{4}[-]?\d{4}$"
     if re.fullmatch(phone_pattern, text):
-        print(f"[preprocess_member_query] 휴대폰번호 감지 → {text}")
+        logger.debug("[preprocess_member_query] 휴대폰번호 감지 → %s", text)
         return text
 
     # 3. 한글 이름 (2~4자)
     name_pattern = r"^[가-힣]{2,4}$"
     if re.fullmatch(name_pattern, text):
-        print(f"[preprocess_member_query] 한글이름 감지 → {text}")
+        logger.debug("[preprocess_member_query] 한글이름 감지 → %s", text)
         return text
 
     # 4. 기본 (변경 없음)
-    print(f"[preprocess_member_query] 보정 없음 → {text}")
+    logger.debug("[preprocess_member_query] 보정 없음 → %s", text)
     return text
 
 
@@ -395,15 +413,13 @@ def post_intent():
     raw = request.get_json(silent=True)
 
 
-    print("\n" + "="*80)
-    print("🟢 [STEP 1️⃣] /postIntent 요청 수신")
-    print(f"📦 raw = {raw}")
+    logger.debug("[postIntent] 요청 수신 raw=%s", raw)
 
 
 
     # ✅ 1️⃣ OCR JSON이 포함되어 있을 경우 즉시 /order 로 포워딩
     if isinstance(raw, dict) and "orders" in raw and isinstance(raw["orders"], list):
-        print("[🖼️] postIntent 요청 내에 OCR JSON 감지 → /order 라우트로 포워딩")
+        logger.info("[postIntent] OCR JSON 감지 → /order 라우트로 포워딩")
         return post_order()  # /order 함수 직접 호출    
 
 
@@ -422,7 +438,7 @@ def post_intent():
 
 
     text = data.get("text") or data.get("query") or ""
-    print(f"[DEBUG] text type: {type(text)}, value: {text}")
+    logger.debug("[postIntent] text type=%s, value=%s", type(text).__name__, text)
 
     if isinstance(text, str):
         text = text.strip()
@@ -445,14 +461,14 @@ def post_intent():
         parsed = nlu_to_pc_input(text)
         g.intent = intent
         g.query = parsed.get("query", {}) or {}
-        print(f"[INTENT 규칙 기반 처리] intent={intent}, query={g.query}")
+        logger.debug("[INTENT 규칙 기반 처리] intent=%s, query=%s", intent, g.query)
     else:
         # ✅ 2단계: NLU fallback
         parsed = nlu_to_pc_input(text)
         intent = parsed.get("intent", "unknown")
         g.intent = intent
         g.query = parsed.get("query", {}) or {}
-        print(f"[INTENT NLU fallback 처리] intent={intent}, query={g.query}")
+        logger.debug("[INTENT NLU fallback 처리] intent=%s, query=%s", intent, g.query)
 
     # ✅ intent 기반 전처리
     initial_text = text
@@ -480,7 +496,9 @@ def post_intent():
         g.query["raw_text"] = initial_text  # 원본 자연어 그대로 저장    
         
     
-    print(f"[INTENT 최종 확정 결과] intent={intent}, query={g.query}")
+    logger.info("[INTENT 최종 확정 결과] intent=%s", intent)
+    logger.debug("[INTENT 최종 확정 결과] query=%s", g.query)
+    annotate(intent=intent)
 
 
     # ✅ keywords 보정 (검색어 → keywords로 변환)
@@ -504,9 +522,9 @@ def post_intent():
             name_match = re.match(r"([가-힣]{2,4})(?:\s*(전체정보|상세|info))?", text)
             if name_match:
                 member_name = name_match.group(1)
-                print(f"[AUTO] 세션 없이 '{member_name}' 전체정보 검색 시도")
+                logger.debug("[AUTO] 세션 없이 '%s' 전체정보 검색 시도", member_name)
 
-                results = find_member_logic(member_name)
+                results = find_member_logic(member_name, paged=False)
                 if results.get("status") == "success":
                     return jsonify({
                         "status": "success",
@@ -620,12 +638,12 @@ def nlu_to_pc_input(text: str) -> dict:
     # 회원 등록
     if any(word in text for word in ["회원등록", "회원추가", "회원 등록", "회원 추가"]):
         # ✅ 케이스3: "<이름> 회원 등록 ..." → 이름 + 나머지
-        print("[DEBUG] 회원등록 케이스3 매치 시도:", text)
+        logger.debug("회원등록 케이스3 매치 시도: %s", text)
         # 더 안전한 대안 (이름에서 '회원'이 분리된 경우만 추출)
         m = re.match(r"(?<!\S)([가-힣]{2,10})\s+회원\s*(등록|추가)\s*(.*)", text)
 
         if m:
-            print("[DEBUG] 회원등록 케이스3 성공:", m.groups())
+            logger.debug("회원등록 케이스3 성공: %s", m.groups())
             member_name, _, extra = m.groups()
             return {
                 "intent": "register_member",
@@ -914,6 +932,7 @@ def member_route():
 
     # ✅ (1) intent 직접 지정된 경우
     if intent and intent in MEMBER_INTENTS:
+        annotate(intent=intent)
         func = MEMBER_INTENTS[intent]
 
         if intent in ("register_member", "update_member", "save_member"):
@@ -989,6 +1008,7 @@ def member_route():
 
 
     # ✅ (3) fallback: intent 추론된 상태에서 처리
+    annotate(intent=intent)
     func = MEMBER_INTENTS.get(intent)
     if not func:
         result = {
@@ -1080,6 +1100,7 @@ def memo_route():
             elif "keywords" in data and "일지종류" in data:
                 intent = "memo_search"
 
+        annotate(intent=intent)
         func = MEMO_INTENTS.get(intent)
 
         if not func:
@@ -1250,6 +1271,7 @@ def search_image_route():
         args_copy.update({"keyword": keyword})
         request.args = args_copy
 
+    annotate(intent="search_image")
     return search_image_func()
 
 
@@ -1286,7 +1308,6 @@ LOG_FOLDER = "./logs"
 os.makedirs(LOG_FOLDER, exist_ok=True)
 LOG_FILE = os.path.join(LOG_FOLDER, "order_log.txt")
 
-logging.basicConfig(level=logging.DEBUG)  # 디버그 레벨로 설정
 # ======================================================================================
 # ✅ 제품주문 (자동 분기) intent 기반 단일 라우트
 # ======================================================================================
@@ -1297,11 +1318,6 @@ logging.basicConfig(level=logging.DEBUG)  # 디버그 레벨로 설정
 UPLOAD_FOLDER = "./uploaded_images"
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# ==========================================
-# ✅ Google Sheets 연결
-# ==========================================
-sheet = get_spreadsheet()
-
 @app.route("/static/<path:filename>")
 def serve_uploaded_image(filename):
     """저장된 이미지를 URL로 접근 가능하게 제공"""
@@ -1310,7 +1326,6 @@ def serve_uploaded_image(filename):
 
 
 
-ws = sheet.worksheet("제품주문")
 # ==========================================
 # 🧾 제품 주문 저장 (JSON + multipart 통합)
 # ==========================================
@@ -1329,8 +1344,7 @@ def post_order():
 # - 저장 시: 회원명 ≠ 소비자_고객명 일 수 있음 (정상)
 
     try:
-        print("\n" + "=" * 80)
-        print("🟢 [STEP 1] /order 요청 수신")
+        logger.debug("[order] 요청 수신")
 
         data = request.get_json(silent=True)
         text = ""
@@ -1342,11 +1356,11 @@ def post_order():
         # 1️⃣ JSON or multipart 자동 감지
         # -------------------------------------------------
         if data:
-            print("📦 JSON 기반 요청 감지")
+            logger.debug("[order] JSON 기반 요청 감지")
             text = data.get("query", "") or data.get("text", "")
             orders = data.get("orders", [])
         else:
-            print("📸 multipart/form-data 요청 감지")
+            logger.debug("[order] multipart/form-data 요청 감지")
             text = request.form.get("text", "")
 
             # ✅ 이미지 저장        
@@ -1359,13 +1373,13 @@ def post_order():
                 BASE_URL = os.getenv("BASE_URL", "http://localhost:5000")
                 image_url = f"{BASE_URL}/static/{filename}"
 
-                print(f"📸 이미지 저장 완료: {image_url}")
+                logger.info("[order] 이미지 저장 완료: %s", image_url)
 
                 # ✅ OCR 분석으로 소비자 정보 추출
                 orders = ocr_extract_orders_from_image(save_path)
-                print(f"🧾 OCR 기반 소비자 정보 추출 완료: {orders}")
+                logger.debug("[order] OCR 기반 소비자 정보 추출 완료: %s", orders)
             else:
-                print("⚠️ 이미지 누락 → OCR 불가")
+                logger.warning("[order] 이미지 누락 → OCR 불가")
                 orders = [{
                     "제품명": "",
                     "제품가격": "",
@@ -1378,7 +1392,7 @@ def post_order():
         if not text:
             return jsonify({"status": "error", "message": "❌ text/query 값이 없습니다."}), 400
 
-        print(f"🧾 요청 텍스트: {text}")
+        logger.debug("[order] 요청 텍스트: %s", text)
 
 
 
@@ -1398,54 +1412,55 @@ def post_order():
         회원번호 = member_info.get("회원번호", "")
         회원_휴대폰번호 = member_info.get("휴대폰번호", "")
 
-        print(f"👤 회원명: {회원명}, 회원번호: {회원번호}, 기본휴대폰: {회원_휴대폰번호}")
+        logger.debug("[order] 회원명=%s, 회원번호=%s, 기본휴대폰=%s", 회원명, 회원번호, 회원_휴대폰번호)
 
 
         # -------------------------------------------------
-        # 3️⃣ 주문 정보 저장
+        # 3️⃣ 주문 정보 저장 (N건 → 블록 종료 때 insert_rows 1회)
         # -------------------------------------------------
         saved = []
-        for order in orders:
-            # ✅ OCR 데이터 (소비자 기준)
-            # ⚠️ OCR 결과가 비어 있어도 절대 회원명으로 대체하지 않음
-            소비자_고객명 = (order.get("소비자_고객명") or "").strip()
-            소비자_휴대폰번호 = (order.get("소비자_휴대폰번호") or "").strip()
-            배송처 = (order.get("배송처") or "").strip()
-
-            # ✅ 강제 초기화 (회원명 절대 덮어쓰지 않게)
-            if not 소비자_고객명:
-                소비자_고객명 = ""   # OCR 결과가 없으면 공백 유지
-
-
-            # ✅ 주문서 데이터 구성
-            order_data = {
-                # 🔹 회원 기준 (판매자)
-                "회원명": 회원명,
-                "회원번호": 회원번호,
-                "휴대폰번호": 회원_휴대폰번호,
-
-                # 🔹 소비자 기준 (소비자) → 반드시 이미지 기준
-                "소비자_고객명": 소비자_고객명,
-                "소비자_휴대폰번호": 소비자_휴대폰번호,
-                "배송처": 배송처,
-
-
-                # 🔹 주문 상세
-                "제품명": order.get("제품명", ""),
-                "제품가격": order.get("제품가격", 0),
-                "PV": order.get("PV", 0),
-                "결재방법": "",
-                "수령확인": "",
-                "주문일자": datetime.now().strftime("%Y-%m-%d"),
-            }
+        with unit_of_work():
+            for order in orders:
+                # ✅ OCR 데이터 (소비자 기준)
+                # ⚠️ OCR 결과가 비어 있어도 절대 회원명으로 대체하지 않음
+                소비자_고객명 = (order.get("소비자_고객명") or "").strip()
+                소비자_휴대폰번호 = (order.get("소비자_휴대폰번호") or "").strip()
+                배송처 = (order.get("배송처") or "").strip()
+
+                # ✅ 강제 초기화 (회원명 절대 덮어쓰지 않게)
+                if not 소비자_고객명:
+                    소비자_고객명 = ""   # OCR 결과가 없으면 공백 유지
+
+
+                # ✅ 주문서 데이터 구성
+                order_data = {
+                    # 🔹 회원 기준 (판매자)
+                    "회원명": 회원명,
+                    "회원번호": 회원번호,
+                    "휴대폰번호": 회원_휴대폰번호,
+
+                    # 🔹 소비자 기준 (소비자) → 반드시 이미지 기준
+                    "소비자_고객명": 소비자_고객명,
+                    "소비자_휴대폰번호": 소비자_휴대폰번호,
+                    "배송처": 배송처,
+
+
+                    # 🔹 주문 상세
+                    "제품명": order.get("제품명", ""),
+                    "제품가격": order.get("제품가격", 0),
+                    "PV": order.get("PV", 0),
+                    "결재방법": "",
+                    "수령확인": "",
+                    "주문일자": datetime.now().strftime("%Y-%m-%d"),
+                }
 
             
-            # ✅ 시트 저장
-            result = handle_order_save(order_data)
-            print(f"🧾 저장된 주문 데이터: {result.get('latest_order')}")
-            saved.append(order_data)
+                # ✅ 시트 저장
+                result = handle_order_save(order_data)
+                logger.debug("[order] 저장된 주문 데이터: %s", result.get("latest_order"))
+                saved.append(order_data)
 
-        print(f"✅ {len(saved)}건 시트 저장 완료")
+        logger.info("[order] %d건 시트 저장 완료", len(saved))
 
         # -------------------------------------------------
         # 4️⃣ 결과 반환
@@ -1458,8 +1473,7 @@ def post_order():
         })
 
     except Exception as e:
-        print("❌ 오류 발생:", e)
-        traceback.print_exc()
+        logger.exception("[order] 오류 발생: %s", e)
         return jsonify({"status": "error", "message": str(e)}), 500
     
     
@@ -1503,6 +1517,28 @@ def serve_openapi_schema():
 # 잘됨
 
 
+# ======================================================================================
+# ✅ 관리 명령 (flask --app app cleanup-commission-lookups [--dry-run])
+# ======================================================================================
+@app.cli.command("cleanup-commission-lookups")
+@click.option("--dry-run", is_flag=True, help="삭제하지 않고 대상 행 번호만 출력")
+def cleanup_commission_lookups_command(dry_run):
+    """자연어 후원수당 조회가 후원수당 시트에 남긴 행 삭제"""
+    result = cleanup_lookup_commission_rows(dry_run=dry_run)
+    click.echo(json.dumps(result, ensure_ascii=False))
+
+
+# flask --app app ensure-row-ids [--sheet DB] [--dry-run]
+@app.cli.command("ensure-row-ids")
+@click.option("--sheet", "sheets", multiple=True, help="대상 시트 (기본: 행 ID 관리 시트 전체)")
+@click.option("--dry-run", is_flag=True, help="쓰지 않고 추가/채울 행 수만 출력")
+def ensure_row_ids_command(sheets, dry_run):
+    """관리 시트에 숨김 행 ID 열 추가 + ID 가 빈 행 채우기"""
+    for name in sheets or MANAGED_SHEETS:
+        result = ensure_id_column(get_worksheet(name), dry_run=dry_run)
+        click.echo(json.dumps(result, ensure_ascii=False))
+
+
 
 
 
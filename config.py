@@ -1,14 +1,14 @@
 import os
 from urllib.parse import urljoin
-from openai import OpenAI
 
 # ✅ 환경 변수 로드
-if os.getenv("RENDER") is None:  # 로컬에서 실행 중일 때만
-    from dotenv import load_dotenv
+# - 로컬에서 실행 중이고 .env 가 있을 때만 로드 (없으면 OS 환경변수만 사용)
+# - 필수 값 누락은 실제로 사용하는 시점(provider/API 호출)에서 오류
+if os.getenv("RENDER") is None:
     dotenv_path = os.path.abspath('.env')
-    if not os.path.exists(dotenv_path):
-        raise FileNotFoundError(f".env 파일이 존재하지 않습니다: {dotenv_path}")
-    load_dotenv(dotenv_path)
+    if os.path.exists(dotenv_path):
+        from dotenv import load_dotenv
+        load_dotenv(dotenv_path)
 
 # --------------------------------------------------
 # 필수 환경 변수
@@ -25,7 +25,16 @@ OPENAI_API_URL = os.getenv("OPENAI_API_URL")
 PROMPT_ID = os.getenv("PROMPT_ID")
 PROMPT_VERSION = os.getenv("PROMPT_VERSION")
 
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+def __getattr__(name):
+    """
+    openai_client 는 처음 접근할 때 생성 (import 시 SDK 초기화 방지)
+    - utils.providers.get_openai_client() 와 같은 인스턴스
+    """
+    if name == "openai_client":
+        from utils.providers import get_openai_client
+        return get_openai_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # --------------------------------------------------
 # Memberslist API
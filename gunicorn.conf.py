@@ -0,0 +1,27 @@
+"""
+gunicorn.conf.py
+gunicorn 실행 설정 (`gunicorn app:app` → 실행 디렉터리의 이 파일을 자동으로 읽음)
+- 다중 워커 메트릭: PROMETHEUS_MULTIPROC_DIR 를 앱(prometheus_client) import 전에 설정
+  · 워커는 fork 후 앱을 import → 마스터에서 설정한 환경변수를 그대로 물려받음
+  · 마스터 시작 시 이전 실행이 남긴 메트릭 파일 정리
+- 워커 종료 → child_exit → utils.metrics.mark_process_dead (종료된 워커의 live gauge 정리)
+- bind / workers 등은 기존처럼 명령행 옵션으로 지정
+"""
+
+import os
+import shutil
+import tempfile
+
+
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "members_prometheus"))
+
+
+def on_starting(server):
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from utils.metrics import mark_process_dead
+    mark_process_dead(worker.pid)
@@ -55,6 +55,9 @@ from .parse import (
     process_date,
     clean_commission_data,
     parse_commission,
+    parse_commission_query,
+    commit_commission,
+    cleanup_lookup_commission_rows,
 )
 
 # --------------------------------------------------
@@ -80,4 +83,5 @@ __all__ = [
 
     # 후원수당 파서
     "process_date", "clean_commission_data", "parse_commission",
+    "parse_commission_query", "commit_commission", "cleanup_lookup_commission_rows",
 ]
@@ -4,9 +4,11 @@
 import os
 import re
 import json
+import logging
 import traceback
 import unicodedata
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
 
@@ -58,10 +60,18 @@ from utils import (
 
     # 주문/텍스트 파싱
     extract_order_from_uploaded_image, parse_order_from_text,
+
+    # 일지 write-behind
+    get_journal, read_with_pending, write_behind_enabled,
 )
 
 
 from utils.sheets import get_order_sheet
+from utils.order_index import order_store
+from utils.unit_of_work import unit_of_work
+from utils.row_ids import row_id_store, with_row_id, without_row_id
+
+logger = logging.getLogger(__name__)
 
 
 
@@ -788,7 +798,7 @@ def register_member(name: str, number: str, phone: str) -> bool:
 
     # header 순서에 맞춰서 값 넣기
     row = [data.get(h, "") for h in headers]
-    sheet.append_row(row, value_input_option="USER_ENTERED")
+    row_id_store.append(sheet, row, header=headers, value_input_option="USER_ENTERED")
     return True
 
 
@@ -807,7 +817,7 @@ def find_member(name: str):
     result = []
     for row in rows:
         if str(row.get("회원명", "")).strip() == str(name).strip():
-            result.append(row)
+            result.append(without_row_id(row))
     return result
 
 
@@ -848,7 +858,7 @@ def delete_member(name: str) -> bool:
 
     for i, row in enumerate(rows, start=2):  # 2행부터 데이터 시작
         if str(row.get("회원명", "")).strip() == str(name).strip():
-            sheet.delete_rows(i)
+            row_id_store.delete_row(sheet, i)
             return True
     return False
 
@@ -872,7 +882,6 @@ def find_member_internal(name: str = "", number: str = "", code: str = "", phone
     DB 시트에서 회원 검색
     """
     rows = get_rows_from_sheet("DB")
-    results = []
 
     # 검색 조건 정규화
     name = normalize_text(name)
@@ -881,23 +890,11 @@ def find_member_internal(name: str = "", number: str = "", code: str = "", phone
     phone = normalize_text(phone)
     special = normalize_text(special)
 
-    for row in rows:
-        row_name = normalize_text(row.get("회원명", ""))
-        row_number = normalize_text(row.get("회원번호", ""))
-        row_code = normalize_text(row.get("코드", ""))
-        row_phone = normalize_text(row.get("휴대폰번호", ""))
-        row_special = normalize_text(row.get("특수번호", ""))
-
-        if (
-            (name and row_name == name) or
-            (number and row_number == number) or
-            (code and row_code == code) or
-            (phone and row_phone == phone) or
-            (special and row_special == special)
-        ):
-            results.append(row)
-
-    return results
+    # 조건 하나라도 맞으면 (OR) — NFC 정규화 후 대소문자 구분 비교라 검색 엔진 인덱스 대신 행 단위로 확인
+    fields = {k: v for k, v in {"회원명": name, "회원번호": number, "코드": code,
+                                "휴대폰번호": phone, "특수번호": special}.items() if v}
+    return [row for row in rows
+            if any(normalize_text(row.get(k, "")) == v for k, v in fields.items())]
 
 
 
@@ -965,7 +962,7 @@ def parse_registration_internal(name: str, number: str = "", phone: str = ""):
     if "휴대폰번호" in headers and phone:
         new_row[headers.index("휴대폰번호")] = phone
 
-    sheet.insert_row(new_row, 2)
+    row_id_store.insert_top(sheet, new_row, header=headers)
     return {
         "status": "created",
         "message": f"{name} 회원 신규 등록 완료",
@@ -1009,7 +1006,7 @@ def delete_member_internal(name: str):
             backup_sheet.insert_row(backup_row, 2)
 
             # ✅ 원본 삭제
-            delete_row(sheet, i)
+            row_id_store.delete_row(sheet, i)
 
             return {"message": f"{name}님의 회원 정보가 '백업' 시트에 저장된 후 삭제되었습니다."}, 200
 
@@ -1117,7 +1114,7 @@ def process_member_query(user_input: str):
                 match = False
                 break
         if match:
-            results.append(row)
+            results.append(without_row_id(row))
 
     return {
         "original": user_input,
@@ -1353,21 +1350,30 @@ def parse_memo(text: str) -> dict:
 def save_memo(sheet_name: str, member_name: str, content: str) -> bool:
     """
     상담일지 / 개인일지 / 활동일지 저장
+    - 기본: write-behind (로컬 로그 기록 후 바로 반환, 시트에는 묶어서 반영)
+    - MEMO_WRITE_BEHIND=0: 시트에 바로 insert_row
     """
     if not member_name or not content:
         raise ValueError("회원명과 내용은 필수 입력 항목입니다.")
 
+    if sheet_name not in ("상담일지", "개인일지", "활동일지"):
+        raise ValueError(f"지원하지 않는 일지 종류: {sheet_name}")
+
+    ts = now_kst().strftime("%Y-%m-%d %H:%M")
+    row = [ts, member_name.strip(), content.strip()]
+
+    if write_behind_enabled():
+        get_journal().enqueue(sheet_name, row)
+        return True
+
     if sheet_name == "상담일지":
         sheet = get_counseling_sheet()
     elif sheet_name == "개인일지":
         sheet = get_personal_memo_sheet()
-    elif sheet_name == "활동일지":
-        sheet = get_activity_log_sheet()
     else:
-        raise ValueError(f"지원하지 않는 일지 종류: {sheet_name}")
+        sheet = get_activity_log_sheet()
 
-    ts = now_kst().strftime("%Y-%m-%d %H:%M")
-    sheet.insert_row([ts, member_name.strip(), content.strip()], index=2)
+    row_id_store.insert_top(sheet, row)
     return True
 
 
@@ -1383,20 +1389,20 @@ def find_memo(keyword: str, sheet_name: str = "상담일지") -> list:
     try:
         sheet = get_worksheet(sheet_name)
         if not sheet:
-            print(f"[ERROR] ❌ 시트를 가져올 수 없습니다: {sheet_name}")
+            logger.error("시트를 가져올 수 없습니다: %s", sheet_name)
             return []
 
-        all_records = sheet.get_all_records()
+        all_records = read_with_pending(sheet_name, sheet.get_all_records)
         results = []
         for row in all_records:
             row_text = " ".join(str(v) for v in row.values())
             if keyword in row_text:
-                results.append(row)
+                results.append(without_row_id(row))
 
-        print(f"[INFO] ✅ '{sheet_name}' 시트에서 '{keyword}' 검색 결과 {len(results)}건 발견")
+        logger.info("'%s' 시트에서 '%s' 검색 결과 %d건 발견", sheet_name, keyword, len(results))
         return results
     except Exception as e:
-        print(f"[ERROR] find_memo 오류: {e}")
+        logger.exception("find_memo 오류: %s", e)
         return []
 
 
@@ -1406,7 +1412,7 @@ def find_memo(keyword: str, sheet_name: str = "상담일지") -> list:
 def search_in_sheet(sheet_name, keywords, search_mode="any",
                     start_date=None, end_date=None, limit=20):
     sheet = get_worksheet(sheet_name)
-    rows = sheet.get_all_values()
+    rows = read_with_pending(sheet_name, sheet.get_all_values)
     if not rows or len(rows[0]) < 3:
         return [], False
 
@@ -1467,8 +1473,6 @@ def keyword_match(content_lower: str, clean_keywords: list, search_mode="any") -
         k_norm = normalize_korean(k)
         found = k_norm in normalized_content
         results.append(found)
-        print(f"[DEBUG] keyword_match | keyword={k_norm} | "
-              f"in_content={found} | content={normalized_content[:50]}...")
 
     if search_mode == "동시검색":
         return all(results)
@@ -1520,19 +1524,19 @@ def parse_order_text(text: str) -> Dict[str, Any]:
     text = (text or "").strip()
     query: Dict[str, Any] = {}
 
-    print(f"[🔍] parse_order_text: 원문 텍스트 = {text}")
+    logger.debug("[parse_order_text] 원문 텍스트 = %s", text)
 
     member = find_member_in_text(text)
     query["회원명"] = member if member else None
-    print(f"[✅] 회원명 추출 = {query['회원명']}")
+    logger.debug("[parse_order_text] 회원명 추출 = %s", query["회원명"])
 
     prod_match = re.search(r"([\w가-힣]+)\s*(\d+)\s*(개|박스|병|포)?", text)
     if prod_match:
         query["제품명"] = prod_match.group(1)
         query["수량"] = int(prod_match.group(2))
-        print(f"[✅] 제품명 = {query['제품명']}, 수량 = {query['수량']}")
+        logger.debug("[parse_order_text] 제품명 = %s, 수량 = %s", query["제품명"], query["수량"])
     else:
-        print("[⚠️] 제품명/수량 파싱 실패")
+        logger.debug("[parse_order_text] 제품명/수량 파싱 실패")
         query["제품명"] = "제품"
         query["수량"] = 1
 
@@ -1671,7 +1675,8 @@ def save_order_to_sheet(order: dict) -> bool:
         sheet = get_order_sheet()
         headers = sheet.row_values(1)
         row_data = [order.get(h, "") for h in headers]
-        append_row(sheet, row_data)
+        row_id = row_id_store.append(sheet, row_data, header=headers, value_input_option="USER_ENTERED")
+        order_store.notify_append(sheet, with_row_id(row_data, headers, row_id))
         return True
     except Exception as e:
         print(f"[ERROR] 주문 저장 중 오류: {e}")
@@ -1683,21 +1688,10 @@ def save_order_to_sheet(order: dict) -> bool:
 # ===============================================
 def find_order(member_name: str = "", product: str = "") -> list[dict]:
     """
-    주문 시트에서 회원명 또는 제품명으로 조회합니다.
+    주문 시트에서 회원명 또는 제품명으로 조회합니다. (주문 색인 사용)
     """
     sheet = get_order_sheet()
-    db = sheet.get_all_values()
-    if not db or len(db) < 2:
-        return []
-    headers, rows = db[0], db[1:]
-    matched = []
-    for row in rows:
-        row_dict = dict(zip(headers, row))
-        if member_name and row_dict.get("회원명") == member_name.strip():
-            matched.append(row_dict)
-        elif product and row_dict.get("제품명") == product.strip():
-            matched.append(row_dict)
-    return matched
+    return order_store.find_any(sheet, {"회원명": member_name}, {"제품명": product})
 
 
 # ===============================================
@@ -1714,7 +1708,8 @@ def register_order(order_data: dict) -> bool:
         if k in headers:
             row[k] = str(v)
     values = [row.get(h, "") for h in headers]
-    sheet.append_row(values)
+    row_id = row_id_store.append(sheet, values, header=headers)
+    order_store.notify_append(sheet, with_row_id(values, headers, row_id))
     return True
 
 
@@ -1726,21 +1721,12 @@ def update_order(member_name: str, updates: dict) -> bool:
     특정 회원의 주문 정보를 수정합니다.
     """
     sheet = get_order_sheet()
-    headers = sheet.row_values(1)
-    values = sheet.get_all_values()
-    member_col = headers.index("회원명") + 1
-    target_row = None
-    for i, row in enumerate(values[1:], start=2):
-        if len(row) >= member_col and row[member_col - 1] == member_name.strip():
-            target_row = i
-            break
-    if not target_row:
+    found = order_store.locate(sheet, {"회원명": member_name.strip()})
+    if not found:
         raise ValueError(f"'{member_name}' 회원의 주문을 찾을 수 없습니다.")
-    for field, value in updates.items():
-        if field not in headers:
-            continue
-        col = headers.index(field) + 1
-        safe_update_cell(sheet, target_row, col, value, clear_first=True)
+    order_id, target_row = found
+    order_store.update(sheet, order_id, target_row, updates,
+                       lambda r, c, v: safe_update_cell(sheet, r, c, v, clear_first=True))
     return True
 
 
@@ -1752,17 +1738,10 @@ def delete_order(member_name: str) -> bool:
     특정 회원의 주문 레코드를 삭제합니다.
     """
     sheet = get_order_sheet()
-    headers = sheet.row_values(1)
-    values = sheet.get_all_values()
-    member_col = headers.index("회원명") + 1
-    target_row = None
-    for i, row in enumerate(values[1:], start=2):
-        if len(row) >= member_col and row[member_col - 1] == member_name.strip():
-            target_row = i
-            break
-    if not target_row:
+    found = order_store.locate(sheet, {"회원명": member_name.strip()})
+    if not found:
         raise ValueError(f"'{member_name}' 회원의 주문을 찾을 수 없습니다.")
-    sheet.delete_rows(target_row)
+    order_store.delete(sheet, *found)
     return True
 
 
@@ -1773,7 +1752,7 @@ def delete_order_by_row(row: int):
     """
     행 번호로 주문 레코드를 삭제합니다.
     """
-    delete_row("제품주문", row)
+    order_store.delete_row(get_order_sheet(), row)
 
 
 # ===============================================
@@ -1864,23 +1843,24 @@ def clean_commission_data(data: dict) -> dict:
 
 
 # ======================================================================================
-# ✅ 후원수당 파서 + 저장
+# ✅ 후원수당 파서 (순수 파싱 — 시트 접근 없음)
 # ======================================================================================
-def parse_commission(text: str) -> Dict[str, Any]:
+COMMISSION_QUERY_FIELDS = ("회원명", "기준일자", "합계_좌", "합계_우")
+
+
+@lru_cache(maxsize=256)
+def _parse_commission_cached(text: str, today: str) -> Tuple[Tuple[str, Any], ...]:
     """
-    자연어 문장에서 후원수당 정보를 추출하고 시트에 저장
-    예: "홍길동 2025-08-07 좌 10000 우 20000"
+    같은 문장 + 같은 날짜 → 같은 결과 (기본 기준일자가 '오늘'이라 날짜도 캐시 키에 포함)
+    - 캐시 공유 객체가 바뀌지 않도록 tuple 로 보관
     """
     result = {
         "회원명": None,
-        "기준일자": process_date("오늘"),
+        "기준일자": today,
         "합계_좌": 0,
         "합계_우": 0,
     }
 
-    if not text:
-        return {"status": "fail", "reason": "입력 문장이 비어있습니다."}
-
     # 회원명 추출 (첫 단어)
     tokens = text.split()
     if tokens:
@@ -1899,14 +1879,46 @@ def parse_commission(text: str) -> Dict[str, Any]:
     if right:
         result["합계_우"] = int(right.group(1))
 
-    # ✅ 시트에 저장
+    return tuple(result.items())
+
+
+def parse_commission_query(text: str) -> Dict[str, Any]:
+    """
+    자연어 문장에서 후원수당 정보만 추출 (조회/등록 공용, 저장하지 않음)
+    예: "홍길동 2025-08-07 좌 10000 우 20000"
+    """
+    if not text or not text.strip():
+        return {"status": "fail", "reason": "입력 문장이 비어있습니다."}
+
+    data = dict(_parse_commission_cached(text.strip(), process_date("오늘")))
+    return {"status": "success", "data": data}
+
+
+# ======================================================================================
+# ✅ 후원수당 저장 (명시적 쓰기 단계)
+# ======================================================================================
+def commit_commission(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    parse_commission_query() 결과(data)를 후원수당 시트에 한 행으로 추가
+    - 등록 의도에서만 호출 (조회 경로에서는 호출하지 않음)
+    """
     ws = get_worksheet("후원수당")
     headers = ws.row_values(1)
 
-    row = [result.get(h, "") for h in headers]
+    row = [data.get(h, "") for h in headers]
     ws.append_row(row, value_input_option="USER_ENTERED")
+    return {"status": "success", "data": data}
+
 
-    return {"status": "success", "data": result}
+def parse_commission(text: str) -> Dict[str, Any]:
+    """
+    자연어 문장에서 후원수당 정보를 추출하고 시트에 저장 (파싱 + 저장)
+    - 조회만 필요하면 parse_commission_query() 사용
+    """
+    parsed = parse_commission_query(text)
+    if parsed["status"] != "success":
+        return parsed
+    return commit_commission(parsed["data"])
 
 
 
@@ -1966,6 +1978,51 @@ def find_commission(data: dict):
     return results
 
 
+# ======================================================================================
+# ✅ 조회 부작용 정리 (과거 자연어 조회가 추가한 행 삭제)
+# ======================================================================================
+def _is_lookup_row(row_dict: Dict[str, Any], extra_headers: List[str]) -> bool:
+    """파서 필드(회원명 등)만 채워지고 지급일자/후원수당/비고 등은 모두 빈 행"""
+    if not str(row_dict.get("회원명", "")).strip():
+        return False
+    return all(not str(row_dict.get(h, "")).strip() for h in extra_headers)
+
+
+def cleanup_lookup_commission_rows(dry_run: bool = False) -> Dict[str, Any]:
+    """
+    후원수당 시트에서 자연어 조회(parse_commission)가 남긴 행을 찾아 삭제
+    - dry_run=True → 삭제 없이 대상 행 번호만 반환
+    - 연속된 행은 delete_rows(start, end) 한 번으로, 아래쪽부터 삭제 (행 번호 밀림 방지)
+    """
+    sheet = get_commission_sheet()
+    all_values = sheet.get_all_values()
+    if not all_values:
+        return {"deleted": 0, "rows": [], "dry_run": dry_run}
+
+    headers = [h.strip() for h in all_values[0]]
+    extra_headers = [h for h in headers if h and h not in COMMISSION_QUERY_FIELDS]
+    if not extra_headers:
+        # 파서 필드만 있는 시트 → 조회 행과 실제 데이터를 구분할 수 없음
+        return {"deleted": 0, "rows": [], "dry_run": dry_run}
+
+    targets = [
+        i for i, row in enumerate(all_values[1:], start=2)
+        if _is_lookup_row(dict(zip(headers, row)), extra_headers)
+    ]
+
+    if not dry_run:
+        runs: List[List[int]] = []
+        for idx in targets:
+            if runs and runs[-1][1] == idx - 1:
+                runs[-1][1] = idx
+            else:
+                runs.append([idx, idx])
+        for start, end in reversed(runs):
+            sheet.delete_rows(start, end)
+
+    return {"deleted": 0 if dry_run else len(targets), "rows": targets, "dry_run": dry_run}
+
+
 # ======================================================================================
 # ✅ 후원수당 등록
 # ======================================================================================
@@ -2040,8 +2097,10 @@ def delete_commission(회원명: str, 기준일자: str = None) -> dict:
     if not target_indexes:
         return {"message": "삭제할 데이터가 없습니다."}
 
-    for idx in reversed(target_indexes):
-        sheet.delete_rows(idx)
+    # 연속 구간마다 delete_rows 1회 (아래 구간부터)
+    with unit_of_work() as uow:
+        for idx in target_indexes:
+            uow.delete_row(sheet, idx)
 
     return {"message": f"{len(target_indexes)}건 삭제 완료"}
 
@@ -1,7 +1,8 @@
 # routes/commission.py
 import re
 from flask import g
-from parser.parse import parse_commission, clean_commission_data
+from parser.parse import parse_commission_query, clean_commission_data, find_commission
+from utils.pagination import InvalidCursor, decode_cursor, page_info, page_params, paginate, positioned, query_scope
 
 
 # ────────────────────────────────────────────────────────────────────
@@ -30,6 +31,20 @@ def _get_text_from_g() -> str:
                 return v.strip()
     return ""
 
+def _commission_key(row: dict) -> tuple:
+    return (str(row.get("회원명", "")).strip(), str(row.get("기준일자", "")).strip())
+
+
+def _commission_page(results: list, criteria) -> dict:
+    """조회 결과 → 현재 페이지 + 페이지 정보 (회원명/기준일자 순, 같은 키는 정렬된 위치로 구분)"""
+    limit, cursor = page_params()
+    scope = query_scope("commission", criteria)
+    ordered = sorted(results, key=_commission_key)
+    page, last_key, has_more = paginate(enumerate(ordered), positioned(_commission_key), limit,
+                                        decode_cursor(cursor, scope))
+    page = [r for _, r in page]
+    return {"total": len(ordered), "count": len(page), "results": page, **page_info(scope, last_key, has_more)}
+
 # ────────────────────────────────────────────────────────────────────
 # 허브: 자동 분기
 # ────────────────────────────────────────────────────────────────────
@@ -73,10 +88,11 @@ def find_commission_func():
         return {
             "status": "success",
             "intent": "find_commission",
-            "count": len(results),
-            "results": results,
+            **_commission_page(results, clean),
             "http_status": 200
         }
+    except InvalidCursor as e:
+        return {"status": "error", "message": str(e), "http_status": 400}
     except Exception as e:
         import traceback; traceback.print_exc()
         return {"status": "error", "message": str(e), "http_status": 500}
@@ -87,25 +103,29 @@ def find_commission_func():
 def search_commission_by_nl_func():
     """
     자연어 기반 후원수당 조회
-    - '8월 후원수당', '홍길동 후원수당' 등 → parse_commission → find_commission
+    - '8월 후원수당', '홍길동 후원수당' 등 → parse_commission_query → find_commission
+    - 조회 전용: 파싱 결과를 시트에 저장하지 않음
     """
     try:
         text = _get_text_from_g()
         if not text:
             return {"status": "error", "message": "자연어 요청문이 없습니다.", "http_status": 400}
 
-        parsed = parse_commission(text) or {}
-        clean = clean_commission_data(parsed) if callable(clean_commission_data) else parsed
+        parsed = parse_commission_query(text)
+        if parsed.get("status") != "success":
+            return {"status": "error", "message": parsed.get("reason", "파싱 실패"), "http_status": 400}
+        clean = clean_commission_data(parsed["data"])
 
         results = find_commission(clean) or []
         return {
             "status": "success",
             "intent": "search_commission_by_nl",
             "criteria": clean,
-            "count": len(results),
-            "results": results,
+            **_commission_page(results, clean),
             "http_status": 200
         }
+    except InvalidCursor as e:
+        return {"status": "error", "message": str(e), "http_status": 400}
     except Exception as e:
         import traceback; traceback.print_exc()
         return {"status": "error", "message": str(e), "http_status": 500}
@@ -3,6 +3,7 @@
 # =================================================
 import os
 import json
+import logging
 import pickle
 import traceback
 from datetime import datetime
@@ -11,18 +12,21 @@ from werkzeug.utils import secure_filename
 
 # -------------------------------------------------
 # ✅ Google API 관련 모듈
+# - googleapiclient / google_auth_oauthlib 은 import 비용이 커서
+#   실제 업로드 시점에 함수 안에서 import
 # -------------------------------------------------
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
 
 # -------------------------------------------------
 # ✅ utils.sheets 불러오기 (시트 기록용, 기존 유지)
 # -------------------------------------------------
 from utils.sheets import get_worksheet  # (유지 OK, append_image_to_sheet는 이 파일 내부 함수 사용)
+from utils.providers import get_drive_service
+from utils.row_ids import row_id_store
+from utils.pagination import InvalidCursor, decode_cursor, page_info, page_params, paginate, query_scope
 import time
 
+logger = logging.getLogger(__name__)
+
 # -------------------------------------------------
 # ✅ 초기 설정
 # -------------------------------------------------
@@ -39,6 +43,10 @@ def get_drive_service_user():
     - 최초 실행 시 브라우저 창이 열리며 로그인 필요
     - 이후 token_user.pkl 에 토큰 저장 → 자동 로그인
     """
+    from googleapiclient.discovery import build
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.auth.transport.requests import Request
+
     creds = None
     token_path = "token_user.pkl"
 
@@ -75,10 +83,10 @@ def append_image_to_sheet(member_name: str, file_link: str, description: str):
     try:
         ws = get_worksheet("이미지메모")
         # ✅ 제목행(1행) 아래 2행에 삽입
-        ws.insert_row([now, member_name, file_link, description], index=2, value_input_option="USER_ENTERED")
-        print(f"[INFO] ✅ 이미지메모 시트 2행 기록 완료: {member_name}")
+        row_id_store.insert_top(ws, [now, member_name, file_link, description], value_input_option="USER_ENTERED")
+        logger.info("이미지메모 시트 2행 기록 완료: %s", member_name)
     except Exception as e:
-        print(f"[ERROR] append_image_to_sheet 실패: {e}")
+        logger.error("append_image_to_sheet 실패: %s", e)
 
 
 
@@ -104,14 +112,16 @@ def upload_image_func():
         local_path = os.path.join(UPLOAD_FOLDER, filename)
         file.save(local_path)
 
-        # ✅ 개인 OAuth 계정으로 Drive 연결
-        drive_service_user = get_drive_service_user()
+        from googleapiclient.http import MediaFileUpload
+
+        # ✅ 개인 OAuth 계정으로 Drive 연결 (첫 업로드 시 생성 후 재사용)
+        drive_service_user = get_drive_service()
 
         DRIVE_FOLDER_ID = "1v-tTh8oHJVqOBBEAxNv1Q3XulEhxxFwL"  # 👈 본인 폴더 ID 지정
         file_metadata = {"name": filename, "parents": [DRIVE_FOLDER_ID]}
         media = MediaFileUpload(local_path, mimetype=file.mimetype)
 
-        print("🚀 [DEBUG] Google Drive 업로드 시작:", filename)
+        logger.debug("Google Drive 업로드 시작: %s", filename)
         uploaded = drive_service_user.files().create(
             body=file_metadata,
             media_body=media,
@@ -119,7 +129,7 @@ def upload_image_func():
         ).execute()
 
         file_link = uploaded.get("webViewLink")
-        print(f"✅ [DEBUG] 업로드 완료: {file_link}")
+        logger.info("Google Drive 업로드 완료: %s", file_link)
 
         # ✅ Google Sheets에 기록 (회원명 사용)
         append_image_to_sheet(member_name, file_link, description)
@@ -135,21 +145,21 @@ def upload_image_func():
                     for item in proc.open_files():
                         if local_path == item.path:
                             proc.kill()
-                            print(f"[FIX] 잠금 프로세스 종료: {proc.pid}")
+                            logger.warning("잠금 프로세스 종료: %s", proc.pid)
                 except Exception:
                     pass
 
 
             os.remove(local_path)
-            print(f"[CLEANUP] 임시 파일 삭제 완료: {local_path}")
+            logger.debug("임시 파일 삭제 완료: %s", local_path)
 
 
 
 
         except PermissionError:
-            print(f"[WARN] 파일 잠금 중이어서 삭제 생략: {local_path}")
+            logger.warning("파일 잠금 중이어서 삭제 생략: %s", local_path)
         except Exception as e:
-            print(f"[ERROR] 파일 삭제 실패: {e}")
+            logger.error("파일 삭제 실패: %s", e)
 
         return jsonify({
             "message": "✅ 이미지 업로드 및 '이미지메모' 시트 기록 완료",
@@ -159,7 +169,7 @@ def upload_image_func():
         }), 200
 
     except Exception as e:
-        print("🚨 [DEBUG] 업로드 중 예외 발생:\n", traceback.format_exc())
+        logger.exception("업로드 중 예외 발생")
         return jsonify({"error": str(e)}), 500
 
 
@@ -185,17 +195,23 @@ def search_image_func():
         records = ws.get_all_records()
 
         # ✅ 검색 로직 (회원명 or 이미지메모 설명 내 포함 여부)
-        results = [
-            r for r in records
-            if keyword.lower() in str(r.get("회원명", "")).lower()
-            or keyword.lower() in str(r.get("이미지메모", "")).lower()
-            or keyword.lower() in str(r.get("설명", "")).lower()
-        ]
-
-        # ✅ 최신순 정렬 (최근에 추가된 게 위로)
-        results = results[::-1]
-
-        # ✅ 결과 구성
+        #    - 최신순 (2행 삽입) → 위에서부터 시트 순서대로
+        #    - 정렬 키: 아래에서부터 센 행 위치 (2행 삽입에도 변하지 않음) 내림차순
+        kw = keyword.lower()
+        total = len(records)
+        matches = (
+            (total - i, r) for i, r in enumerate(records)
+            if kw in str(r.get("회원명", "")).lower()
+            or kw in str(r.get("이미지메모", "")).lower()
+            or kw in str(r.get("설명", "")).lower()
+        )
+
+        limit, cursor = page_params()
+        scope = query_scope("search_image", kw)
+        page, last_key, has_more = paginate(
+            matches, lambda item: (item[0],), limit, decode_cursor(cursor, scope), descending=True)
+
+        # ✅ 결과 구성 (현재 페이지만)
         formatted_results = [
             {
                 "날짜": r.get("날짜", ""),
@@ -203,17 +219,20 @@ def search_image_func():
                 "이미지링크": r.get("링크", ""),
                 "설명": r.get("이미지메모", "") or r.get("설명", "")
             }
-            for r in results
+            for _, r in page
         ]
 
         return jsonify({
             "count": len(formatted_results),
             "keyword": keyword,
-            "results": formatted_results
+            "results": formatted_results,
+            **page_info(scope, last_key, has_more),
         }), 200
 
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        print("🚨 [DEBUG] 검색 중 예외 발생:\n", traceback.format_exc())
+        logger.exception("검색 중 예외 발생")
         return jsonify({"error": str(e)}), 500
 
 
@@ -1,5 +1,6 @@
 import re
 import json
+import logging
 from collections import OrderedDict
 from flask import g, request, Response, jsonify, session
 
@@ -31,9 +32,19 @@ SHEET_NAME_DB = "DB"  # 매직스트링 방지
 from parser import field_map
 from utils import get_member_fields
 from utils import fallback_natural_search, normalize_code_query
+from utils import search_member_names
+from utils import load_results, result_cache, store_results
+from utils.pagination import (InvalidCursor, decode_cursor, member_key, page_info, page_params, paginate, positioned,
+                              query_scope)
+from utils.projection import compile_projection, fields_param
+from utils.member_table import get_member_table
+from utils.row_ids import ROW_ID_HEADER, row_id_store, without_row_id
+from utils.unit_of_work import unit_of_work
 
 from utils.sheets import get_member_sheet, safe_update_cell
 
+logger = logging.getLogger(__name__)
+
 
 # ────────────────────────────────────────────────────────────────────
 # 공통 헬퍼
@@ -41,9 +52,6 @@ from utils.sheets import get_member_sheet, safe_update_cell
 def _norm(s):
     return (s or "").strip()
 
-def _digits(s):
-    return re.sub(r"\D", "", s or "")
-
 def _compact_row(r: dict) -> OrderedDict:
     """회원 정보를 고정된 필드 순서로 반환"""
     return OrderedDict([
@@ -116,6 +124,29 @@ def _normalize_summary(row: dict) -> dict:
     }
 
 
+def _render_members(rows: list, projection, full=None, display: bool = True) -> tuple:
+    """
+    회원 행 → (results, display)
+    - projection 전체: full(row) 변환 + display 는 변환 결과로 생성 (기존 응답과 동일)
+    - fields 지정: 해당 필드만 복사, display 는 요청했을 때만 (아니면 None)
+    - display=False: display 를 만들지 않는 응답 (member_select)
+    """
+    if projection.full:
+        results = [full(r) for r in rows] if full else [without_row_id(r) for r in rows]
+        return results, ([_line(r) for r in results] if display else None)
+
+    project = compile_projection(projection.fields)
+    results = [project(r) for r in rows]
+    display = [_line(_normalize_summary(r)) for r in rows] if projection.display else None
+    return results, display
+
+
+def _with_display(response: dict, display) -> dict:
+    if display is not None:
+        response["display"] = display
+    return response
+
+
 def _line(summary: dict) -> str:
     """
     사람이 읽기 좋은 한 줄 요약 (정규화된 summary 사용)
@@ -162,7 +193,7 @@ def search_member_func(name):
 
 
 
-        result = find_member_logic(name)
+        result = find_member_logic(name, paged=False)
 
         if result.get("status") != "success":
             return {**result, "http_status": 404}
@@ -174,12 +205,40 @@ def search_member_func(name):
 
 
         if not members:
+            # ✅ 정확 일치 없음 → 초성/오타 허용 후보 제안
+            suggestions = _suggest_member_names(name)
+            if suggestions:
+                handle = _remember_results([sg["row"] for sg in suggestions])
+                return {
+                    "status": "need_choice",
+                    "handle": handle,
+                    "message": f"⚠️ '{name}'과(와) 정확히 일치하는 회원이 없습니다. 비슷한 회원 중 번호를 선택하세요.",
+                    "candidates": [
+                        {
+                            "choice": i + 1,
+                            "회원명": sg["row"].get("회원명"),
+                            "회원번호": sg["row"].get("회원번호"),
+                            "휴대폰번호": sg["row"].get("휴대폰번호"),
+                            "match": sg["match"],
+                        }
+                        for i, sg in enumerate(suggestions)
+                    ],
+                    "http_status": 200,
+                }
             return {"status": "error", "message": f"{name}에 해당하는 회원이 없습니다.", "http_status": 404}
 
-        # ✅ 동명이인 처리
+        # ✅ 결과는 서버에 보관하고 handle 만 응답 (전체정보/번호 선택용)
+        handle = _remember_results(members)
+
+        # ✅ 동명이인 처리 (후보는 페이지 단위, choice 번호는 handle 결과 전체 기준)
         if len(members) > 1:
+            limit, cursor = page_params()
+            scope = query_scope("search_member", name)
+            page, last_key, has_more = paginate(
+                enumerate(members), positioned(member_key), limit, decode_cursor(cursor, scope))
             return {
                 "status": "need_choice",   # ✅ 통일된 상태 코드
+                "handle": handle,
                 "message": f"⚠️ 동일 이름 회원 '{name}'이(가) {len(members)}명 있습니다. 번호를 선택하세요.",
                 "candidates": [
                     {
@@ -188,8 +247,9 @@ def search_member_func(name):
                         "회원번호": m.get("회원번호"),
                         "휴대폰번호": m.get("휴대폰번호")
                     }
-                    for i, m in enumerate(members)
+                    for i, m in page
                 ],
+                **page_info(scope, last_key, has_more),
                 "http_status": 200,
             }
 
@@ -208,17 +268,53 @@ def search_member_func(name):
         return {
             "status": "success",
             "message": f"{name}님의 요약 정보입니다. '전체정보'를 입력하시면 상세 내용을 볼 수 있습니다.",
+            "handle": handle,
             "summary": summary,
             "summary_line": summary_line,
             "http_status": 200
         }
 
+    except InvalidCursor as e:
+        return {"status": "error", "message": str(e), "http_status": 400}
     except Exception as e:
         import traceback; traceback.print_exc()
         return {"status": "error", "message": str(e), "http_status": 500}
 
 
 
+def _remember_results(results: list) -> str:
+    """
+    검색 결과를 서버측 보관소에 저장하고 handle 반환
+    - 세션 쿠키에는 handle 문자열만 기록 (secret_key 미설정 시 생략)
+    """
+    handle = store_results(results)
+    try:
+        session["last_search_handle"] = handle
+    except RuntimeError:
+        pass
+    return handle
+
+
+def _current_handle(data: dict):
+    """요청 body → g.query → 세션 순으로 handle 조회"""
+    handle = data.get("handle")
+    if not handle and isinstance(getattr(g, "query", None), dict):
+        handle = g.query.get("handle")
+    return handle or session.get("last_search_handle")
+
+
+def _suggest_member_names(name: str, limit: int = 5) -> list:
+    """
+    회원명 초성/오타 허용 후보 (search_member_func 폴백)
+    - 회원번호/휴대폰/코드 형태 입력은 제외
+    """
+    text = _norm(name)
+    if not text or re.fullmatch(r"[\d\-]+", text) or text.startswith("코드") or text.lower().startswith("code"):
+        return []
+    rows = get_rows_from_sheet(SHEET_NAME_DB)
+    return search_member_names(rows, text, limit=limit)
+
+
 # ────────────────────────────────────────────────────────────────────
 # 2) 코드 검색: '코드a', '코드 A', 'code:B' 등
 # ────────────────────────────────────────────────────────────────────
@@ -231,14 +327,11 @@ def search_by_code_logic():
         raw = g.query.get("query") or ""
         text = str(raw).strip()
 
-        print("=== ENTER search_by_code_logic ===")
-        print("raw from g.query:", g.query.get("query"))
+        logger.debug("[search_by_code_logic] raw=%s", raw)
 
 
         # ✅ 한글/영문 '코드' + 선택적 콜론 + 공백 허용
         m = re.match(r"^(?:코드|code)\s*:?\s*([A-Za-z0-9]+)$", text, re.IGNORECASE)
-        
-        print("=== DEBUG REGEX ===", "text:", text, "m:", m)
 
         if not m:
             return {
@@ -252,39 +345,35 @@ def search_by_code_logic():
 
         # ✅ 코드 컬럼 필터링
         matched = [r for r in rows if str(r.get("코드", "")).strip().upper() == code_value]
-        matched.sort(key=lambda r: str(r.get("회원명", "")).strip())
+        matched.sort(key=member_key)
 
-       
-        # 🔽 여기서 디버깅 로그 찍기
-        print("=== DEBUG search_by_code_logic ===")
-        print("raw:", raw)
-        print("text:", text)
-        print("code_value:", code_value)
-        print("rows 첫 3개:", rows[:3])
-        print("matched 개수:", len(matched))       
-             
-       
-        matched.sort(key=lambda r: str(r.get("회원명", "")).strip())
-        print("=== DEBUG REGEX ===", "text:", text, "m:", m)   # 👈 여기에 추가
+        logger.debug("[search_by_code_logic] code=%s, rows=%d, matched=%d", code_value, len(rows), len(matched))
 
+        # ✅ 커서 페이지 (회원명/회원번호 순) → 현재 페이지만 summary/display 변환
+        limit, cursor = page_params()
+        scope = query_scope("search_by_code", code_value)
+        page, last_key, has_more = paginate(enumerate(matched), positioned(member_key), limit,
+                                            decode_cursor(cursor, scope))
+        page = [r for _, r in page]
 
+        # ✅ summary 정규화 (또는 fields 선택) → display 변환
+        results, display = _render_members(page, fields_param(), _normalize_summary)
 
-        # ✅ summary 정규화 → display 변환
-        results = [_normalize_summary(r) for r in matched]
-        display = [_line(s) for s in results]
 
 
-
-        return {
+        return _with_display({
             "status": "success",
             "intent": "search_by_code",
             "code": code_value,
+            "total": len(matched),
             "count": len(results),
             "results": results,
-            "display": display,
+            **page_info(scope, last_key, has_more),
             "raw_text": raw
-        }
+        }, display)
 
+    except InvalidCursor as e:
+        return {"status": "error", "message": str(e), "http_status": 400}
     except Exception as e:
         import traceback; traceback.print_exc()
         return {"status": "error", "message": str(e), "http_status": 500}
@@ -293,12 +382,13 @@ def search_by_code_logic():
 # ────────────────────────────────────────────────────────────────────
 # 3) 일반 검색: 이름/회원번호/휴대폰/특수번호/부분매칭
 # ────────────────────────────────────────────────────────────────────
-def find_member_logic(name=None):
+def find_member_logic(name=None, paged=True):
     """
     일반 회원 검색
     - g.query["query"] 가 dict 또는 str
       dict 예: {"회원명":"홍길동"} / {"회원번호":"123456"} / {"휴대폰번호":"010-1234-5678"} / {"특수번호":"A1"}
       str  예: "홍길동" / "1234567" / "01012345678" / "특수번호 A1"
+    - paged=False → 페이지 없이 전체 결과 (search_member_func 의 handle 보관용)
     """
     try:
         q = name if name is not None else g.query.get("query")
@@ -339,41 +429,41 @@ def find_member_logic(name=None):
         else:
             return {"status": "error", "message": "지원하지 않는 query 형식입니다.", "http_status": 400}
 
-        # 2) 필터링
-        def match_row(r: dict) -> bool:
-            if f["회원명"]:
-                db_name = (r.get("회원명", "") or "").strip()
-                print("[DEBUG] 회원명 비교:", f["회원명"], "vs", repr(db_name))
-                if f["회원명"] != db_name:
-                    return False
-
-            if f["회원번호"]:
-                if _norm(r.get("회원번호", "")) != f["회원번호"]:
-                    return False
-            if f["휴대폰번호"]:
-                if _digits(r.get("휴대폰번호", "")) != _digits(f["휴대폰번호"]):
-                    return False
-            if f["특수번호"] is not None:
-                if _norm(r.get("특수번호", "")) != f["특수번호"]:
-                    return False
-            return True
+        # 2) 필터링 (질의 계획: 회원번호/휴대폰 등 인덱스 조건 → 후보만 검사)
+        conditions = {}
+        for k in ("회원명", "회원번호"):
+            if f[k]:
+                conditions[f"{k}__exact"] = f[k]
+        if f["휴대폰번호"]:
+            conditions["휴대폰번호__digits"] = f["휴대폰번호"]
+        if f["특수번호"] is not None:
+            conditions["특수번호__exact"] = f["특수번호"]
 
+        matched = get_member_table(rows).search(conditions)
+        matched.sort(key=member_key)
 
-        matched = [r for r in rows if match_row(r)]
-        matched.sort(key=lambda r: _norm(r.get("회원명", "")))
+        paging = {}
+        if paged:
+            limit, cursor = page_params()
+            scope = query_scope("search_member", f)
+            page, last_key, has_more = paginate(enumerate(matched), positioned(member_key), limit,
+                                                decode_cursor(cursor, scope))
+            matched = [r for _, r in page]
+            paging = page_info(scope, last_key, has_more)
 
-        results = [sort_fields_by_field_map(r) for r in matched]
-        display = [_line(d) for d in results]
+        results, display = _render_members(matched, fields_param(), sort_fields_by_field_map)
 
 
-        return {
+        return _with_display({
             "status": "success",
             "intent": "search_member",
             "count": len(results),
             "results": results,
-            "display": display
-        }
+            **paging,
+        }, display)
 
+    except InvalidCursor as e:
+        return {"status": "error", "message": str(e), "http_status": 400}
     except Exception as e:
         import traceback; traceback.print_exc()
         return {"status": "error", "message": str(e), "http_status": 500}
@@ -405,13 +495,19 @@ def member_select_direct(results):
 
 # ===================**************
 def member_select(choice=None):
-    data = request.json or {}
-    choice = str(data.get("choice", "")).strip()
+    """
+    직전 검색 결과(handle)에서 전체정보/번호 선택/종료 처리
+    - 결과가 여러 건: 숫자 N → N번째 회원 전체정보
+    - 결과가 한 건: 1/전체정보 → 전체정보, 2/종료 → 종료
+    """
+    data = request.get_json(silent=True) or {}
+    choice = str(choice or data.get("choice", "")).strip()
     member_name = str(data.get("회원명", "")).strip()
+    projection = fields_param(data)
 
     # 🔹 자연어 "홍길동 전체정보" 같은 경우 → 회원명 직접 처리
     if member_name:
-        results = find_member_logic(member_name)
+        results = find_member_logic(member_name, paged=False)
         if results.get("status") == "success":
             return {
                 "status": "success",
@@ -422,13 +518,8 @@ def member_select(choice=None):
         else:
             return results
 
-    # 🔹 choice 기반 처리 (번호 선택 전용)
-    if choice in ["종료", "끝", "exit", "quit"]:
-        choice = "2"
-    elif choice in ["전체정보", "전체", "1", "상세", "detail", "info"]:
-        choice = "1"
-
-    results = session.get("last_search_results", [])
+    handle = _current_handle(data)
+    results = load_results(handle)
 
     if not results:
         return {
@@ -437,15 +528,43 @@ def member_select(choice=None):
             "http_status": 400
         }
 
+    # 🔹 동명이인/유사 후보 중 번호 선택
+    if len(results) > 1 and choice.isdigit():
+        idx = int(choice) - 1
+        if 0 <= idx < len(results):
+            return {
+                "status": "success",
+                "message": "회원 전체정보입니다.",
+                "handle": handle,
+                "results": _render_members([results[idx]], projection, sort_fields_by_field_map, display=False)[0],
+                "http_status": 200
+            }
+        return {
+            "status": "error",
+            "message": f"잘못된 번호입니다. 1~{len(results)} 중에서 선택해주세요.",
+            "http_status": 400
+        }
+
+    # 🔹 choice 기반 처리 (번호 선택 전용)
+    if choice in ["종료", "끝", "exit", "quit"]:
+        choice = "2"
+    elif choice in ["전체정보", "전체", "1", "상세", "detail", "info"]:
+        choice = "1"
+
     if choice == "1":
         return {
             "status": "success",
             "message": "회원 전체정보입니다.",
-            "results": results,
+            "handle": handle,
+            "results": _render_members(results, projection, sort_fields_by_field_map, display=False)[0],
             "http_status": 200
         }
     elif choice == "2":
-        session.pop("last_search_results", None)
+        result_cache.drop(handle)
+        try:
+            session.pop("last_search_handle", None)
+        except RuntimeError:
+            pass
         return {
             "status": "success",
             "message": "세션을 종료했습니다.",
@@ -481,7 +600,7 @@ def sort_fields_by_field_map(r: dict) -> OrderedDict:
         if key in r:
             ordered[key] = r[key]
     for k, v in r.items():
-        if k not in ordered:
+        if k not in ordered and k != ROW_ID_HEADER:   # 숨김 ID 열은 응답에서 제외
             ordered[k] = v
     return ordered
 
@@ -682,20 +801,19 @@ def save_member_func():
         headers = [h.strip() for h in sheet.row_values(1)]
         rows = sheet.get_all_records()
 
-        # ✅ 기존 회원 여부 확인 (수정)
+        # ✅ 기존 회원 여부 확인 (수정 → 셀 여러 개를 batch_update 1회로)
         for i, row in enumerate(rows):
             if str(row.get("회원명", "")).strip() == name:
-                for key, value in {
-                    "회원명": name,
-                    "회원번호": number,
-                    "휴대폰번호": phone,
-                    "계보도": lineage,
-                    "주소": address
-                }.items():
-                    if key in headers and value:
-                        row_idx = i + 2
-                        col_idx = headers.index(key) + 1
-                        safe_update_cell(sheet, row_idx, col_idx, value, clear_first=True)
+                with unit_of_work() as uow:
+                    for key, value in {
+                        "회원명": name,
+                        "회원번호": number,
+                        "휴대폰번호": phone,
+                        "계보도": lineage,
+                        "주소": address
+                    }.items():
+                        if key in headers and value:
+                            uow.update_cell(sheet, i + 2, headers.index(key) + 1, value)
 
                 return {
                     "status": "success",
@@ -715,7 +833,7 @@ def save_member_func():
             if key in headers and value:
                 new_row[headers.index(key)] = value
 
-        sheet.insert_row(new_row, 2)
+        row_id_store.insert_top(sheet, new_row, header=headers)
         return {
             "status": "success",
             "message": f"{name} 회원 신규 등록 완료",
@@ -733,6 +851,25 @@ def save_member_func():
 
 
 
+def _member_rows(sheet, headers) -> list:
+    """
+    수정/삭제 대상 검색용 DB 행
+    - ID 열이 있으면 캐시된 행 (행 번호는 쓰기 직전에 ID 로 해석 → 전체 재조회 없음)
+    - 없으면 기존처럼 시트 전체 조회 (enumerate 순서 = 행 번호)
+    """
+    if row_id_store.id_column(sheet, headers):
+        return get_rows_from_sheet(SHEET_NAME_DB)
+    return sheet.get_all_records()
+
+
+def _target_row(sheet, candidate) -> int | None:
+    """(행 번호, 행) → 쓰기 대상 행 번호 (ID 열이 있으면 ID 로 현재 행 확인)"""
+    row_number, row = candidate
+    if row_id_store.id_column(sheet):
+        return row_id_store.locate(sheet, row)
+    return row_number
+
+
 # ======================================================================================
 # ✅ 회원 삭제 API
 # ======================================================================================
@@ -759,7 +896,7 @@ def delete_member_func(data=None):
             from utils import fallback_natural_search
             query = fallback_natural_search(query)
 
-        print("[DEBUG] query:", query)
+        logger.debug("query: %s", query)
 
         raw_text = query.get("raw_text") or query.get("요청문", "")
         if isinstance(raw_text, dict):
@@ -772,7 +909,7 @@ def delete_member_func(data=None):
             or ""
         ).strip()
 
-        print("[DEBUG] name:", name)
+        logger.debug("name: %s", name)
 
         choice = str(query.get("choice", "")).strip()
 
@@ -785,8 +922,8 @@ def delete_member_func(data=None):
 
         # ✅ DB 시트에서 이름으로 검색
         sheet = get_member_sheet()
-        rows = sheet.get_all_records()
         headers = sheet.row_values(1)
+        rows = _member_rows(sheet, headers)
 
         candidates = [
             (idx, row)
@@ -815,7 +952,9 @@ def delete_member_func(data=None):
                 "http_status": 200
             }
 
-        target_row = candidates[0][0] if len(candidates) == 1 else candidates[int(choice) - 1][0]
+        target_row = _target_row(sheet, candidates[0] if len(candidates) == 1 else candidates[int(choice) - 1])
+        if target_row is None:
+            return {"status": "error", "message": f"❌ 회원 '{name}'을(를) 찾을 수 없습니다.", "http_status": 404}
 
         # --------------------------
         # 🔽 필드 삭제 요청 처리
@@ -961,7 +1100,7 @@ def update_member_func(data: dict = None):
         raw_text = query.get("raw_text") or query.get("요청문") or ""
         if not isinstance(raw_text, str):
             raw_text = str(raw_text or "")   # ✅ dict/None 방지용
-        print(f"[DEBUG] raw_text type={type(raw_text)}, value={raw_text}")
+        logger.debug("raw_text=%s", raw_text)
 
         member_name = query.get("회원명")
 
@@ -985,10 +1124,7 @@ def update_member_func(data: dict = None):
 
 
 
-        print("DEBUG update_member_func >>> data =", data)
-        print("DEBUG update_member_func >>> query =", query)
-        print("DEBUG update_member_func >>> member_name =", member_name)
-        print(">>> raw_text =", raw_text)
+        logger.debug("[update_member_func] member_name=%s, raw_text=%s, query=%s", member_name, raw_text, query)
 
         # --------------------------
         # 2. 수정할 필드/값 추출
@@ -1080,8 +1216,8 @@ def update_member_func(data: dict = None):
         # 4. 회원 검색
         # --------------------------
         sheet = get_member_sheet()
-        rows = sheet.get_all_records()
         headers = sheet.row_values(1)
+        rows = _member_rows(sheet, headers)
 
         candidates = [
             (idx, row)
@@ -1112,7 +1248,9 @@ def update_member_func(data: dict = None):
                 "http_status": 200,
             }
 
-        target_row = candidates[0][0] if len(candidates) == 1 else candidates[int(choice) - 1][0]
+        target_row = _target_row(sheet, candidates[0] if len(candidates) == 1 else candidates[int(choice) - 1])
+        if target_row is None:
+            return {"status": "error", "message": f"❌ 회원 '{member_name}'을(를) 찾을 수 없습니다.", "http_status": 404}
 
         # --------------------------
         # 6. 수정 반영
@@ -1225,24 +1363,22 @@ def delete_member_field_nl_func(data: dict = None):
             except Exception:
                 return {"status": "error", "message": "❌ 올바른 choice 번호를 선택하세요.", "http_status": 400}
 
-        # 필드 삭제 처리
+        # 필드 삭제 처리 (비울 셀을 모아 batch_update 1회)
         updated_fields = []
-        for f in fields:
-            if f in MEMBER_FIELDS and f in header:
-                col_idx = header.index(f) + 1
-                safe_update_cell(sheet, target_row, col_idx, "")
-                updated_fields.append(f)
-            else:
-                if re.fullmatch(r"\d{5,8}", f):
-                    if "회원번호" in header:
-                        col_idx = header.index("회원번호") + 1
-                        safe_update_cell(sheet, target_row, col_idx, "")
-                        updated_fields.append("회원번호")
-                elif re.fullmatch(r"010\d{7,8}", f) or "휴대" in f:
-                    if "휴대폰번호" in header:
-                        col_idx = header.index("휴대폰번호") + 1
-                        safe_update_cell(sheet, target_row, col_idx, "")
-                        updated_fields.append("휴대폰번호")
+        with unit_of_work() as uow:
+            for f in fields:
+                if f in MEMBER_FIELDS and f in header:
+                    uow.clear(sheet, target_row, header.index(f) + 1)
+                    updated_fields.append(f)
+                else:
+                    if re.fullmatch(r"\d{5,8}", f):
+                        if "회원번호" in header:
+                            uow.clear(sheet, target_row, header.index("회원번호") + 1)
+                            updated_fields.append("회원번호")
+                    elif re.fullmatch(r"010\d{7,8}", f) or "휴대" in f:
+                        if "휴대폰번호" in header:
+                            uow.clear(sheet, target_row, header.index("휴대폰번호") + 1)
+                            updated_fields.append("휴대폰번호")
 
         if not updated_fields:
             return {"status": "error", "message": f"❌ 삭제할 필드를 찾을 수 없습니다. (입력={fields})", "http_status": 400}
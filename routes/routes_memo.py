@@ -3,8 +3,12 @@ import re
 from flask import g
 from parser.parse import save_memo, parse_memo,  find_memo
 from utils import handle_search_memo
-from utils.sheets import get_worksheet
+from utils.sheets import TopDownRows
+from utils.pagination import InvalidCursor, decode_cursor, encode_cursor, page_params, query_scope
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
 
 sheet_name, keywords, member_name = None, [], None
 start_date, end_date = None, None  # ✅ 추가
@@ -156,9 +160,10 @@ def search_memo_func():
         q = getattr(g, "query", None)  # g.query 전체
         results = {}
 
-        print("[DEBUG] raw g.query:", q)
+        logger.debug("raw g.query: %s", q)
 
         sheet_name, keywords, member_name = None, [], None
+        start_date, end_date = None, None
 
         # ----------------------------
         # 1) JSON / 자연어 / dict 분기
@@ -167,6 +172,8 @@ def search_memo_func():
             query_data = q.get("query", q)
             sheet_name = query_data.get("일지종류", "").strip()
             member_name = query_data.get("회원명", "").strip()
+            start_date = query_data.get("start_date")
+            end_date = query_data.get("end_date")
 
             # ✅ keywords vs 검색어 보정
             if "keywords" in query_data:
@@ -190,7 +197,7 @@ def search_memo_func():
 
 
 
-            print("[DEBUG] parse_memo output:", parsed)
+            logger.debug("parse_memo output: %s", parsed)
 
             sheet_name = (parsed.get("일지종류") or "").strip()
             member_name = (parsed.get("회원명") or "").strip()
@@ -229,53 +236,57 @@ def search_memo_func():
             keywords = [kw for kw in keywords if kw != "동시"]
 
         # ----------------------------
-        # 3) 검색 실행
+        # 3) 검색 실행 (시트별 커서 페이지)
+        #    - cursor 에는 다음 페이지가 남은 시트의 마지막 키만 기록 → 빠진 시트는 끝난 것
         # ----------------------------
-        if sheet_name == "전체":
-            results = {}
-            for sn in ["상담일지", "개인일지", "활동일지"]:
-                core_results = search_memo_core(
-                    sn,
-                    keywords,
-                    member_name=member_name,
-                    and_mode=and_mode
-                )
-                print(f"[DEBUG] {sn} 검색 결과 {len(core_results)}건")
-                results[sn] = core_results
-
-        else:
-            results = {
-                sheet_name: search_memo_core(
-                    sheet_name,
-                    keywords,
-                    member_name=member_name,
-                    and_mode=and_mode
-                )
-            }
+        sheet_names = ["상담일지", "개인일지", "활동일지"] if sheet_name == "전체" else [sheet_name]
+        limit, cursor = page_params(default_limit=20)
+        scope = query_scope("search_memo", sheet_name, keywords, member_name, and_mode, start_date, end_date)
+        positions = decode_cursor(cursor, scope)
+
+        results, next_positions = {}, {}
+        for sn in sheet_names:
+            if positions is not None and sn not in positions:
+                results[sn] = []
+                continue
+            core_results, last_key, more = search_memo_page(
+                sn,
+                keywords,
+                member_name=member_name,
+                start_date=start_date,
+                end_date=end_date,
+                and_mode=and_mode,
+                limit=limit,
+                after=(positions or {}).get(sn),
+            )
+            logger.debug("%s 검색 결과 %d건", sn, len(core_results))
+            results[sn] = core_results
+            if more:
+                next_positions[sn] = last_key
 
 
         # ----------------------------
         # 4) 반환
         # ----------------------------
 
-        # 🔽 여기에 출력 코드 삽입
-        results_data = results
-        for category, memos in results_data.items():
-            print(f"### {category}")
-            for memo in memos:
-                print(f"- 날짜: {memo.get('날짜')}")
-                print(f"- 회원명: {memo.get('회원명')}")
-                print(f"- 일지종류: {memo.get('일지종류')}")
-                print(f"- 내용: {memo.get('내용')}\n")
+        # 🔽 결과 상세는 DEBUG 레벨에서만 (행 단위 포맷 비용 생략)
+        if logger.isEnabledFor(logging.DEBUG):
+            for category, memos in results.items():
+                for memo in memos:
+                    logger.debug("[%s] %s | %s | %s", category, memo.get("날짜"), memo.get("회원명"), memo.get("내용"))
 
 
         return {
             "status": "success",
             "intent": "search_memo",
             "results": results,
+            "has_more": bool(next_positions),
+            "next_cursor": encode_cursor(scope, next_positions) if next_positions else None,
             "http_status": 200
         }
 
+    except InvalidCursor as e:
+        return {"status": "error", "message": str(e), "http_status": 400}
     except Exception as e:
         import traceback; traceback.print_exc()
         return {
@@ -303,13 +314,34 @@ def search_memo_core(sheet_name, keywords, member_name=None,
     - full_phrase: 키워드 전체 문장 기반 정확 검색
     - and_mode=True → 모든 키워드 포함(AND), 기본은 OR 검색
     """
-    results = []
-    sheet = get_worksheet(sheet_name)
-    if not sheet:
-        print(f"[ERROR] ❌ 시트를 가져올 수 없습니다: {sheet_name}")
-        return []
+    results, _, _ = search_memo_page(sheet_name, keywords, member_name=member_name,
+                                     start_date=start_date, end_date=end_date, limit=limit,
+                                     and_mode=and_mode, full_phrase=full_phrase)
+    return results
+
+
+def memo_key(seq: int) -> tuple:
+    """
+    일지 정렬 키: 아래에서부터 센 행 위치 — 최신순(내림차순)
+    - 날짜는 넣지 않음 (소급 입력/대기 행 병합으로 시트 순서와 날짜 순서가 어긋나도 누락·중복 없음)
+    """
+    return (seq,)
+
+
+MEMO_COLUMNS = ("날짜", "회원명", "내용")
 
-    rows = sheet.get_all_records()
+
+def search_memo_page(sheet_name, keywords, member_name=None,
+                     start_date=None, end_date=None, limit=20,
+                     and_mode=False, full_phrase="", after=None):
+    """
+    search_memo_core 의 페이지 버전 → (결과, 마지막 키, 다음 페이지 존재 여부)
+    - 시트는 최신순(2행 삽입) → 위에서부터 훑으며 after 키 이후 행만, limit + 1 건째에서 중단
+    - 위에서부터 구간 단위로 읽음 (TopDownRows) → limit 충족 / start_date 이전 행에서 남은 구간 요청 안 함
+    """
+    results = []
+    # 날짜/회원명/내용 열만 (상담일지 스냅샷이 있으면 재사용), 대기 중인 일지 행 포함
+    rows = TopDownRows(sheet_name, MEMO_COLUMNS)
 
     # ✅ keywords 정규화
     keywords = [kw.strip().lower() for kw in keywords if kw and kw.strip()]
@@ -324,13 +356,11 @@ def search_memo_core(sheet_name, keywords, member_name=None,
     except Exception:
         pass
 
-    for idx, row in enumerate(rows, start=1):
-        content = str(row.get("내용", "")).strip()
-        member = str(row.get("회원명", "")).strip()
-        date_str = str(row.get("날짜", "")).strip()
-
-        # ✅ 회원명 필터
-        if member_name and member_name != "전체" and member != member_name:
+    last_key, has_more = None, False
+    for row in rows:
+        date_str, member, content = (str(v).strip() for v in row[:3])
+        key = list(memo_key(rows.total - rows.index + 1))
+        if after is not None and key >= after:
             continue
 
         # ✅ 날짜 필터
@@ -338,12 +368,16 @@ def search_memo_core(sheet_name, keywords, member_name=None,
             try:
                 row_date = datetime.strptime(date_str.split()[0], "%Y-%m-%d")
                 if start_dt and row_date < start_dt:
-                    continue
+                    break   # 최신순 → 아래 행은 모두 더 이전 날짜
                 if end_dt and row_date > end_dt:
                     continue
             except Exception:
                 pass
 
+        # ✅ 회원명 필터
+        if member_name and member_name != "전체" and member != member_name:
+            continue
+
         # ✅ 검색 대상: 회원명 + 내용 둘 다 포함
         search_target = f"{member.lower()} {content.lower()}"
 
@@ -361,18 +395,20 @@ def search_memo_core(sheet_name, keywords, member_name=None,
                     continue
 
 
+        if len(results) >= limit:
+            has_more = True
+            break
+
         results.append({
             "날짜": date_str,
             "회원명": member,
             "내용": content,
             "일지종류": sheet_name
         })
+        last_key = key
 
-        if len(results) >= limit:
-            break
-
-    print(f"[DEBUG] ✅ 최종 results({sheet_name}) | {len(results)}건")
-    return results
+    logger.debug("최종 results(%s) | %d건", sheet_name, len(results))
+    return results, last_key, has_more
 
 
 
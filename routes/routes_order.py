@@ -5,12 +5,18 @@ from utils import extract_order_from_uploaded_image
 from utils import process_order_date
 from utils import get_worksheet
 from parser.parse import save_order_to_sheet
+from utils.unit_of_work import as_written, unit_of_work
 
 
 import os, re, io, json, base64, requests, traceback
+import logging
 from flask import jsonify
 from datetime import datetime
 from utils import get_rows_from_sheet
+from utils import read_columns
+from utils import get_http_session
+
+logger = logging.getLogger(__name__)
 
 
 def _norm(s): 
@@ -99,26 +105,21 @@ def order_nl_func():
 
 
 
+MEMBER_INFO_COLUMNS = ("회원명", "회원번호", "휴대폰번호", "주소", "가입일자")
+
+
 def get_member_info_by_name_list(name: str) -> list[dict]:
     """
     DB 시트에서 회원명으로 검색하여 일치하는 회원 목록 반환
     - 여러 명 있을 경우 순번 부여
     - 필드: 회원번호, 휴대폰번호, 주소, 가입일자
     """
-    sheet = get_member_sheet()
-    rows = sheet.get_all_records()
+    rows = read_columns("DB", MEMBER_INFO_COLUMNS)
 
     matched = [
-        {
-            "순번": i + 1,
-            "회원명": row.get("회원명", "").strip(),
-            "회원번호": str(row.get("회원번호", "")).strip(),
-            "휴대폰번호": str(row.get("휴대폰번호", "")).strip(),
-            "주소": str(row.get("주소", "")).strip(),
-            "가입일자": str(row.get("가입일자", "")).strip(),
-        }
+        {"순번": i + 1, **{field: value.strip() for field, value in zip(MEMBER_INFO_COLUMNS, row)}}
         for i, row in enumerate(rows)
-        if str(row.get("회원명", "")).strip() == name
+        if row[0].strip() == name
     ]
 
     return matched
@@ -231,10 +232,10 @@ def save_order_proxy_func():
         # ✅ raw_text 있으면 파싱 실행
         if "raw_text" in query:
             from parser.parse import parse_order_text
-            print(f"[DEBUG] raw_text: {query.get('raw_text')}")
+            logger.debug("raw_text: %s", query.get("raw_text"))
 
             parsed = parse_order_text(query["raw_text"])  # <- 이 함수는 Dict[str, Any] 반환해야 함
-            print(f"[DEBUG] 파싱된 주문정보: {parsed}")
+            logger.debug("파싱된 주문정보: %s", parsed)
 
             query.update(parsed)  # <- 필드 병합
 
@@ -348,7 +349,7 @@ def addOrders(payload):
         return {"ok": False, "error": "API 미설정, 시트에 저장됨"}
 
     try:
-        resp = requests.post(url, json=payload, timeout=20)
+        resp = get_http_session().post(url, json=payload, timeout=20)
         if resp.status_code == 200:
             return resp.json()
         else:
@@ -385,7 +386,7 @@ def get_member_info_by_name(member_name: str) -> dict:
                     "휴대폰번호": row.get("휴대폰번호", "")
                 }
     except Exception as e:
-        print(f"[get_member_info_by_name] 에러: {e}")
+        logger.warning("[get_member_info_by_name] 에러: %s", e)
 
     return {}
 
@@ -409,7 +410,7 @@ def order_auto_func():
     - 그 외(문자열/텍스트 dict 등) → order_nl_func
     """
     try:
-        print("📌 [DEBUG] order_auto_func 진입")
+        logger.debug("order_auto_func 진입")
         q = g.query.get("query") if hasattr(g, "query") and isinstance(g.query, dict) else None
         raw = _get_text_from_g()
         if raw:
@@ -419,16 +420,16 @@ def order_auto_func():
 
         # 1) 파일 업로드 우선
         if hasattr(request, "files") and request.files:
-            print("📌 [DEBUG] 파일 업로드 감지됨 → order_upload_pc_func 호출")
+            logger.debug("파일 업로드 감지됨 → order_upload_pc_func 호출")
             return order_upload_pc_func()
 
         # 2) 구조화 JSON → 저장 프록시
         if isinstance(q, dict) and _is_structured_order(q):
-            print("📌 [DEBUG] 구조화 JSON 감지됨 → save_order_proxy_func 호출")
+            logger.debug("구조화 JSON 감지됨 → save_order_proxy_func 호출")
             return save_order_proxy_func()
 
         # 3) 자연어 텍스트 → NLU 기반
-        print("📌 [DEBUG] 자연어 주문 처리 → order_nl_func 호출")
+        logger.debug("자연어 주문 처리 → order_nl_func 호출")
         return order_nl_func()
 
     except Exception as e:
@@ -445,7 +446,7 @@ def order_auto_func():
 # ===================== 주문 처리 함수 =====================
 def order_upload_pc_func():
     """PC 업로드"""
-    print("📌 [DEBUG] order_upload_pc_func 호출됨")
+    logger.debug("order_upload_pc_func 호출됨")
 
     mode = request.form.get("mode") or request.args.get("mode") or "api"
     member_name = request.form.get("회원명")
@@ -457,18 +458,18 @@ def order_upload_pc_func():
         member_name = message_text.replace("제품주문 저장", "").strip()
 
 
-    print(f"📌 [DEBUG] member_name={member_name}, message_text={message_text}")
+    logger.debug("member_name=%s, message_text=%s", member_name, message_text)
     if not member_name:
         return {"status": "error", "message": "회원명이 필요합니다.", "http_status": 400}
 
     try:
         # 이미지 읽기
         if image_file:
-            print("📌 [DEBUG] 업로드된 파일 사용")
+            logger.debug("업로드된 파일 사용")
             image_bytes = io.BytesIO(image_file.read())
         elif image_url:
-            print(f"📌 [DEBUG] image_url 사용: {image_url}")
-            resp = requests.get(image_url, timeout=20)
+            logger.debug("image_url 사용: %s", image_url)
+            resp = get_http_session().get(image_url, timeout=20)
             if resp.status_code != 200:
                 return {"status": "error", "message": "이미지 다운로드 실패", "http_status": 400}
             image_bytes = io.BytesIO(resp.content)
@@ -476,9 +477,8 @@ def order_upload_pc_func():
             return {"status": "error", "message": "image(파일) 또는 image_url 필요", "http_status": 400}
 
         # 이미지에서 주문 정보 추출
-        print("📌 [DEBUG] extract_order_from_uploaded_image 호출 시작")
         result = extract_order_from_uploaded_image(image_bytes)
-        print(f"📌 [DEBUG] extract_order_from_uploaded_image 결과: {result}")
+        logger.debug("extract_order_from_uploaded_image 결과: %s", result)
 
 
 
@@ -489,7 +489,7 @@ def order_upload_pc_func():
 
         # ✅ DB 시트에서 회원번호, 휴대폰번호 가져오기
         member_info = get_member_info_by_name(member_name)
-        print(f"📌 [DEBUG] member_info={member_info}")
+        logger.debug("member_info=%s", member_info)
 
         member_number = member_info.get("회원번호", "")
         member_phone = member_info.get("휴대폰번호", "")
@@ -527,8 +527,8 @@ def order_upload_pc_func():
         payload = {"회원명": member_name, "orders": orders_list}
 
         # 📌 로그 찍기
-        print("==== addOrders 호출 직전 payload ====")
-        print(json.dumps(payload, ensure_ascii=False, indent=2))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("addOrders 호출 직전 payload: %s", json.dumps(payload, ensure_ascii=False))
 
         # 시트 저장 호출
         save_results = []
@@ -536,7 +536,7 @@ def order_upload_pc_func():
             res = handle_order_save(order)
             save_results.append(res)
 
-        print(f"📌 [DEBUG] handle_order_save 결과: {save_results}")
+        logger.debug("handle_order_save 결과: %s", save_results)
 
 
 
@@ -575,7 +575,7 @@ def order_upload_ipad_func():
         if image_file:
             image_bytes = io.BytesIO(image_file.read())
         elif image_url:
-            resp = requests.get(image_url, timeout=20)
+            resp = get_http_session().get(image_url, timeout=20)
             if resp.status_code != 200: return {"status": "error","message": "이미지 다운로드 실패","http_status": 400}
             image_bytes = io.BytesIO(resp.content)
         else:
@@ -701,20 +701,18 @@ def parse_and_save_order(data: dict):
 # 주문 저장 함수
 # -----------------------------
 def handle_order_save(data: dict):
-    print("\n" + "-"*70)
-    print("📦 [STEP H1] handle_order_save() 진입")
-    print(f"📋 입력 데이터: {data}")
+    logger.debug("[handle_order_save] 입력 데이터: %s", data)
 
 
     sheet = get_worksheet("제품주문")
     if not sheet:
-        print("❌ 제품주문 시트 없음")
+        logger.error("[handle_order_save] 제품주문 시트 없음")
 
         return {"http_status": 500, "status": "error", "message": "제품주문 시트를 찾을 수 없습니다."}
 
     # ✅ 주문일자 변환
     order_date = process_order_date(data.get("주문일자", ""))
-    print(f"📅 주문일자: {order_date}, 👤 회원명: {data.get('회원명')}, 🛍 제품명: {data.get('제품명')}")
+    logger.debug("[handle_order_save] 주문일자=%s, 회원명=%s, 제품명=%s", order_date, data.get("회원명"), data.get("제품명"))
 
     row = [
         order_date, data.get("회원명", ""), 
@@ -729,32 +727,29 @@ def handle_order_save(data: dict):
         data.get("배송처", ""), 
         data.get("수령확인", "")
     ]
-    print(f"[📋] 삽입할 row 데이터 = {row}")
-    
-    values = sheet.get_all_values()
-    print(f"[📑] 기존 시트 row 수 = {len(values)}")
-
-    # ✅ 헤더 없으면 생성
-    if not values:
-        headers = [
-            "주문일자", "회원명", "회원번호", "휴대폰번호",
-            "제품명", "제품가격", "PV", "결재방법",
-            "소비자_고객명", "소비자_휴대폰번호", "배송처", "수령확인"
-        ]
-        sheet.append_row(headers)
-        values = [headers]
-
-    # ✅ 항상 맨 위(2행)에 삽입
-    sheet.insert_row(row, index=2)
-    print("✅ 시트에 row 삽입 완료")
-
-    # ✅ 최신 주문(2행) 조회
-    latest = sheet.row_values(2)
-    print(f"[📦] 최신 저장 결과: {latest}")
-
-    headers = values[0]
-    latest_order = dict(zip(headers, latest))
-    print(f"📦 [STEP H3] 최신 저장된 주문: {latest_order}")
+    logger.debug("[handle_order_save] 삽입할 row 데이터 = %s", row)
+
+    # ✅ 요청 단위 쓰기 묶음 (post_order 처럼 바깥에서 열었으면 거기에 합류 → 한 번에 insert_rows)
+    with unit_of_work() as uow:
+        headers = uow.header(sheet)
+        logger.debug("[handle_order_save] 헤더 열 수 = %d", len(headers))
+
+        # ✅ 헤더 없으면 생성
+        if not any(headers):
+            headers[:] = [
+                "주문일자", "회원명", "회원번호", "휴대폰번호",
+                "제품명", "제품가격", "PV", "결재방법",
+                "소비자_고객명", "소비자_휴대폰번호", "배송처", "수령확인"
+            ]
+            sheet.append_row(headers)
+
+        # ✅ 항상 맨 위(2행)에 삽입 — 주문 색인/행 ID 는 반영(commit) 때 함께 갱신
+        uow.insert_top(sheet, row)
+    logger.info("[handle_order_save] 제품주문 2행 삽입 예약/완료: %s", data.get("회원명"))
+
+    # ✅ 최신 주문 = 시트에 기록될 값 그대로 (다시 읽지 않음)
+    latest_order = dict(zip(headers, [as_written(v) for v in row]))
+    logger.debug("[handle_order_save] 최신 저장된 주문: %s", latest_order)
     
     return {
         "http_status": 200,
@@ -30,7 +30,7 @@ from .service import (
 # --------------------------
 from .service import (
    
-    save_order_to_sheet, find_order, register_order,
+    save_order_to_sheet, find_order, find_orders, register_order,
     update_order, delete_order, delete_order_by_row,
     clean_order_data, 
 )
@@ -60,7 +60,7 @@ __all__ = [
 
     # 주문
    
-    "save_order_to_sheet", "find_order", "register_order",
+    "save_order_to_sheet", "find_order", "find_orders", "register_order",
     "update_order", "delete_order", "delete_order_by_row",
     "clean_order_data", 
 
@@ -44,6 +44,8 @@ from utils import (
 
     get_order_sheet, 
 )
+from utils.order_index import order_store
+from utils.row_ids import row_id_store, with_row_id, without_row_id
 
 
 
@@ -58,14 +60,14 @@ def register_member(name: str, number: str, phone: str) -> bool:
     headers = sheet.row_values(1)
     data = {"회원명": name, "회원번호": number, "휴대폰번호": phone}
     row = [data.get(h, "") for h in headers]
-    sheet.append_row(row, value_input_option="USER_ENTERED")
+    row_id_store.append(sheet, row, header=headers, value_input_option="USER_ENTERED")
     return True
 
 
 def find_member(name: str):
     sheet = get_member_sheet()
     rows = sheet.get_all_records()
-    return [row for row in rows if str(row.get("회원명", "")).strip() == str(name).strip()]
+    return [without_row_id(row) for row in rows if str(row.get("회원명", "")).strip() == str(name).strip()]
 
 
 def update_member(name: str, updates: dict) -> bool:
@@ -87,7 +89,7 @@ def delete_member(name: str) -> bool:
     rows = sheet.get_all_records()
     for i, row in enumerate(rows, start=2):
         if str(row.get("회원명", "")).strip() == str(name).strip():
-            sheet.delete_rows(i)
+            row_id_store.delete_row(sheet, i)
             return True
     return False
 
@@ -100,18 +102,12 @@ def normalize_text(s) -> str:
 
 def find_member_internal(name: str = "", number: str = "", code: str = "", phone: str = "", special: str = ""):
     rows = get_rows_from_sheet("DB")
-    results = []
     name, number, code, phone, special = map(normalize_text, [name, number, code, phone, special])
-    for row in rows:
-        if (
-            (name and normalize_text(row.get("회원명", "")) == name) or
-            (number and normalize_text(row.get("회원번호", "")) == number) or
-            (code and normalize_text(row.get("코드", "")) == code) or
-            (phone and normalize_text(row.get("휴대폰번호", "")) == phone) or
-            (special and normalize_text(row.get("특수번호", "")) == special)
-        ):
-            results.append(row)
-    return results
+    # 조건 하나라도 맞으면 (OR) — NFC 정규화 후 대소문자 구분 비교라 검색 엔진 인덱스 대신 행 단위로 확인
+    fields = {k: v for k, v in {"회원명": name, "회원번호": number, "코드": code,
+                                "휴대폰번호": phone, "특수번호": special}.items() if v}
+    return [row for row in rows
+            if any(normalize_text(row.get(k, "")) == v for k, v in fields.items())]
 
 
 def clean_member_data(data: dict) -> dict:
@@ -158,7 +154,7 @@ def register_member_internal(name: str, number: str = "", phone: str = ""):
     if "휴대폰번호" in headers and phone:
         new_row[headers.index("휴대폰번호")] = phone
 
-    sheet.insert_row(new_row, 2)
+    row_id_store.insert_top(sheet, new_row, header=headers)
     return {
         "status": "created",
         "message": f"{name} 회원 신규 등록 완료",
@@ -210,7 +206,7 @@ def delete_member_internal(name, member_number):
                 return {"error": "백업 시트를 찾을 수 없습니다."}, 500
             backup_row = [row.get(h, "") for h in headers]
             backup_sheet.insert_row(backup_row, 2)
-            delete_row(sheet, i)
+            row_id_store.delete_row(sheet, i)
             return {"message": f"{name}님의 회원 정보가 '백업' 시트에 저장된 후 삭제되었습니다."}, 200
     return {"error": f"{name} 회원을 찾을 수 없습니다."}, 404
 
@@ -265,7 +261,7 @@ def process_member_query(user_input: str):
             cell_value = str(row.get(field, "")).strip()
             if field == "코드": cell_value = cell_value.upper()
             if cell_value != value: match = False; break
-        if match: results.append(row)
+        if match: results.append(without_row_id(row))
     return {"original": user_input, "processed": search_key, "conditions": conditions, "results": results}
 
 # =================================================
@@ -278,7 +274,7 @@ def save_memo(sheet_name: str, member_name: str, content: str) -> bool:
     elif sheet_name == "활동일지": sheet = get_activity_log_sheet()
     else: raise ValueError(f"지원하지 않는 일지: {sheet_name}")
     ts = now_kst().strftime("%Y-%m-%d %H:%M")
-    sheet.insert_row([ts, member_name.strip(), content.strip()], index=2)
+    row_id_store.insert_top(sheet, [ts, member_name.strip(), content.strip()])
     return True
 
 
@@ -287,7 +283,7 @@ def find_memo(keyword: str, sheet_name: str = "상담일지") -> list:
         sheet = get_worksheet(sheet_name)
         if not sheet: return []
         all_records = sheet.get_all_records()
-        return [row for row in all_records if keyword in " ".join(str(v) for v in row.values())]
+        return [without_row_id(row) for row in all_records if keyword in " ".join(str(v) for v in row.values())]
     except Exception as e:
         print(f"[ERROR] find_memo 오류: {e}")
         return []
@@ -329,7 +325,8 @@ def save_order_to_sheet(order: dict) -> bool:
         sheet = get_order_sheet()
         headers = sheet.row_values(1)
         row_data = [order.get(h, "") for h in headers]
-        append_row(sheet, row_data)
+        row_id = row_id_store.append(sheet, row_data, header=headers, value_input_option="USER_ENTERED")
+        order_store.notify_append(sheet, with_row_id(row_data, headers, row_id))
         return True
     except Exception as e:
         print(f"[ERROR] 주문 저장 중 오류: {e}")
@@ -337,11 +334,18 @@ def save_order_to_sheet(order: dict) -> bool:
 
 
 def find_order(member_name: str = "", product: str = "") -> list[dict]:
+    # 회원명 또는 제품명 일치 (주문 색인 사용)
     sheet = get_order_sheet()
-    db = sheet.get_all_values()
-    if not db or len(db) < 2: return []
-    headers, rows = db[0], db[1:]
-    return [dict(zip(headers, row)) for row in rows if (member_name and row[headers.index("회원명")] == member_name) or (product and row[headers.index("제품명")] == product)]
+    return order_store.find_any(sheet, {"회원명": member_name}, {"제품명": product})
+
+
+def find_orders(criteria: dict) -> list[dict]:
+    """
+    복합 조건 주문 조회 (모든 조건 일치)
+    예: {"회원명": "이태수", "제품명": "징코앤낫토", "주문월": "2025-10"}
+        {"회원번호": "22366", "주문일자__gte": "2025-10-01"}
+    """
+    return order_store.find(get_order_sheet(), criteria)
 
 
 def register_order(order_data: dict) -> bool:
@@ -351,41 +355,32 @@ def register_order(order_data: dict) -> bool:
     for k, v in order_data.items():
         if k in headers: row[k] = str(v)
     values = [row.get(h, "") for h in headers]
-    sheet.append_row(values)
+    row_id = row_id_store.append(sheet, values, header=headers)
+    order_store.notify_append(sheet, with_row_id(values, headers, row_id))
     return True
 
 
 def update_order(member_name: str, updates: dict) -> bool:
     sheet = get_order_sheet()
-    headers = sheet.row_values(1)
-    values = sheet.get_all_values()
-    member_col = headers.index("회원명") + 1
-    target_row = None
-    for i, row in enumerate(values[1:], start=2):
-        if len(row) >= member_col and row[member_col - 1] == member_name.strip():
-            target_row = i; break
-    if not target_row: raise ValueError(f"'{member_name}' 회원의 주문을 찾을 수 없습니다.")
-    for field, value in updates.items():
-        if field in headers:
-            sheet.update_cell(target_row, headers.index(field) + 1, str(value))
+    found = order_store.locate(sheet, {"회원명": member_name.strip()})
+    if not found: raise ValueError(f"'{member_name}' 회원의 주문을 찾을 수 없습니다.")
+    order_id, target_row = found
+    order_store.update(sheet, order_id, target_row, updates,
+                       lambda r, c, v: sheet.update_cell(r, c, str(v)))
     return True
 
 
 def delete_order(member_name: str) -> bool:
     sheet = get_order_sheet()
-    values = sheet.get_all_values()
-    headers = values[0] if values else []
-    member_col = headers.index("회원명") if "회원명" in headers else None
-    if member_col is None: raise ValueError("주문 시트에 '회원명' 컬럼이 없습니다.")
-    for i, row in enumerate(values[1:], start=2):
-        if len(row) > member_col and row[member_col] == member_name.strip():
-            delete_row(sheet, i); return True
-    return False
+    found = order_store.locate(sheet, {"회원명": member_name.strip()})
+    if not found: return False
+    order_store.delete(sheet, *found)
+    return True
 
 
 def delete_order_by_row(row: int):
     sheet = get_order_sheet()
-    delete_row(sheet, row)
+    order_store.delete_row(sheet, row)
 
 
 def clean_order_data(order: dict) -> dict:
@@ -30,3 +30,37 @@ def assert_not_contains(results, key, value):
     """
     assert all(str(r.get(key, "")) != str(value) for r in results), \
         f"❌ {key}={value} 가 results에 남아있음: {results}"
+
+
+@pytest.fixture
+def fake_spreadsheet():
+    """
+    메모리 내 가짜 스프레드시트로 시트 접근 전환
+    - DB/일지/제품주문 각 50행 합성 데이터
+    - 테스트 종료 시 기본 연결로 복귀
+    """
+    from utils.fake_gspread import build_synthetic_spreadsheet
+    from utils.sheets import use_spreadsheet
+
+    ss = build_synthetic_spreadsheet(50)
+    use_spreadsheet(ss)
+    yield ss
+    use_spreadsheet(None)
+
+
+# =====================================================
+# 벤치마크 (기본 실행에서 제외)
+# =====================================================
+def pytest_addoption(parser):
+    parser.addoption("--benchmarks", action="store_true", default=False,
+                     help="sheets_benchmark 표시 테스트(시트 크기별 벤치마크)도 실행")
+
+
+def pytest_collection_modifyitems(config, items):
+    """--benchmarks 가 없으면 sheets_benchmark 테스트 건너뜀 (100k 행 1회차가 수 초)"""
+    if config.getoption("--benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="벤치마크는 --benchmarks 로 실행")
+    for item in items:
+        if "sheets_benchmark" in item.keywords:
+            item.add_marker(skip)
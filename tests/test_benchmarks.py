@@ -0,0 +1,80 @@
+"""
+시트 의존 핫패스 벤치마크 (가짜 gspread 백엔드)
+- 기본 pytest 실행에서는 건너뜀 → --benchmarks 로 실행 (pytest-benchmark 미설치 시 건너뜀)
+- 시트 크기: BENCH_SIZES (기본 "1000,10000,100000")
+- 예: pytest tests/test_benchmarks.py --benchmarks --benchmark-only --benchmark-compare
+"""
+import os
+
+import pytest
+from flask import Flask, g
+
+pytestmark = pytest.mark.sheets_benchmark
+pytest.importorskip("pytest_benchmark")
+
+from utils.fake_gspread import build_synthetic_spreadsheet
+from utils.sheets import use_spreadsheet
+from utils.unit_of_work import unit_of_work
+
+
+SIZES = [int(s) for s in os.getenv("BENCH_SIZES", "1000,10000,100000").split(",") if s.strip()]
+
+_bench_app = Flask("bench")
+_spreadsheets = {}
+
+
+@pytest.fixture(params=SIZES, ids=lambda n: f"{n}rows")
+def sheet_size(request):
+    """크기별 합성 스프레드시트 (크기당 한 번 생성)"""
+    size = request.param
+    if size not in _spreadsheets:
+        _spreadsheets[size] = build_synthetic_spreadsheet(size)
+    use_spreadsheet(_spreadsheets[size])
+    with _bench_app.test_request_context(json={}):
+        g.query = {}
+        yield size
+    use_spreadsheet(None)
+
+
+def _member_name(size):
+    return _spreadsheets[size].worksheet("DB").row_values(size // 2 + 1)[0]
+
+
+def test_bench_find_member_logic(benchmark, sheet_size):
+    from routes.routes_member import find_member_logic
+
+    result = benchmark(find_member_logic, _member_name(sheet_size))
+    assert result["status"] == "success" and result["count"] >= 1
+
+
+def test_bench_search_memo_core(benchmark, sheet_size):
+    from routes.routes_memo import search_memo_core
+
+    results = benchmark(search_memo_core, "상담일지", ["상담", "교육"], limit=20)
+    assert len(results) == 20
+
+
+def test_bench_handle_order_save(benchmark, sheet_size):
+    from routes.routes_order import handle_order_save
+
+    order = {"주문일자": "2025-01-01", "회원명": _member_name(sheet_size), "제품명": "노니",
+             "제품가격": 30000, "PV": 30, "결재방법": "카드"}
+    ws = _spreadsheets[sheet_size].worksheet("제품주문")
+    height = len(ws.get_all_values())
+
+    def remove_saved(*_):
+        # 회차마다 같은 시트 상태에서 측정 → 저장된 2행을 색인과 함께 삭제 (측정 시간 제외)
+        with unit_of_work() as uow:
+            uow.delete_row(ws, 2)
+
+    result = benchmark.pedantic(handle_order_save, args=(order,), teardown=remove_saved, rounds=20)
+    assert result["status"] == "ok"
+    assert len(ws.get_all_values()) == height
+
+
+def test_bench_update_member_func(benchmark, sheet_size):
+    from routes.routes_member import update_member_func
+
+    request = {"raw_text": f"{_member_name(sheet_size)} 수정 주소 서울 강남구", "choice": "1"}
+    result = benchmark(update_member_func, request)
+    assert result["status"] == "success"
@@ -0,0 +1,43 @@
+from routes.routes_memo import search_memo_core
+from routes.routes_order import get_member_info_by_name_list
+from utils.sheet_refresh import sheet_snapshots
+from utils.sheets import get_member_info, get_rows_from_sheet, read_columns
+
+
+def test_member_info_reads_only_needed_columns(fake_spreadsheet):
+    sheet_snapshots.clear()
+    calls = fake_spreadsheet.config.calls
+    name, number, phone = fake_spreadsheet.worksheet("DB").row_values(2)[:3]
+
+    assert get_member_info(name) == (number, phone)
+    assert get_member_info_by_name_list(name)[0]["회원번호"] == number
+    assert (calls["values_batch_get"], calls["get_all_records"]) == (2, 0)
+
+    get_member_info(name)   # "DB#회원명,회원번호,휴대폰번호" 스냅샷
+    assert calls["values_batch_get"] == 2
+
+
+def test_fresh_full_snapshot_is_projected_without_calls(fake_spreadsheet):
+    sheet_snapshots.clear()
+    calls = fake_spreadsheet.config.calls
+    records = get_rows_from_sheet("DB")
+    before = dict(calls)
+
+    rows = read_columns("DB", ("휴대폰번호", "없는열"))
+    assert rows[0] == (records[0]["휴대폰번호"], "") and len(rows) == len(records)
+    assert dict(calls) == before
+
+    results = search_memo_core("상담일지", [], limit=5)
+    assert len(results) == 5 and calls["get_all_records"] == before["get_all_records"]
+
+
+def test_moved_columns_reread_header(fake_spreadsheet):
+    ss = fake_spreadsheet
+    assert read_columns("후원수당", ("회원명", "비고")) == []
+
+    ss.del_worksheet(ss.worksheet("후원수당"))
+    ss.add_worksheet("후원수당", values=[["비고", "회원명", "지급일자"], ["보류", "홍길동", "2025-08-07"]])
+    before = ss.config.calls["row_values"]
+
+    assert read_columns("후원수당", ("회원명", "비고")) == [("홍길동", "보류")]
+    assert ss.config.calls["row_values"] == before + 1
@@ -0,0 +1,55 @@
+from flask import Flask, g
+
+from parser.parse import (
+    _parse_commission_cached,
+    cleanup_lookup_commission_rows,
+    parse_commission,
+    parse_commission_query,
+)
+from routes.routes_commission import search_commission_by_nl_func
+
+
+def test_query_parse_is_pure_and_cached(fake_spreadsheet):
+    _parse_commission_cached.cache_clear()
+    calls = dict(fake_spreadsheet.config.calls)
+
+    first = parse_commission_query("홍길동 2025-08-07 좌 10000 우 20000")
+    first["data"]["회원명"] = "변경"
+    again = parse_commission_query("홍길동 2025-08-07 좌 10000 우 20000")
+
+    assert again["data"] == {"회원명": "홍길동", "기준일자": "2025-08-07", "합계_좌": 10000, "합계_우": 20000}
+    assert _parse_commission_cached.cache_info().hits == 1
+    assert dict(fake_spreadsheet.config.calls) == calls
+    assert parse_commission_query("  ")["status"] == "fail"
+
+
+def test_nl_lookup_never_appends(fake_spreadsheet):
+    ws = fake_spreadsheet.worksheet("후원수당")
+    ws.append_row(["2025-08-07", "홍길동", "30000", ""])
+    before = len(ws.get_all_values())
+
+    app = Flask("commission_query_test")
+    with app.test_request_context("/commission"):
+        g.query = {"raw_text": "홍길동 후원수당"}
+        result = search_commission_by_nl_func()
+
+    assert result["status"] == "success"
+    assert [r["회원명"] for r in result["results"]] == ["홍길동"]
+    assert len(ws.get_all_values()) == before
+    assert fake_spreadsheet.config.calls["append_row"] == 1
+
+
+def test_cleanup_removes_lookup_rows(fake_spreadsheet):
+    ws = fake_spreadsheet.worksheet("후원수당")
+    ws.append_row(["2025-08-07", "홍길동", "30000", ""])
+    parse_commission("홍길동 후원수당")
+    parse_commission("이태수 후원수당")
+    ws.append_row(["2025-09-07", "이태수", "", "보류"])
+    parse_commission("김철수 후원수당")
+
+    preview = cleanup_lookup_commission_rows(dry_run=True)
+    assert preview["rows"] == [3, 4, 6] and len(ws.get_all_values()) == 6
+
+    assert cleanup_lookup_commission_rows()["deleted"] == 3
+    assert [r[1] for r in ws.get_all_values()[1:]] == ["홍길동", "이태수"]
+    assert cleanup_lookup_commission_rows()["rows"] == []
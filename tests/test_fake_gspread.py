@@ -0,0 +1,59 @@
+import pytest
+from gspread.exceptions import APIError, WorksheetNotFound
+
+from utils.fake_gspread import FakeBackendConfig, FakeSpreadsheet, FakeWorksheet
+from utils.sheets import get_rows_from_sheet, get_worksheet, safe_update_cell
+
+
+def test_worksheet_read_write():
+    ws = FakeWorksheet("DB", [["회원명", "회원번호"], ["이태수", "22366"]])
+    ws.insert_row(["홍길동", 12345], index=2)
+    ws.append_row(["김철수"])
+
+    assert ws.get_all_values() == [["회원명", "회원번호"], ["홍길동", "12345"], ["이태수", "22366"], ["김철수", ""]]
+    assert ws.get_all_records()[0] == {"회원명": "홍길동", "회원번호": 12345}
+    assert ws.row_values(4) == ["김철수"]
+    assert ws.col_values(2) == ["회원번호", "12345", "22366"]
+
+    ws.update_cell(4, 2, "99999")
+    ws.batch_update([{"range": "A2:B2", "values": [["박영희", "11111"]]}])
+    ws.delete_rows(3)
+    assert ws.get_all_values()[1:] == [["박영희", "11111"], ["김철수", "99999"]]
+
+
+def test_spreadsheet_lookup():
+    ss = FakeSpreadsheet()
+    ss.add_worksheet("DB", values=[["회원명"]])
+    assert ss.worksheet("DB").title == "DB"
+    with pytest.raises(WorksheetNotFound):
+        ss.worksheet("없음")
+
+
+def test_quota_error_injection_and_retry(monkeypatch):
+    monkeypatch.setattr("utils.sheets.time.sleep", lambda s: None)
+    config = FakeBackendConfig(quota_error_every=2)
+    ws = FakeWorksheet("DB", [["회원명"], ["이태수"]], config=config)
+
+    ws.row_values(1)
+    with pytest.raises(APIError) as exc:
+        ws.row_values(1)
+    assert "429" in str(exc.value)
+
+    # safe_update_cell: 4번째 호출(429) → 재시도 후 성공
+    ws.row_values(1)
+    assert safe_update_cell(ws, 2, 1, "홍길동", clear_first=False)
+    config.quota_error_every = 0
+    assert ws.row_values(2) == ["홍길동"]
+    assert config.calls["update_cell"] == 2
+
+    # 항상 429 → 최대 재시도 후 실패
+    always = FakeWorksheet("DB", [["회원명"]], config=FakeBackendConfig(quota_error_every=1))
+    assert safe_update_cell(always, 1, 1, "x", clear_first=False, max_retries=3) is False
+    assert always.config.calls["update_cell"] == 3
+
+
+def test_selectable_through_sheets(fake_spreadsheet):
+    assert get_worksheet("db") is fake_spreadsheet.worksheet("DB")
+    rows = get_rows_from_sheet("DB")
+    assert len(rows) == 50
+    assert rows[0]["회원번호"] == 10000000
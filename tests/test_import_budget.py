@@ -0,0 +1,74 @@
+"""
+app import 비용 점검
+- import 중 네트워크 호출(소켓 연결/DNS)이 있으면 실패
+- import 시간이 예산(IMPORT_BUDGET_SECONDS, 기본 5초)을 넘으면 실패
+"""
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET = float(os.getenv("IMPORT_BUDGET_SECONDS", "5"))
+
+PROBE = textwrap.dedent("""
+    import socket, sys, time
+
+    def _blocked(*args, **kwargs):
+        raise RuntimeError(f"import 중 네트워크 호출: {args!r}")
+
+    socket.socket.connect = _blocked
+    socket.create_connection = _blocked
+    socket.getaddrinfo = _blocked
+
+    start = time.perf_counter()
+    import app
+    print(f"{time.perf_counter() - start:.3f}")
+""")
+
+
+def _run_probe():
+    env = dict(os.environ)
+    # 자격증명/시트 키가 없어도 import 는 성공해야 함
+    for key in ("GOOGLE_SHEET_KEY", "GOOGLE_SHEET_TITLE", "GOOGLE_CREDENTIALS_JSON", "MEMBERSLIST_API_URL"):
+        env.pop(key, None)
+    env["PYTHONPATH"] = ROOT
+    return subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+
+
+def test_app_import_has_no_network_and_fits_budget():
+    proc = _run_probe()
+    if proc.returncode != 0:
+        pytest.fail(f"❌ app import 실패\n{proc.stderr[-2000:]}")
+
+    elapsed = float(proc.stdout.strip().splitlines()[-1])
+    assert elapsed < BUDGET, f"❌ app import {elapsed:.2f}s (예산 {BUDGET}s 초과)"
+
+
+def test_provider_is_lazy_and_created_once():
+    from utils.providers import is_initialized, provider, reset_providers
+
+    calls = []
+
+    @provider("_test_resource")
+    def get_resource():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("첫 시도 실패")
+        return object()
+
+    assert not is_initialized("_test_resource")
+    with pytest.raises(ConnectionError):
+        get_resource()              # 실패는 보관하지 않음
+    first = get_resource()
+    assert get_resource() is first
+    assert len(calls) == 2
+
+    reset_providers("_test_resource")
+    assert get_resource() is not first
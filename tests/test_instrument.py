@@ -0,0 +1,81 @@
+import json
+import logging
+
+from flask import Flask
+
+from utils import instrument
+from utils.sheets import get_rows_from_sheet
+
+
+def test_request_stats_totals_and_header():
+    stats = instrument.RequestStats("POST", "/member")
+    stats.record("sheets", "get_all_records", 0.2, 1000)
+    stats.record("sheets", "insert_row", 0.1, error="429")
+    stats.record("openai", "POST api.openai.com/v1/chat/completions", 1.5, 300)
+
+    assert stats.totals["sheets"] == {"count": 2, "ms": 300.0, "bytes": 1000, "errors": 1}
+    header = stats.server_timing(total_ms=2000)
+    assert header == 'sheets;dur=300.0;desc="2 calls", openai;dur=1500.0;desc="1 calls", total;dur=2000.0'
+
+
+def test_record_outside_request_is_ignored():
+    instrument.end_request()
+    instrument.record("sheets", "get_all_values", 0.1)
+    assert instrument.current() is None
+
+
+def test_classify_url():
+    assert instrument.classify_url("https://api.openai.com/v1/chat/completions") == "openai"
+    assert instrument.classify_url("https://sheets.googleapis.com/v4/spreadsheets/x") == "sheets"
+    assert instrument.classify_url("https://example.com/search_memo") == "http"
+
+
+def test_flask_hooks_emit_header_and_slow_dump(fake_spreadsheet, monkeypatch, caplog):
+    monkeypatch.setattr(instrument, "SLOW_REQUEST_MS", 0)
+    app = Flask("instrument_test")
+    instrument.init_instrumentation(app)
+
+    @app.route("/rows")
+    def rows():
+        instrument.annotate(intent="search_member")
+        return {"count": len(get_rows_from_sheet("DB"))}
+
+    with caplog.at_level(logging.INFO, logger="instrument"):
+        response = app.test_client().get("/rows", headers={"X-Request-ID": "req-1"})
+
+    assert response.json == {"count": 50}
+    assert 'sheets;dur=' in response.headers["Server-Timing"]
+    assert 'desc="1 calls"' in response.headers["Server-Timing"]
+    assert response.headers["X-Request-ID"] == "req-1"
+
+    events = [json.loads(r.getMessage()) for r in caplog.records if r.name == "instrument"]
+    request_log, slow_log = events
+    assert request_log["event"] == "request" and request_log["intent"] == "search_member"
+    assert request_log["external"]["sheets"]["count"] == 1
+    assert slow_log["event"] == "slow_request"
+    assert slow_log["calls"][0]["op"] == "get_all_records"
+
+
+def test_openai_client_calls_are_recorded(monkeypatch):
+    import httpx
+
+    from utils.providers import get_openai_client, reset_providers
+
+    completion = {"id": "c1", "object": "chat.completion", "created": 0, "model": "gpt-4o-mini",
+                  "choices": [{"index": 0, "finish_reason": "stop",
+                               "message": {"role": "assistant", "content": "ok"}}]}
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(httpx.HTTPTransport, "handle_request",
+                        lambda self, request: httpx.Response(200, json=completion, request=request))
+    reset_providers("openai")
+    try:
+        instrument.start_request("POST", "/parse")
+        reply = get_openai_client().chat.completions.create(
+            model="gpt-4o-mini", messages=[{"role": "user", "content": "hi"}])
+        stats = instrument.end_request()
+    finally:
+        reset_providers("openai")
+
+    assert reply.choices[0].message.content == "ok"
+    assert stats.totals["openai"]["count"] == 1
+    assert stats.calls[0]["op"] == "POST api.openai.com/v1/chat/completions"
@@ -0,0 +1,128 @@
+import pytest
+
+from utils import journal
+from utils.journal import JournalWriter, read_with_pending
+from utils.providers import reset_providers
+
+
+@pytest.fixture
+def writer(fake_spreadsheet, tmp_path, monkeypatch):
+    monkeypatch.setattr(journal, "JOURNAL_DIR", str(tmp_path))
+    monkeypatch.setenv("JOURNAL_FLUSH_SECONDS", "60")
+    reset_providers("journal")
+    w = journal.get_journal()
+    yield w
+    w.close(flush=False)
+    reset_providers("journal")
+
+
+def test_enqueue_is_visible_before_flush_and_flushes_in_one_batch(writer, fake_spreadsheet):
+    ws = fake_spreadsheet.worksheet("상담일지")
+    before = len(ws.get_all_values())
+
+    writer.enqueue("상담일지", ["2025-01-01 09:00", "이태수", "첫 메모"])
+    writer.enqueue("상담일지", ["2025-01-01 09:01", "이태수", "둘째 메모"])
+
+    rows = read_with_pending("상담일지", ws.get_all_records)
+    assert [r["내용"] for r in rows[:2]] == ["둘째 메모", "첫 메모"]
+    assert len(ws.get_all_values()) == before
+
+    calls = fake_spreadsheet.config.calls["insert_rows"]
+    assert writer.flush() == 2
+    assert fake_spreadsheet.config.calls["insert_rows"] == calls + 1
+    assert ws.get_all_values()[1][2] == "둘째 메모"
+    assert writer.pending_count() == 0
+
+    # 반영 후에는 중복 없이 시트 행만
+    rows = read_with_pending("상담일지", ws.get_all_records)
+    assert [r["내용"] for r in rows].count("첫 메모") == 1
+
+
+def test_replay_after_crash(fake_spreadsheet, tmp_path):
+    path = str(tmp_path / "journal-1.log")
+    first = JournalWriter(path).open()
+    first.enqueue("개인일지", ["2025-01-01 10:00", "홍길동", "재시작 전"])
+    first.close(flush=False)
+
+    second = JournalWriter(path).open()
+    assert second.pending_rows("개인일지") == [["2025-01-01 10:00", "홍길동", "재시작 전"]]
+    second.flush()
+    second.close()
+
+    assert fake_spreadsheet.worksheet("개인일지").get_all_values()[1][2] == "재시작 전"
+    assert JournalWriter(path).open().pending_count() == 0
+
+
+def test_failed_flush_keeps_rows(fake_spreadsheet, tmp_path):
+    w = JournalWriter(str(tmp_path / "journal-2.log")).open()
+    w.enqueue("활동일지", ["2025-01-01 11:00", "김철수", "재시도"])
+
+    fake_spreadsheet.config.quota_error_every = 1
+    assert w.flush() == 0
+    assert w.pending_count() == 1
+
+    fake_spreadsheet.config.quota_error_every = 0
+    assert w.flush() == 1
+    w.close()
+
+
+def test_save_memo_then_search(writer):
+    from parser.parse import save_memo
+    from routes.routes_memo import search_memo_core
+
+    assert save_memo("상담일지", "이태수", "write-behind 저장 확인") is True
+    results = search_memo_core("상담일지", ["write-behind"], member_name="이태수")
+    assert results and results[0]["내용"] == "write-behind 저장 확인"
+
+
+def _orphan_log(path, text):
+    orphan = JournalWriter(str(path)).open()
+    orphan.enqueue("상담일지", ["2025-01-01 12:00", "홍길동", text])
+    orphan.close(flush=False)
+
+
+def test_orphan_log_is_claimed_before_replay(fake_spreadsheet, tmp_path):
+    dead = 999999
+    _orphan_log(tmp_path / f"journal-{dead}.log", "인수 대상")
+    _orphan_log(tmp_path / f"journal-{dead - 1}.log.claimed-{dead}", "인수 중 종료")   # 선점한 워커도 종료
+    _orphan_log(tmp_path / f"journal-{dead - 2}.log.claimed-1", "다른 워커가 인수 중")   # 살아 있는 워커
+
+    w = JournalWriter(str(tmp_path / "journal-3.log")).open()
+    assert w.adopt_orphans() == 2
+    assert sorted(r[2] for r in w.pending_rows("상담일지")) == ["인수 대상", "인수 중 종료"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["journal-3.log", f"journal-{dead - 2}.log.claimed-1"]
+    w.close(flush=False)
+
+
+def test_lost_claim_race_does_not_replay(fake_spreadsheet, tmp_path, monkeypatch):
+    _orphan_log(tmp_path / "journal-999999.log", "한 번만")
+
+    def taken(src, dst):
+        raise FileNotFoundError(src)   # 다른 워커가 먼저 rename
+    monkeypatch.setattr(journal.os, "rename", taken)
+
+    w = JournalWriter(str(tmp_path / "journal-4.log")).open()
+    assert w.adopt_orphans() == 0 and w.pending_count() == 0
+    w.close(flush=False)
+
+
+def test_first_request_replays_and_adopts(fake_spreadsheet, tmp_path, monkeypatch):
+    from flask import Flask
+
+    monkeypatch.setattr(journal, "JOURNAL_DIR", str(tmp_path))
+    reset_providers("journal")
+    _orphan_log(tmp_path / "journal-999999.log", "저장 없이 인수")
+
+    app = Flask("journal_init_test")
+    journal.init_journal(app)
+    app.add_url_rule("/", "home", lambda: "ok")
+    ws = fake_spreadsheet.worksheet("상담일지")
+    assert not journal.is_initialized("journal")
+
+    app.test_client().get("/")
+    try:
+        rows = read_with_pending("상담일지", ws.get_all_records)
+        assert rows[0]["내용"] == "저장 없이 인수"
+    finally:
+        journal.get_journal().close(flush=False)
+        reset_providers("journal")
@@ -0,0 +1,60 @@
+import io
+import json
+import logging
+
+import pytest
+
+from utils import instrument
+from utils.log import configure_logging
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_json_format_includes_request_id_and_extra(restore_root_logger):
+    stream = io.StringIO()
+    configure_logging("INFO", fmt="json", stream=stream)
+
+    instrument.start_request("POST", "/postIntent", request_id="req-42")
+    try:
+        logging.getLogger("routes.test").info("검색 %d건", 3, extra={"intent": "search_member"})
+    finally:
+        instrument.end_request()
+
+    record = json.loads(stream.getvalue().strip())
+    assert record["msg"] == "검색 3건"
+    assert record["level"] == "INFO"
+    assert record["logger"] == "routes.test"
+    assert record["request_id"] == "req-42"
+    assert record["intent"] == "search_member"
+
+
+def test_debug_is_not_formatted_at_info(restore_root_logger):
+    stream = io.StringIO()
+    configure_logging("INFO", fmt="text", stream=stream)
+
+    class Expensive:
+        formatted = False
+
+        def __str__(self):
+            Expensive.formatted = True
+            return "rows"
+
+    logging.getLogger("routes.test").debug("rows=%s", Expensive())
+    assert Expensive.formatted is False
+    assert stream.getvalue() == ""
+
+
+def test_configure_logging_is_idempotent(restore_root_logger, monkeypatch):
+    monkeypatch.setenv("LOG_LEVEL", "warning")
+    configure_logging()
+    configure_logging()
+    root = logging.getLogger()
+    assert root.level == logging.WARNING
+    assert sum(1 for h in root.handlers if h.get_name() == "members_list") == 1
@@ -0,0 +1,80 @@
+import importlib
+import unicodedata
+
+import numpy as np
+import pytest
+from flask import Flask, g
+
+from parser.parse import find_member_internal
+from routes.routes_member import find_member_logic
+from utils.fake_gspread import make_member_rows
+from utils.member_table import MemberTable, get_member_table
+from utils.sheets import get_rows_from_sheet
+
+
+@pytest.fixture(scope="module")
+def table():
+    values = make_member_rows(1000)
+    return MemberTable([dict(zip(values[0], v)) for v in values[1:]])
+
+
+CASES = [
+    {"코드": "a", "가입일__gte": "2020-01-01", "가입일__lte": "2020-12-31"},
+    {"주소": "대구", "생년월일__month": 3, "코드": "B"},
+    {"회원명__exact": "없는회원", "가입일자__gte": "2015-01-01"},
+    {"휴대폰번호__digits": "010", "주소": "서울"},
+    {"근무처__exact": "", "가입일자__lte": "2016-06-30"},
+    {"가입일__gte": "not-a-date", "코드": "A"},
+]
+
+
+@pytest.mark.parametrize("conditions", CASES)
+def test_plan_matches_full_scan(table, conditions):
+    expected = np.flatnonzero(table.compile_mask(conditions))
+    assert table.positions(conditions).tolist() == expected.tolist()
+
+
+def test_plan_is_cached_per_shape(table):
+    first = table.plan({"회원번호": "10000001", "가입일__gte": "2020-01-01", "주소": "대구"})
+    again = table.plan({"회원번호": "10000999", "가입일__gte": "2015-01-01", "주소": "서울"})
+    assert again is first
+    assert first.describe() == {"index": ["exact:회원번호", "range:가입일자"], "residual": ["partial:주소"]}
+
+
+def test_most_selective_index_first(table, monkeypatch):
+    row = table.rows[10]
+    dates = table.date_index("가입일자")
+    monkeypatch.setattr(dates, "range", lambda *a: pytest.fail("범위 후보를 만들면 안 됨"))
+
+    # 회원번호 버킷(1건) < 가입일자 구간 → 범위 조건은 후보 1건에 대해서만 검사
+    results = table.search({"가입일__gte": "2015-01-01", "회원번호": row["회원번호"]})
+    assert results == [row]
+
+
+def test_search_wrappers_share_one_table(fake_spreadsheet):
+    rows = get_rows_from_sheet("DB")
+    target = rows[5]
+    table = get_member_table(rows)
+    assert get_member_table(get_rows_from_sheet("DB")) is table
+
+    app = Flask("member_query_test")
+    with app.test_request_context(json={}):
+        g.query = {}
+        result = find_member_logic({"휴대폰번호": target["휴대폰번호"].replace("-", "")}, paged=False)
+    assert [r["회원번호"] for r in result["results"]] == [target["회원번호"]]
+
+    found = find_member_internal(name=target["회원명"], number=str(rows[7]["회원번호"]))
+    assert {r["회원번호"] for r in found} >= {target["회원번호"], rows[7]["회원번호"]}
+    assert get_member_table(get_rows_from_sheet("DB")) is table
+
+
+@pytest.mark.parametrize("module", ["parser.parse", "service.service"])
+def test_find_member_internal_matches_nfc_and_keeps_case(module, monkeypatch):
+    mod = importlib.import_module(module)
+    rows = [{"회원명": unicodedata.normalize("NFD", "홍길동"), "코드": "A"},
+            {"회원명": "김철수", "코드": "a"}]
+    monkeypatch.setattr(mod, "get_rows_from_sheet", lambda name: rows)
+
+    assert mod.find_member_internal(name="홍길동") == [rows[0]]
+    assert mod.find_member_internal(code="a") == [rows[1]]
+    assert mod.find_member_internal(name="홍길동", code="a") == rows
@@ -0,0 +1,71 @@
+import tracemalloc
+
+from flask import Flask, jsonify
+
+from utils.fake_gspread import make_member_rows
+from utils.member_rows import CompactTable, MemberRow, member_row_cache
+from utils.response_encoding import init_response_encoding
+from utils.sheets import get_rows_from_sheet
+
+
+def _records(n=500):
+    values = make_member_rows(n)
+    header = values[0]
+    return [dict(zip(header, row)) for row in values[1:]]
+
+
+def test_row_view_behaves_like_read_only_dict():
+    table = CompactTable(["회원명", "회원번호", "코드"], [["이태수", 22366, "A"], ["홍길동"]])
+    row, short = table.rows()
+
+    assert isinstance(row, MemberRow)
+    assert row["회원명"] == "이태수" and row.get("주소", "-") == "-"
+    assert dict(row.items()) == {"회원명": "이태수", "회원번호": 22366, "코드": "A"} == row
+    assert short["코드"] == ""
+    assert table.column("회원명") == ("이태수", "홍길동")
+
+
+def test_low_cardinality_values_are_shared_and_memory_drops():
+    records = _records()
+    codes = [r["코드"] for r in records]
+
+    tracemalloc.start()
+    base = tracemalloc.take_snapshot()
+    dicts = [dict(r) for r in records]
+    as_dicts = sum(s.size_diff for s in tracemalloc.take_snapshot().compare_to(base, "filename"))
+    base = tracemalloc.take_snapshot()
+    table = CompactTable.from_records(records)
+    compact = sum(s.size_diff for s in tracemalloc.take_snapshot().compare_to(base, "filename"))
+    tracemalloc.stop()
+
+    assert len(dicts) == len(table)
+    assert compact * 2 < as_dicts
+    pos = table.index["코드"]
+    first = {}
+    for row in table.values:
+        assert row[pos] is first.setdefault(row[pos], row[pos])
+    assert sorted(first) == sorted(set(codes))
+
+
+def test_db_rows_are_cached_until_write(fake_spreadsheet):
+    member_row_cache.clear()
+    reads = lambda: fake_spreadsheet.config.calls["get_all_records"]
+
+    rows = get_rows_from_sheet("DB")
+    before = reads()
+    again = get_rows_from_sheet("DB")
+    assert reads() == before and again == rows and again is not rows
+
+    fake_spreadsheet.worksheet("DB").insert_row(["신규회원"], index=2)
+    assert get_rows_from_sheet("DB")[0]["회원명"] == "신규회원"
+    assert reads() == before + 1
+
+
+def test_rows_serialize_at_response_boundary(fake_spreadsheet):
+    app = Flask("member_rows_test")
+    init_response_encoding(app)
+    rows = get_rows_from_sheet("DB")[:2]
+
+    with app.app_context():
+        body = jsonify({"results": rows}).get_json()
+    assert body["results"][0]["회원명"] == rows[0]["회원명"]
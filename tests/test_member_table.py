@@ -0,0 +1,75 @@
+from datetime import datetime
+
+import pytest
+
+from utils.member_table import DateIndex, MemberTable
+
+
+ROWS = [
+    {"회원명": "이태수", "회원번호": 22366, "코드": "A", "가입일자": "2024-01-15", "생년월일": "1970-03-02", "주소": "대구 북구"},
+    {"회원명": "이판사", "회원번호": "12345", "코드": "b", "가입일자": "2024-3-5", "생년월일": "", "주소": "서울 강남구"},
+    {"회원명": "김철수", "회원번호": "99999", "코드": "A ", "가입일자": "잘못된날짜", "생년월일": "1985-12-24", "주소": "부산"},
+    {"회원명": "이태수", "회원번호": "55555", "코드": "AA", "가입일자": "2023-12-31", "생년월일": "1990-03-20", "주소": "대구 수성구"},
+]
+
+
+@pytest.fixture
+def table():
+    return MemberTable(ROWS)
+
+
+def test_partial_match_is_case_insensitive(table):
+    results = table.search({"주소": " 대구 "})
+    assert [r["회원번호"] for r in results] == [22366, "55555"]
+
+
+def test_exact_fields_default(table):
+    # 코드/회원번호는 기본 exact (strip + 대소문자 무시)
+    assert [r["회원명"] for r in table.search({"코드": "a"})] == ["이태수", "김철수"]
+    assert [r["회원명"] for r in table.search({"회원번호": "22366"})] == ["이태수"]
+
+
+def test_match_mode_option(table):
+    results = table.search({"코드": "a"}, {"match_mode": {"코드": "partial"}})
+    assert len(results) == 3
+
+
+def test_date_range_skips_unparsable(table):
+    results = table.search({"가입일자__gte": "2024-01-01", "가입일자__lte": "2024-12-31"})
+    assert [r["회원명"] for r in results] == ["이태수", "이판사"]
+
+
+def test_date_alias_and_invalid_bound(table):
+    # parse_natural_query 의 "가입일" → 가입일자 컬럼
+    assert len(table.search({"가입일__lte": "2023-12-31"})) == 1
+    assert table.search({"가입일__gte": "not-a-date"}) == []
+
+
+def test_multi_condition_and_missing_field(table):
+    assert [r["회원번호"] for r in table.search({"회원명": "이태수", "주소": "수성"})] == ["55555"]
+    assert table.search({"없는필드": "x"}) == []
+    assert table.search({}) == ROWS
+
+
+def test_empty_table():
+    assert MemberTable([]).search({"회원명": "이태수"}) == []
+
+
+def test_date_index_range_and_month():
+    index = DateIndex(["2024-01-15", "", "1985-12-24", "2023-12-31", "2024-03-05"])
+    assert len(index) == 4
+    assert sorted(index.range(datetime(2024, 1, 1), datetime(2024, 12, 31)).tolist()) == [0, 4]
+    assert sorted(index.range(end=datetime(2023, 12, 31)).tolist()) == [2, 3]
+    assert sorted(index.month(12).tolist()) == [2, 3]
+    # 연말을 넘어가는 월/일 범위
+    assert sorted(index.month_day_range(1224, 115).tolist()) == [0, 2, 3]
+
+
+def test_indexed_range_intersects_other_conditions(table):
+    results = table.search({"가입일__gte": "2023-01-01", "회원명": "이태수"})
+    assert [r["회원번호"] for r in results] == [22366, "55555"]
+
+
+def test_birthday_month_recurs_yearly(table):
+    assert [r["회원번호"] for r in table.search({"생년월일__month": 3})] == [22366, "55555"]
+    assert table.search({"생년월일__month": "x"}) == []
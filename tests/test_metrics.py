@@ -0,0 +1,80 @@
+import runpy
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+from utils import instrument, metrics
+from utils.sheets import get_rows_from_sheet
+
+pytest.importorskip("prometheus_client")
+
+
+@pytest.fixture
+def metrics_app(fake_spreadsheet):
+    app = Flask("metrics_test")
+    instrument.init_instrumentation(app)
+    metrics.init_metrics(app, ["search_member"])
+
+    @app.route("/rows")
+    def rows():
+        instrument.annotate(intent="search_member")
+        return {"count": len(get_rows_from_sheet("DB"))}
+
+    @app.route("/odd")
+    def odd():
+        instrument.annotate(intent="not_in_map")
+        return {}
+
+    return app
+
+
+def test_metrics_endpoint_exposes_request_and_sheets_metrics(metrics_app):
+    client = metrics_app.test_client()
+    assert client.get("/rows").status_code == 200
+    client.get("/odd")
+
+    body = client.get("/metrics").get_data(as_text=True)
+    assert 'members_request_duration_seconds_count{intent="search_member",method="GET",route="/rows"}' in body
+    assert 'intent="other"' in body
+    assert 'members_external_calls_total{kind="sheets",op_type="read"}' in body
+
+
+def _sample(name, labels):
+    from prometheus_client import REGISTRY
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_retry_and_cache_counters():
+    before_retry = _sample("members_sheets_429_retries_total", {"func": "safe_update_cell"})
+    before_miss = _sample("members_cache_requests_total", {"cache": "result_cache", "result": "miss"})
+
+    metrics.count_retry("safe_update_cell")
+    metrics.cache_event("result_cache", hit=False)
+
+    assert _sample("members_sheets_429_retries_total", {"func": "safe_update_cell"}) == before_retry + 1
+    assert _sample("members_cache_requests_total", {"cache": "result_cache", "result": "miss"}) == before_miss + 1
+
+
+def test_sheets_write_is_classified_as_write():
+    labels = {"kind": "sheets", "op_type": "write"}
+    before = _sample("members_external_calls_total", labels)
+    instrument.record("sheets", "insert_row", 0.01)
+    assert _sample("members_external_calls_total", labels) == before + 1
+
+
+def test_gunicorn_conf_prepares_dir_and_marks_dead_workers(tmp_path, monkeypatch):
+    path = tmp_path / "prom"
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(path))
+    conf = runpy.run_path(str(Path(__file__).resolve().parents[1] / "gunicorn.conf.py"))
+
+    path.mkdir()
+    (path / "gauge_live_1.db").write_text("old")
+    conf["on_starting"](None)
+    assert path.is_dir() and list(path.iterdir()) == []
+
+    dead = []
+    monkeypatch.setattr(metrics, "mark_process_dead", dead.append)
+    conf["child_exit"](None, SimpleNamespace(pid=4321))
+    assert dead == [4321]
@@ -0,0 +1,49 @@
+from utils.name_index import BKTree, NameIndex, choseong, decompose, levenshtein, search_member_names
+
+
+ROWS = [
+    {"회원명": "이태수", "회원번호": "22366"},
+    {"회원명": "김소희", "회원번호": "10001"},
+    {"회원명": "고상현", "회원번호": "10002"},
+    {"회원명": "이태수", "회원번호": "55555"},
+    {"회원명": "이판사", "회원번호": "12345"},
+    {"회원명": "", "회원번호": "00000"},
+]
+
+
+def test_decompose_and_choseong():
+    assert decompose("한") == "ㅎㅏㄴ"
+    assert choseong("김소희") == "ㄱㅅㅎ"
+    assert levenshtein(decompose("이태수"), decompose("이태스")) == 1
+
+
+def test_bktree_query():
+    tree = BKTree()
+    for term in ["apple", "apply", "ape", "banana"]:
+        tree.add(term)
+    assert tree.query("appla", 1) == [(1, "apple"), (1, "apply")]
+
+
+def test_choseong_lookup():
+    index = NameIndex(r["회원명"] for r in ROWS)
+    ranked = index.rank("ㄱㅅㅎ")
+    assert [c["회원명"] for c in ranked] == ["고상현", "김소희"]
+    assert [c["회원명"] for c in index.rank("ㅇㅌ")] == ["이태수"]
+
+
+def test_fuzzy_and_ranking():
+    index = NameIndex(r["회원명"] for r in ROWS)
+    ranked = index.rank("이태스")
+    assert ranked[0]["회원명"] == "이태수"
+    assert ranked[0]["match"] == "fuzzy"
+
+    # 정확 일치가 항상 먼저
+    assert index.rank("이판사")[0]["match"] == "exact"
+    assert index.rank("태수")[0] == {"회원명": "이태수", "match": "contains", "distance": 2, "score": 0.6667}
+
+
+def test_search_expands_homonyms():
+    results = search_member_names(ROWS, "이태스")
+    assert [r["row"]["회원번호"] for r in results[:2]] == ["22366", "55555"]
+    assert search_member_names([], "이태수") == []
+    assert search_member_names(ROWS, "") == []
@@ -0,0 +1,117 @@
+import threading
+
+import pytest
+
+from utils.order_index import OrderIndex, OrderStore
+
+HEADER = ["주문일자", "회원명", "회원번호", "제품명", "배송처"]
+
+
+def _index():
+    return OrderIndex([
+        HEADER,
+        ["2025-10-02", "이태수", "22366", "징코앤낫토", "대구"],
+        ["2025.9.30", "이태수", "22366", "노니주스", "대구"],
+        ["2025-10-01", "홍길동", "11111", "징코앤낫토", "서울"],
+    ])
+
+
+def test_compound_lookup():
+    index = _index()
+    assert index.find({"회원명": "이태수", "제품명": "징코앤낫토", "주문월": "2025-10"}) == [0]
+    assert index.find({"회원번호": "22366", "주문일자__lte": "2025-09-30"}) == [1]
+    assert index.find({"제품명": "징코앤낫토", "배송처": "서울"}) == [2]
+    assert index.find({"회원명": "없는회원"}) == []
+
+
+def test_row_numbers_follow_inserts_and_deletes():
+    index = _index()
+    top = index.insert_top(["2025-10-05", "김철수", "3", "노니주스"])
+    bottom = index.append(["2025-10-06", "박영희", "4", "홍삼"])
+    assert [index.row_number(i) for i in (top, 0, 1, 2, bottom)] == [2, 3, 4, 5, 6]
+
+    index.remove(1)
+    assert index.row_number(2) == 4 and index.row_number(bottom) == 5
+    assert [index.id_at(r) for r in (2, 3, 4, 5, 6)] == [top, 0, 2, bottom, None]
+    assert index.find({"제품명": "노니주스"}) == [top]
+
+
+@pytest.fixture
+def orders(fake_spreadsheet):
+    ws = fake_spreadsheet.worksheet("제품주문")
+    return ws, OrderStore()
+
+
+def test_store_edits_without_rescanning(orders, fake_spreadsheet):
+    ws, store = orders
+    name = ws.get_all_records()[3]["회원명"]
+    expected = [r for r in ws.get_all_records() if r["회원명"] == name]
+    assert [r["제품명"] for r in store.find(ws, {"회원명": name})] == [str(r["제품명"]) for r in expected]
+
+    scans = fake_spreadsheet.config.calls["get_all_values"]
+    ws.insert_row(["2030-01-01", name, "1", "010", "신제품"], index=2)
+    store.notify_insert_top(ws, ws.row_values(2))
+
+    oid, row = store.locate(ws, {"회원명": name})
+    assert row == 2
+    store.update(ws, oid, row, {"배송처": "부산"}, ws.update_cell)
+    assert store.find(ws, {"회원명": name, "제품명": "신제품"})[0]["배송처"] == "부산"
+
+    store.delete(ws, *store.locate(ws, {"회원명": name, "제품명": "신제품"}))
+    assert ws.row_values(2)[1:] != [name, "1", "010", "신제품"]
+    assert fake_spreadsheet.config.calls["get_all_values"] == scans
+
+
+def test_stale_index_is_rebuilt(orders):
+    ws, store = orders
+    name = ws.get_all_records()[0]["회원명"]
+    store.index(ws)
+    # 색인 밖에서 2행 삽입 → 행 번호 어긋남 → 확인 읽기에서 감지 후 재구축
+    ws.insert_row(["2030-01-01", "다른워커", "9"], index=2)
+    assert store.locate(ws, {"회원명": name})[1] == 3
+    assert store.locate(ws, {"회원명": "다른워커"})[1] == 2
+
+
+def test_missing_order_rebuilds_only_when_spreadsheet_changed(orders, fake_spreadsheet):
+    ws, store = orders
+    calls = fake_spreadsheet.config.calls
+    store.index(ws)
+
+    assert store.locate(ws, {"회원명": "없는회원"}) is None   # 수정 표시가 없던 색인 → 1회 재구축
+    reads = calls["get_all_values"]
+    assert store.locate(ws, {"회원명": "없는회원"}) is None
+    assert calls["get_all_values"] == reads                  # 변경 없음 → 확인 요청만
+
+    ws.insert_row(["2030-01-01", "다른워커", "9"], index=2)    # 다른 워커의 저장
+    assert store.locate(ws, {"회원명": "다른워커"})[1] == 2
+    assert calls["get_all_values"] == reads + 1
+
+
+def test_sheet_io_runs_outside_the_store_lock(orders, monkeypatch):
+    ws, store = orders
+    blocked = []
+
+    def lock_is_free():
+        t = threading.Thread(target=lambda: blocked.append(not _try_lock(store)))
+        t.start()
+        t.join()
+
+    get_all_values = ws.get_all_values
+    monkeypatch.setattr(ws, "get_all_values", lambda *a, **k: (lock_is_free(), get_all_values(*a, **k))[1])
+    name = ws.get_all_records()[0]["회원명"]
+    oid, row = store.locate(ws, {"회원명": name})
+
+    def writer(*args):
+        lock_is_free()
+        ws.update_cell(*args)
+
+    store.update(ws, oid, row, {"배송처": "부산"}, writer)
+    assert blocked == [False, False]
+    assert store.find(ws, {"회원명": name})[0]["배송처"] == "부산"
+
+
+def _try_lock(store) -> bool:
+    if store._lock.acquire(timeout=1):
+        store._lock.release()
+        return True
+    return False
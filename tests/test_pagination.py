@@ -0,0 +1,160 @@
+import pytest
+from flask import Flask, g
+
+from utils.pagination import InvalidCursor, decode_cursor, encode_cursor, member_key, paginate, positioned
+
+
+@pytest.fixture
+def app():
+    return Flask("pagination_test")
+
+
+def test_paginate_walks_all_items_once():
+    items = [{"회원명": n, "회원번호": str(i)} for i, n in enumerate(["가", "나", "나", "다", "라"])]
+    key = lambda r: (r["회원명"], r["회원번호"])
+
+    seen, after = [], None
+    while True:
+        page, after, has_more = paginate(items, key, 2, after)
+        seen.extend(page)
+        if not has_more:
+            break
+    assert seen == items
+
+
+def test_positioned_key_pages_through_ties():
+    rows = [{"회원명": "홍길동", "회원번호": "", "휴대폰번호": f"010-0000-000{i}"} for i in range(3)]
+
+    seen, after = [], None
+    while True:
+        page, after, has_more = paginate(enumerate(rows), positioned(member_key), 1, after)
+        seen.extend(r for _, r in page)
+        if not has_more:
+            break
+    assert seen == rows
+
+
+def test_member_search_pages_through_same_name(app, monkeypatch):
+    from routes import routes_member
+    from utils.fake_gspread import make_member_rows
+
+    header = make_member_rows(1)[0]
+    rows = [{**dict.fromkeys(header, ""), "회원명": "홍길동", "휴대폰번호": f"010-0000-000{i}"} for i in range(3)]
+    monkeypatch.setattr(routes_member, "get_rows_from_sheet", lambda name: rows)
+
+    phones, cursor = [], None
+    with app.test_request_context():
+        while True:
+            g.query = {"query": {"회원명": "홍길동"}, "limit": 1, "cursor": cursor}
+            res = routes_member.find_member_logic()
+            assert res["status"] == "success" and res["count"] == 1
+            phones.extend(r["휴대폰번호"] for r in res["results"])
+            cursor = res["next_cursor"]
+            if not res["has_more"]:
+                break
+    assert sorted(phones) == [r["휴대폰번호"] for r in rows]
+
+
+def test_paginate_stops_consuming_after_limit():
+    consumed = []
+
+    def gen():
+        for i in range(100, 0, -1):
+            consumed.append(i)
+            yield i
+
+    page, last_key, has_more = paginate(gen(), lambda i: (i,), 3, descending=True)
+    assert page == [100, 99, 98] and last_key == [98] and has_more
+    assert len(consumed) == 4
+
+
+def test_cursor_is_bound_to_query_scope():
+    token = encode_cursor("scope-a", ["이태수", "22366"])
+    assert decode_cursor(token, "scope-a") == ["이태수", "22366"]
+    assert decode_cursor(None, "scope-a") is None
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token, "scope-b")
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor!", "scope-a")
+
+
+def test_code_search_pages(app, fake_spreadsheet):
+    from routes.routes_member import search_by_code_logic
+
+    collected, cursor = [], None
+    with app.test_request_context():
+        while True:
+            g.query = {"query": "코드 A", "limit": 4, "cursor": cursor}
+            res = search_by_code_logic()
+            assert res["status"] == "success" and res["count"] <= 4
+            collected.extend(r["회원번호"] for r in res["results"])
+            cursor = res["next_cursor"]
+            if not res["has_more"]:
+                break
+
+        assert cursor is None
+        assert len(collected) == len(set(collected)) == res["total"]
+
+        g.query = {"query": "코드 B", "cursor": encode_cursor("other", ["x"])}
+        assert search_by_code_logic()["http_status"] == 400
+
+
+def test_memo_search_pages_per_sheet(app, fake_spreadsheet):
+    from routes.routes_memo import search_memo_core, search_memo_func
+
+    query = {"일지종류": "상담일지", "keywords": ["상담"]}
+    expected = search_memo_core("상담일지", ["상담"], limit=1000)
+
+    collected, cursor = [], None
+    with app.test_request_context():
+        while True:
+            g.query = {"query": query, "limit": 5, "cursor": cursor}
+            res = search_memo_func()
+            collected.extend(res["results"]["상담일지"])
+            cursor = res["next_cursor"]
+            if not res["has_more"]:
+                break
+
+    assert collected == expected
+
+
+def test_image_search_pages_newest_first(app, fake_spreadsheet):
+    from routes.routes_image import search_image_func
+
+    ws = fake_spreadsheet.worksheet("이미지메모")
+    for day in range(1, 8):   # append_image_to_sheet 처럼 2행 삽입 → 맨 위가 최신
+        ws.insert_row([f"2025-01-0{day}", "홍길동", f"link{day}", "메모"], index=2)
+
+    pages, cursor = [], ""
+    while True:
+        with app.test_request_context(f"/search_image?keyword=홍길동&limit=3&cursor={cursor}"):
+            body, status = search_image_func()
+        data = body.get_json()
+        assert status == 200
+        pages.append([r["날짜"][-2:] for r in data["results"]])
+        cursor = data["next_cursor"]
+        if not data["has_more"]:
+            break
+
+    assert pages == [["07", "06", "05"], ["04", "03", "02"], ["01"]]
+
+
+def test_memo_pages_survive_back_dated_rows(app, fake_spreadsheet):
+    from routes.routes_memo import search_memo_core, search_memo_func
+
+    ws = fake_spreadsheet.worksheet("상담일지")
+    ws.insert_row(["2001-01-01 09:00", "홍길동", "소급 상담"], index=2)   # 최신 행이 가장 이른 날짜
+    ws.insert_row(["2099-01-01 09:00", "홍길동", "미래 상담"], index=5)
+    expected = search_memo_core("상담일지", ["상담"], limit=1000)
+
+    collected, cursor = [], None
+    with app.test_request_context():
+        while True:
+            g.query = {"query": {"일지종류": "상담일지", "keywords": ["상담"]}, "limit": 4, "cursor": cursor}
+            res = search_memo_func()
+            collected.extend(res["results"]["상담일지"])
+            cursor = res["next_cursor"]
+            if not res["has_more"]:
+                break
+
+    assert collected == expected and collected[0]["내용"] == "소급 상담"
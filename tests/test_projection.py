@@ -0,0 +1,35 @@
+from flask import Flask, g
+
+from utils.projection import compile_projection, parse_fields
+
+
+def test_parse_fields():
+    assert parse_fields(None).full and parse_fields("*").full
+    p = parse_fields("brief,회원번호, 코드")
+    assert p.fields == ("회원명", "회원번호", "휴대폰번호", "코드") and not p.display
+    assert parse_fields(["회원명", "display"]).display
+
+
+def test_compiled_getter_is_reused_and_keeps_order():
+    getter = compile_projection(("회원번호", "회원명"))
+    assert getter is compile_projection(("회원번호", "회원명"))
+    assert list(getter({"회원명": "이태수", "회원번호": 22366, "주소": "대구"}).items()) == [("회원번호", 22366), ("회원명", "이태수")]
+    assert getter({})["회원명"] == ""
+
+
+def test_code_search_projection_skips_display(fake_spreadsheet):
+    from routes.routes_member import search_by_code_logic
+
+    with Flask("projection_test").test_request_context():
+        g.query = {"query": "코드 A", "fields": "brief"}
+        res = search_by_code_logic()
+        assert res["results"] and all(set(r) == {"회원명", "회원번호", "휴대폰번호"} for r in res["results"])
+        assert "display" not in res
+
+        g.query = {"query": "코드 A", "fields": ["회원명", "display"]}
+        res = search_by_code_logic()
+        assert len(res["display"]) == len(res["results"])
+
+        g.query = {"query": "코드 A"}
+        res = search_by_code_logic()
+        assert "주소" in res["results"][0] and len(res["display"]) == len(res["results"])
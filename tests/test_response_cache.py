@@ -0,0 +1,106 @@
+import pytest
+from flask import Flask
+
+from utils import instrument
+from utils.response_cache import ResponseCache, bump_sheet, init_response_cache, make_key
+from utils.sheets import get_rows_from_sheet
+
+
+@pytest.fixture
+def app_and_calls(fake_spreadsheet):
+    app = Flask("response_cache_test")
+    instrument.init_instrumentation(app)
+    init_response_cache(app, cache=ResponseCache(ttl=60))
+    calls = {"count": 0}
+
+    @app.route("/search", methods=["POST"])
+    def search():
+        calls["count"] += 1
+        instrument.annotate(intent="search_member")
+        return {"count": len(get_rows_from_sheet("DB"))}
+
+    @app.route("/save", methods=["POST"])
+    def save():
+        instrument.annotate(intent="memo_add")
+        get_rows_from_sheet("상담일지")
+        return {"ok": True}
+
+    return app, calls
+
+
+def test_repeat_read_is_served_from_cache_with_etag(app_and_calls):
+    app, calls = app_and_calls
+    client = app.test_client()
+
+    first = client.post("/search", json={"query": "이태수"})
+    second = client.post("/search", json={"query": "  이태수 "})
+
+    assert first.headers["X-Response-Cache"] == "miss"
+    assert second.headers["X-Response-Cache"] == "hit"
+    assert second.json == first.json
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert calls["count"] == 1
+
+    not_modified = client.post("/search", json={"query": "이태수"},
+                               headers={"If-None-Match": first.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.data == b""
+
+
+def test_sheet_write_invalidates(app_and_calls, fake_spreadsheet):
+    app, calls = app_and_calls
+    client = app.test_client()
+
+    client.post("/search", json={"query": "이태수"})
+    fake_spreadsheet.worksheet("DB").insert_row(["신규회원"], index=2)
+    again = client.post("/search", json={"query": "이태수"})
+
+    assert again.headers["X-Response-Cache"] == "miss"
+    assert calls["count"] == 2
+
+
+def test_unrelated_sheet_bump_keeps_entry_and_writes_are_not_cached(app_and_calls):
+    app, calls = app_and_calls
+    client = app.test_client()
+
+    client.post("/search", json={"query": "이태수"})
+    bump_sheet("상담일지")
+    assert client.post("/search", json={"query": "이태수"}).headers["X-Response-Cache"] == "hit"
+
+    bump_sheet("DB")
+    assert client.post("/search", json={"query": "이태수"}).headers["X-Response-Cache"] == "miss"
+
+    assert "X-Response-Cache" not in client.post("/save", json={"x": 1}).headers
+
+
+def test_make_key_normalizes_whitespace_and_order():
+    assert make_key("/member", {"a": "홍 길동", "b": 1}) == make_key("/member", {"b": 1, "a": " 홍  길동"})
+    assert make_key("/member", {"a": 1}) != make_key("/memo", {"a": 1})
+
+
+def test_write_bumps_only_the_written_sheet(fake_spreadsheet):
+    from utils.response_cache import data_versions
+    from utils.row_ids import row_id_store
+
+    before = data_versions.snapshot()
+    fake_spreadsheet.worksheet("후원수당").append_row(["2024-01-01", "홍길동"])
+    row_id_store.insert_top(fake_spreadsheet.worksheet("상담일지"), ["홍길동", "메모"])
+    generation, versions = data_versions.snapshot()
+
+    assert generation == before[0]
+    assert data_versions.token(["DB"]) == data_versions.token(["DB"], before)
+    assert versions.get("후원수당", 0) > before[1].get("후원수당", 0)
+    assert versions.get("상담일지", 0) > before[1].get("상담일지", 0)
+
+    fake_spreadsheet.worksheet("DB").insert_row(["신규회원"], index=2)   # 시트를 모르는 쓰기
+    assert data_versions.snapshot()[0] > generation
+
+
+def test_sheet_of_request():
+    base = "https://sheets.googleapis.com/v4/spreadsheets/abc"
+    assert instrument.sheet_of_request(base + "/values/'%ED%9B%84%EC%9B%90%EC%88%98%EB%8B%B9'!A1:append") == "후원수당"
+    assert instrument.sheet_of_request(base + "/values:batchUpdate",
+                                       {"data": [{"range": "DB!A2"}, {"range": "'DB'!C3"}]}) == "DB"
+    assert instrument.sheet_of_request(base + "/values:batchUpdate",
+                                       {"data": [{"range": "DB!A2"}, {"range": "상담일지!A2"}]}) is None
+    assert instrument.sheet_of_request(base + ":batchUpdate", {"requests": []}) is None
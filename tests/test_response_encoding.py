@@ -0,0 +1,58 @@
+import gzip
+import json
+from collections import OrderedDict
+
+import pytest
+from flask import Flask, jsonify
+
+from utils import response_encoding
+from utils.response_encoding import FastJSONProvider, init_response_encoding
+
+
+@pytest.fixture
+def app():
+    app = Flask("response_encoding_test")
+    init_response_encoding(app, min_bytes=256)
+
+    @app.route("/member")
+    def member():
+        return jsonify(OrderedDict([("회원명", "이태수"), ("회원번호", "123"), ("계보도", "가나다")]))
+
+    @app.route("/big")
+    def big():
+        return {"rows": [{"회원명": f"회원{i}", "내용": "메모 " * 10} for i in range(50)]}
+
+    return app
+
+
+def test_field_order_and_korean_preserved(app):
+    response = app.test_client().get("/member")
+    text = response.get_data(as_text=True)
+
+    assert "이태수" in text
+    assert list(json.loads(text, object_pairs_hook=OrderedDict)) == ["회원명", "회원번호", "계보도"]
+
+
+def test_large_response_is_gzipped_when_accepted(app):
+    client = app.test_client()
+    plain = client.get("/big")
+    zipped = client.get("/big", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in plain.headers
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in zipped.headers["Vary"]
+    assert len(zipped.data) < len(plain.data)
+    assert gzip.decompress(zipped.data) == plain.data
+
+
+def test_small_response_is_not_compressed(app):
+    response = app.test_client().get("/member", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_stdlib_fallback_keeps_order(monkeypatch):
+    monkeypatch.setattr(response_encoding, "orjson", None)
+    provider = FastJSONProvider(Flask("fallback_test"))
+
+    text = provider.dumps(OrderedDict([("b", "나"), ("a", 1)]))
+    assert text == '{"b": "나", "a": 1}'
@@ -0,0 +1,48 @@
+from utils.result_cache import ResultCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_put_and_get():
+    cache = ResultCache()
+    handle = cache.put([{"회원명": "이태수"}])
+    assert isinstance(handle, str) and len(handle) >= 16
+    assert cache.get(handle) == [{"회원명": "이태수"}]
+    assert cache.get("unknown") is None
+    assert cache.get(None) is None
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = ResultCache(ttl=10, clock=clock)
+    handle = cache.put([1])
+    clock.now = 9.9
+    assert cache.get(handle) == [1]
+    clock.now = 10.0
+    assert cache.get(handle) is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction():
+    cache = ResultCache(maxsize=2)
+    h1 = cache.put([1])
+    h2 = cache.put([2])
+    cache.get(h1)          # h1 최근 사용 → h2 가 가장 오래됨
+    h3 = cache.put([3])
+    assert cache.get(h2) is None
+    assert cache.get(h1) == [1]
+    assert cache.get(h3) == [3]
+
+
+def test_drop():
+    cache = ResultCache()
+    handle = cache.put([1])
+    cache.drop(handle)
+    cache.drop("missing")
+    assert cache.get(handle) is None
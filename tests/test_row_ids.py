@@ -0,0 +1,109 @@
+from collections import Counter
+
+from flask import Flask, g
+
+from routes.routes_member import get_full_member_info, update_member_func
+from service import service
+from utils.order_index import order_store
+from utils.response_encoding import FastJSONProvider
+from utils.row_ids import ROW_ID_HEADER, RowIdStore, RowLocator, ensure_id_column, row_id_store
+from utils.sheet_refresh import sheet_snapshots
+from utils.sheets import get_rows_from_sheet
+
+
+def test_locator_adjusts_rows_arithmetically():
+    loc = RowLocator(["a", "", "b", "c"])
+    loc.insert_top("n")
+    loc.append("z")
+    assert [loc.row_of(i) for i in ("n", "a", "b", "c", "z")] == [2, 3, 5, 6, 7]
+
+    loc.remove_row(3)
+    assert loc.row_of("a") is None
+    assert [loc.row_of(i) for i in ("n", "b", "z")] == [2, 4, 6]
+    assert loc.id_at(3) is None and loc.id_at(4) == "b"
+
+
+def test_writes_target_rows_by_id(fake_spreadsheet):
+    ws = fake_spreadsheet.worksheet("DB")
+    calls = fake_spreadsheet.config.calls
+    result = ensure_id_column(ws)
+    assert result["added"] and result["filled"] == 50
+
+    store = RowIdStore()
+    col = result["column"]
+    target = ws.row_values(10)[col - 1]
+    reads = lambda: calls["col_values"]
+    before = reads()
+    assert store.row_of(ws, target) == 10 and reads() == before + 1
+
+    store.insert_top(ws, ["신규회원"])
+    store.delete_row(ws, 5)
+    assert store.row_of(ws, target) == 10 and reads() == before + 1   # 산술 보정, ID 열 다시 읽지 않음
+    assert ws.row_values(2)[col - 1]
+
+    ws.insert_row(["외부입력"], index=2)      # 저장소를 거치지 않은 삽입 → 확인 후 재구성
+    assert store.row_of(ws, target) == 11 and reads() == before + 2
+    assert store.delete(ws, target) and store.row_of(ws, target) is None
+
+
+def test_update_member_uses_cached_rows(fake_spreadsheet):
+    ws = fake_spreadsheet.worksheet("DB")
+    ensure_id_column(ws)
+    row_id_store.invalidate()
+    sheet_snapshots.clear()
+    counts = Counter(r["회원명"] for r in ws.get_all_records())
+    name = next(n for n, c in counts.items() if c == 1)
+    get_rows_from_sheet("DB")
+    scans = fake_spreadsheet.config.calls["get_all_records"]
+
+    app = Flask("row_ids_test")
+    with app.test_request_context():
+        g.query = {"raw_text": f"{name} 수정 주소 부산 해운대구"}
+        result = update_member_func()
+
+    assert result["status"] == "success"
+    assert fake_spreadsheet.config.calls["get_all_records"] == scans
+    row = next(r for r in ws.get_all_records() if r["회원명"] == name)
+    assert row["주소"] == "부산 해운대구" and row[ROW_ID_HEADER]
+
+
+def test_write_paths_record_ids(fake_spreadsheet):
+    for title in ("DB", "상담일지", "제품주문"):
+        ensure_id_column(fake_spreadsheet.worksheet(title))
+    row_id_store.invalidate()
+    order_store.invalidate()
+
+    service.register_member("아이디회원", "99999999", "010-9999-9999")
+    service.save_memo("상담일지", "아이디회원", "메모")
+    service.save_order_to_sheet({"회원명": "아이디회원", "제품명": "노니"})
+    service.register_order({"회원명": "아이디회원", "제품명": "홍삼"})
+
+    db = fake_spreadsheet.worksheet("DB").get_all_records()
+    memos = fake_spreadsheet.worksheet("상담일지").get_all_records()
+    orders = fake_spreadsheet.worksheet("제품주문").get_all_records()
+    assert db[-1]["회원명"] == "아이디회원" and db[-1][ROW_ID_HEADER]
+    assert memos[0]["회원명"] == "아이디회원" and memos[0][ROW_ID_HEADER]
+    assert [r["제품명"] for r in orders[-2:]] == ["노니", "홍삼"] and all(r[ROW_ID_HEADER] for r in orders[-2:])
+
+    # 색인에도 같은 ID → 다시 읽은 행과 일치 (재구축 없음)
+    oid, row = order_store.locate(fake_spreadsheet.worksheet("제품주문"), {"회원명": "아이디회원", "제품명": "홍삼"})
+    assert row == len(orders) + 1
+
+
+def test_ids_stay_out_of_responses(fake_spreadsheet):
+    for title in ("DB", "제품주문"):
+        ensure_id_column(fake_spreadsheet.worksheet(title))
+    row_id_store.invalidate()
+    order_store.invalidate()
+    sheet_snapshots.clear()
+
+    rows = get_rows_from_sheet("DB")
+    assert rows[0][ROW_ID_HEADER]                                  # 내부 위치용으로는 유지
+    assert ROW_ID_HEADER not in get_full_member_info(rows[:2])["results"][0]
+    assert ROW_ID_HEADER not in FastJSONProvider(Flask("row_ids_json")).dumps(rows[:2])
+
+    name = fake_spreadsheet.worksheet("제품주문").get_all_records()[0]["회원명"]
+    orders = service.find_order(member_name=name)
+    assert orders and all(ROW_ID_HEADER not in r for r in orders)
+    members = service.find_member(rows[0]["회원명"])
+    assert members and all(ROW_ID_HEADER not in r for r in members)
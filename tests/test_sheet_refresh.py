@@ -0,0 +1,148 @@
+import pytest
+from gspread.exceptions import APIError
+
+from utils.order_index import OrderStore
+from utils.response_cache import DataVersions
+from utils.sheet_refresh import RefreshScheduler, SheetPolicy, SheetSnapshots
+from utils.single_flight import SingleFlight
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Quota:
+    status_code = 429
+    text = "quota"
+
+    def json(self):
+        return {"error": {"code": 429, "message": self.text}}
+
+
+@pytest.fixture
+def env():
+    clock = Clock()
+    scheduler = RefreshScheduler(clock=clock)
+    snapshots = SheetSnapshots({"DB": SheetPolicy(30, 300)}, versions=DataVersions(), clock=clock,
+                               flight=SingleFlight(), scheduler=scheduler)
+    reads = []
+
+    def loader():
+        reads.append(clock.now)
+        if isinstance(loader.result, Exception):
+            raise loader.result
+        return loader.result
+
+    loader.result = "v1"
+    return clock, scheduler, snapshots, reads, loader
+
+
+def test_soft_expiry_serves_stale_and_refreshes_in_background(env):
+    clock, scheduler, snapshots, reads, loader = env
+    ss = object()
+    assert snapshots.get("DB", ss, loader) == "v1" and len(reads) == 1
+
+    clock.now += 31
+    loader.result = "v2"
+    assert snapshots.get("DB", ss, loader) == "v1"      # 요청 스레드는 기다리지 않음
+    assert snapshots.get("DB", ss, loader) == "v1" and len(reads) == 1
+    assert scheduler.run_pending() == 1
+    assert snapshots.get("DB", ss, loader) == "v2" and len(reads) == 2
+
+    clock.now += 301
+    loader.result = "v3"
+    assert snapshots.get("DB", ss, loader) == "v3"      # hard 만료 → 바로 다시 읽음
+
+    snapshots.versions.bump("DB")
+    loader.result = "v4"
+    assert snapshots.get("DB", ss, loader) == "v4"      # 쓰기 이후 → 이전 값 응답 안 함
+
+
+def test_quota_errors_keep_stale_copy(env):
+    clock, scheduler, snapshots, reads, loader = env
+    ss = object()
+    snapshots.get("DB", ss, loader)
+
+    loader.result = APIError(_Quota())
+    clock.now += 31
+    snapshots.get("DB", ss, loader)
+    scheduler.run_pending()
+    clock.now += 300
+    assert snapshots.get("DB", ss, loader) == "v1"
+    assert len(reads) == 3
+
+    loader.result = RuntimeError("boom")
+    with pytest.raises(RuntimeError):
+        snapshots.get("DB", ss, loader)
+
+
+def test_hot_sheets_are_refreshed_before_expiry(env):
+    clock, scheduler, snapshots, reads, loader = env
+    ss = object()
+    snapshots.get("DB", ss, loader)
+
+    clock.now += 20
+    assert scheduler.hot_sheets() == ("DB",) and scheduler.tick() == 0
+    clock.now += 5
+    assert scheduler.tick() == 1 and scheduler.run_pending() == 1
+    assert len(reads) == 2 and snapshots.age("DB") == 0
+
+    clock.now += 400   # 조회가 끊긴 시트는 미리 갱신하지 않음
+    assert scheduler.hot_sheets() == () and scheduler.tick() == 0
+
+
+def test_order_index_rebuilds_in_background(fake_spreadsheet):
+    clock = Clock()
+    scheduler = RefreshScheduler(clock=clock)
+    store = OrderStore(ttl=60, hard_ttl=600, clock=clock, scheduler=scheduler)
+    ws = fake_spreadsheet.worksheet("제품주문")
+    reads = lambda: fake_spreadsheet.config.calls["get_all_values"]
+
+    store.index(ws)
+    before = reads()
+    clock.now += 61
+    ws.insert_row(["2030-01-01", "외부입력", "9"], index=2)
+    assert store.find(ws, {"회원명": "외부입력"}) == [] and reads() == before
+
+    scheduler.run_pending()
+    assert reads() == before + 1
+    assert store.find(ws, {"회원명": "외부입력"})[0]["회원번호"] == "9"
+
+    # 재구축 중 색인 쓰기가 있으면 재구축 결과는 버림
+    clock.now += 61
+    store.index(ws)
+    store.notify_insert_top(ws, ["2030-01-02", "색인쓰기", "10"])
+    scheduler.run_pending()
+    assert store.find(ws, {"회원명": "색인쓰기"})
+
+
+def test_unchanged_spreadsheet_skips_full_download(fake_spreadsheet):
+    clock = Clock()
+    scheduler = RefreshScheduler(clock=clock)
+    snapshots = SheetSnapshots({"DB": SheetPolicy(30, 300)}, versions=DataVersions(), clock=clock,
+                               flight=SingleFlight(), scheduler=scheduler)
+    calls = fake_spreadsheet.config.calls
+    ws = fake_spreadsheet.worksheet("DB")
+    snapshots.get("DB", fake_spreadsheet, ws.get_all_records)
+    assert (calls["get_all_records"], calls["get_lastUpdateTime"]) == (1, 0)   # 첫 읽기는 확인 생략
+
+    def refresh():
+        clock.now += 31
+        snapshots.get("DB", fake_spreadsheet, ws.get_all_records)
+        scheduler.run_pending()
+        return calls["get_all_records"], calls["get_lastUpdateTime"]
+
+    assert refresh() == (2, 1)    # 수정 표시가 없던 스냅샷 → 전체 읽기 + 표시 기록
+    assert refresh() == (2, 2)    # 변경 없음 → 확인 요청 1건만
+    assert snapshots.age("DB") == 0
+
+    fake_spreadsheet.config.revision += 1   # 다른 워커 / 직접 편집
+    assert refresh() == (3, 3)
+
+    clock.now += 301                        # hard 만료 → 변경 여부와 관계없이 전체 다시 읽기
+    snapshots.get("DB", fake_spreadsheet, ws.get_all_records)
+    assert calls["get_all_records"] == 4
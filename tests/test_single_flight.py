@@ -0,0 +1,128 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.member_rows import member_row_cache
+from utils.single_flight import SingleFlight, SingleFlightTimeout
+from utils.sheets import get_rows_from_sheet
+
+
+def _burst(n, fn):
+    with ThreadPoolExecutor(n) as pool:
+        return [f.result() for f in [pool.submit(fn) for _ in range(n)]]
+
+
+def test_concurrent_calls_share_one_fetch():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(2)
+        return ["row"]
+
+    with ThreadPoolExecutor(8) as pool:
+        futures = [pool.submit(flight.do, "DB", fetch, share=list) for _ in range(8)]
+        while flight._calls["DB"].followers < 7:
+            time.sleep(0.001)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert calls == [1] and results == [["row"]] * 8
+    assert flight.in_flight() == 0
+    assert flight.do("DB", lambda: "fresh") == "fresh"
+
+
+def test_leader_changes_do_not_reach_followers():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait(2)
+        return ["원본"]
+
+    def slow_copy(rows):
+        time.sleep(0.05)   # 복사 도중 leader 가 결과를 수정할 시간
+        return list(rows)
+
+    def leader():
+        rows = flight.do("k", fetch, share=slow_copy)
+        rows.append("leader 수정")
+        return rows
+
+    with ThreadPoolExecutor(4) as pool:
+        first = pool.submit(leader)
+        while "k" not in flight._calls:
+            time.sleep(0.001)
+        followers = [pool.submit(flight.do, "k", fetch, share=slow_copy) for _ in range(3)]
+        while flight._calls["k"].followers < 3:
+            time.sleep(0.001)
+        release.set()
+        assert first.result() == ["원본", "leader 수정"]
+        assert [f.result() for f in followers] == [["원본"]] * 3
+
+
+def test_errors_and_timeouts_reach_followers():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(2)
+        raise RuntimeError("quota")
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(flight.do, "k", failing)
+        started.wait(2)
+        with pytest.raises(SingleFlightTimeout):
+            flight.do("k", lambda: None, timeout=0.01)
+        follower = pool.submit(flight.do, "k", lambda: None)
+        while flight._calls["k"].followers < 2:
+            time.sleep(0.001)
+        release.set()
+        for f in (leader, follower):
+            with pytest.raises(RuntimeError, match="quota"):
+                f.result()
+
+
+def test_share_error_reaches_followers_without_hanging():
+    flight = SingleFlight(timeout=2)
+    release = threading.Event()
+
+    def fetch():
+        release.wait(2)
+        return ["row"]
+
+    def broken_copy(rows):
+        raise ValueError("copy failed")
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(flight.do, "k", fetch, share=broken_copy)
+        while "k" not in flight._calls:
+            time.sleep(0.001)
+        follower = pool.submit(flight.do, "k", fetch, share=broken_copy)
+        while flight._calls["k"].followers < 1:
+            time.sleep(0.001)
+        release.set()
+        for f in (leader, follower):
+            with pytest.raises(ValueError, match="copy failed"):
+                f.result()
+    assert flight.in_flight() == 0
+
+
+def test_cold_db_burst_reads_sheet_once(fake_spreadsheet):
+    member_row_cache.clear()
+    fake_spreadsheet.config.read_latency = 0.05
+    before = fake_spreadsheet.config.calls["get_all_records"]
+
+    rows = _burst(8, lambda: get_rows_from_sheet("DB"))
+    assert fake_spreadsheet.config.calls["get_all_records"] == before + 1
+    assert all(r == rows[0] for r in rows)
+
+    orders = _burst(8, lambda: get_rows_from_sheet("제품주문"))
+    assert fake_spreadsheet.config.calls["get_all_records"] == before + 2
+    orders[0][0]["회원명"] = "변경"
+    assert orders[1][0]["회원명"] != "변경"
@@ -0,0 +1,72 @@
+import pytest
+
+from routes.routes_memo import search_memo_core
+from utils.fake_gspread import build_synthetic_spreadsheet
+from utils.sheets import TopDownRows, use_spreadsheet
+
+
+@pytest.fixture
+def big_spreadsheet():
+    ss = build_synthetic_spreadsheet(100, memos=1000, orders=10)
+    use_spreadsheet(ss)
+    yield ss
+    use_spreadsheet(None)
+
+
+def test_windows_grow_and_cover_the_sheet(big_spreadsheet):
+    ws = big_spreadsheet.worksheet("개인일지")
+    values = ws.get_all_values()[1:]
+    rows = TopDownRows("개인일지", ("내용", "날짜"), first=10)
+
+    assert list(rows) == [(r[2], r[0]) for r in values]
+    assert ws.row_count > len(values) + 1                   # 데이터 아래 빈 격자 행
+    assert rows.total == ws.row_count - 1 and rows.windows == 8   # 10 + ... + 640 행 뒤 빈 구간 1회에서 끝
+
+
+def test_empty_window_ends_and_blank_rows_are_skipped(big_spreadsheet):
+    ws = big_spreadsheet.worksheet("개인일지")
+    ws.update_cell(4, 1, "")
+    ws.update_cell(4, 2, "")
+    ws.update_cell(4, 3, "")        # 중간의 빈 행
+    values = ws.get_all_values()[1:]
+
+    rows = TopDownRows("개인일지", ("날짜", "내용"))
+    seen = [(rows.total - rows.index + 1, row) for row in rows]
+
+    assert rows.windows == 4                                # 200 + 400 + 800 행 뒤 빈 구간에서 끝, 나머지 빈 격자 행은 요청 안 함
+    assert len(seen) == len(values) - 1 and ("", "") not in [r for _, r in seen]
+    assert [pos for pos, _ in seen[:3]] == [rows.total, rows.total - 1, rows.total - 3]
+
+
+def test_blank_row_at_window_boundary_does_not_end_reading(big_spreadsheet):
+    ws = big_spreadsheet.worksheet("개인일지")
+    for row in (6, 16):             # first=5 → 구간 2~6, 7~16, 17~36 ... 의 끝 행
+        for col in (1, 2, 3):
+            ws.update_cell(row, col, "")
+    values = [v for v in ws.get_all_values()[1:] if any(v[:3])]
+
+    rows = TopDownRows("개인일지", ("날짜", "내용"), first=5)
+    seen = [(rows.total - rows.index + 1, row) for row in rows]
+
+    assert [r for _, r in seen] == [(v[0], v[2]) for v in values]
+    assert [pos for pos, _ in seen[4:6]] == [rows.total - 5, rows.total - 6]   # 6행 건너뛰어도 위치 유지
+
+
+def test_limit_search_reads_only_the_first_window(big_spreadsheet):
+    calls = big_spreadsheet.config.calls
+    values = big_spreadsheet.worksheet("개인일지").get_all_values()[1:]
+    before = calls["get_all_values"]
+
+    results = search_memo_core("개인일지", [], limit=20)
+    assert [(r["날짜"], r["내용"]) for r in results] == [(r[0], r[2]) for r in values[:20]]
+    assert calls["values_batch_get"] == 1 and calls["get_all_values"] == before
+
+
+def test_date_lower_bound_stops_reading(big_spreadsheet):
+    calls = big_spreadsheet.config.calls
+    values = big_spreadsheet.worksheet("개인일지").get_all_values()[1:]
+    start = values[300][0].split()[0]
+
+    results = search_memo_core("개인일지", [], start_date=start, limit=1000)
+    assert len(results) == sum(r[0].split()[0] >= start for r in values)
+    assert calls["values_batch_get"] == 2                  # 200 + 400 행에서 중단
@@ -0,0 +1,103 @@
+import pytest
+
+from parser.parse import delete_commission
+from routes.routes_order import handle_order_save
+from utils.order_index import order_store
+from utils.row_ids import ensure_id_column, row_id_store
+from utils.unit_of_work import UnitOfWork, unit_of_work
+
+
+def test_commit_uses_minimal_calls(fake_spreadsheet):
+    ws = fake_spreadsheet.worksheet("DB")
+    calls = fake_spreadsheet.config.calls
+    before = ws.get_all_values()
+
+    uow = UnitOfWork()
+    uow.update_cell(ws, 3, 2, "A")
+    uow.update_cell(ws, 3, 3, "B")
+    uow.update_cell(ws, 3, 2, "A2")   # 같은 셀 → 마지막 값
+    uow.clear(ws, 4, 13)
+    uow.update_cell(ws, 6, 1, "삭제될 행")
+    for row in (5, 6, 7, 10):
+        uow.delete_row(ws, row)
+    uow.insert_top(ws, ["첫째"])
+    uow.insert_top(ws, ["둘째"])
+    assert calls["batch_update"] == 0 and len(uow) == 10
+
+    assert uow.commit()["DB"] == {"cells": 3, "deleted": 4, "inserted": 2}
+    assert (calls["batch_update"], calls["delete_rows"], calls["insert_rows"], calls["update_cell"]) == (1, 2, 1, 0)
+    assert uow.calls == 4
+
+    expected = [list(r) for r in before]
+    expected[2][1:3] = ["A2", "B"]
+    expected[3][12] = ""
+    expected = [r for i, r in enumerate(expected, start=1) if i not in (5, 6, 7, 10)]
+    pad = [""] * (len(before[0]) - 1)
+    expected[1:1] = [["첫째"] + pad, ["둘째"] + pad]
+    assert ws.get_all_values() == expected
+
+
+def test_nested_blocks_commit_once_and_errors_discard(fake_spreadsheet):
+    ws = fake_spreadsheet.worksheet("상담일지")
+    config = fake_spreadsheet.config
+    revision = config.revision
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work() as uow:
+            uow.insert_top(ws, ["2030-01-01", "홍길동", "메모"])
+            raise RuntimeError("중단")
+    assert config.revision == revision
+
+    with unit_of_work() as outer:
+        with unit_of_work() as inner:
+            assert inner is outer
+            inner.insert_top(ws, ["2030-01-01", "홍길동", "첫째"])
+        assert config.revision == revision   # 안쪽 블록 종료 때는 반영하지 않음
+        outer.insert_top(ws, ["2030-01-01", "홍길동", "둘째"])
+    assert config.calls["insert_rows"] == 1
+    assert [ws.row_values(r)[2] for r in (2, 3)] == ["첫째", "둘째"]
+
+
+def test_orders_saved_in_one_insert_keep_index(fake_spreadsheet):
+    ws = fake_spreadsheet.worksheet("제품주문")
+    ensure_id_column(ws)
+    row_id_store.invalidate()
+    order_store.invalidate()
+    order_store.find(ws, {"회원명": "없는회원"})   # 색인 구축
+    calls = fake_spreadsheet.config.calls
+    scans, headers = calls["get_all_values"], calls["row_values"]
+
+    with unit_of_work():
+        for product in ("노니", "홍삼", "유산균"):
+            result = handle_order_save({"회원명": "주문묶음", "제품명": product, "제품가격": 1000.0})
+            assert result["latest_order"]["제품가격"] == "1000"
+
+    assert calls["insert_rows"] == 1 and calls["insert_row"] == 0
+    assert calls["row_values"] - headers == 1
+    assert [ws.row_values(r)[4] for r in (2, 3, 4)] == ["노니", "홍삼", "유산균"]
+
+    oid, row = order_store.locate(ws, {"회원명": "주문묶음", "제품명": "홍삼"})
+    assert row == 3 and calls["get_all_values"] == scans
+    assert row_id_store.row_of(ws, ws.row_values(4)[-1]) == 4
+
+
+def test_delete_commission_deletes_runs(fake_spreadsheet):
+    ws = fake_spreadsheet.worksheet("후원수당")
+    for i, name in enumerate(["홍길동", "홍길동", "이태수", "홍길동"]):
+        ws.append_row([f"2025-08-0{i + 1}", name, "1000", ""])
+    before = fake_spreadsheet.config.calls["delete_rows"]
+
+    assert delete_commission("홍길동")["message"] == "3건 삭제 완료"
+    assert fake_spreadsheet.config.calls["delete_rows"] - before == 2
+    assert [r[1] for r in ws.get_all_values()[1:]] == ["이태수"]
+
+
+def test_cells_are_written_as_user_entered(fake_spreadsheet, monkeypatch):
+    ws = fake_spreadsheet.worksheet("DB")
+    sent = []
+    real = ws.batch_update
+    monkeypatch.setattr(ws, "batch_update", lambda data, **kw: sent.append(kw) or real(data, **kw))
+
+    with unit_of_work() as uow:
+        uow.update_cell(ws, 2, 6, "2025-08-01")   # 날짜/숫자는 시트가 해석 (update_cell 과 같은 규칙)
+    assert sent == [{"value_input_option": "USER_ENTERED"}]
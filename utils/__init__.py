@@ -3,6 +3,14 @@ utils 패키지 초기화 파일
 공식적으로 공개되는 유틸 함수만 __all__에 정의
 """
 
+# =====================================================
+# providers (외부 연결 지연 생성)
+# =====================================================
+from .providers import (
+    provider, reset_providers,
+    get_openai_client, get_http_session, get_drive_service,
+)
+
 # =====================================================
 # http (외부 API 연동)
 # =====================================================
@@ -18,8 +26,11 @@ from .sheets import (
     get_sheet,
     get_gspread_client, 
     get_spreadsheet, 
+    use_spreadsheet,
     get_worksheet,
     get_rows_from_sheet, 
+    read_columns,
+    TopDownRows,
     append_row, 
     update_cell, 
     delete_row,
@@ -40,6 +51,64 @@ from .sheets import (
     
 )
 
+# =====================================================
+# member_table (DB 시트 컬럼형 검색 엔진)
+# =====================================================
+from .member_table import DateIndex, MemberTable, QueryPlan, ValueIndex, get_member_table
+
+# =====================================================
+# name_index (회원명 초성/오타 허용 검색)
+# =====================================================
+from .name_index import NameIndex, get_name_index, search_member_names
+
+# =====================================================
+# result_cache (검색 결과 handle 보관소)
+# =====================================================
+from .result_cache import ResultCache, result_cache, store_results, load_results
+
+# =====================================================
+# journal (일지 저장 write-behind)
+# =====================================================
+from .journal import JournalWriter, get_journal, init_journal, read_with_pending, write_behind_enabled
+
+# =====================================================
+# pagination (검색 결과 커서 페이지)
+# =====================================================
+from .pagination import InvalidCursor, encode_cursor, decode_cursor, paginate, page_params
+
+# =====================================================
+# projection (회원 응답 필드 선택)
+# =====================================================
+from .projection import Projection, parse_fields, fields_param, compile_projection
+
+# =====================================================
+# order_index (제품주문 색인)
+# =====================================================
+from .order_index import OrderIndex, OrderStore, order_store
+
+# =====================================================
+# row_ids (행 ID 열 → 현재 행 번호)
+# =====================================================
+from .row_ids import ROW_ID_HEADER, RowPositions, RowIdStore, ensure_id_column, row_id_store, with_row_id, without_row_id
+
+# =====================================================
+# unit_of_work (요청 단위 시트 쓰기 묶음)
+# =====================================================
+from .unit_of_work import UnitOfWork, unit_of_work, current_unit_of_work
+
+# =====================================================
+# single_flight (동시 시트 읽기 합치기)
+# =====================================================
+from .single_flight import SingleFlight, SingleFlightTimeout, sheet_flight
+
+# =====================================================
+# sheet_refresh (hot 시트 스냅샷 stale-while-revalidate)
+# =====================================================
+from .sheet_refresh import (
+    SheetPolicy, SheetSnapshots, RefreshScheduler, sheet_snapshots, get_refresh_scheduler,
+    drive_modified_time,
+)
+
 # =====================================================
 # utils (날짜/문자열/검색/메모/GPT/실행)
 # =====================================================
@@ -81,13 +150,17 @@ from .utils import (
 # 공식 공개 API (__all__)
 # --------------------------------------------------
 __all__ = [
+    # providers
+    "provider", "reset_providers",
+    "get_openai_client", "get_http_session", "get_drive_service",
+
     # http
     "MemberslistError", "ImpactError",
     "call_memberslist_add_orders", "call_impact_sync",
 
     # sheets
-    "get_sheet","get_gspread_client", "get_spreadsheet", "get_worksheet",
-    "get_rows_from_sheet", "append_row", "update_cell", "delete_row",
+    "get_sheet","get_gspread_client", "get_spreadsheet", "use_spreadsheet", "get_worksheet",
+    "get_rows_from_sheet", "read_columns", "TopDownRows", "append_row", "update_cell", "delete_row",
     "safe_update_cell", "header_maps",
     "get_db_sheet", "get_member_sheet", "get_product_order_sheet",
     "get_counseling_sheet", "get_personal_memo_sheet",
@@ -96,6 +169,40 @@ __all__ = [
     "get_member_info", "get_gsheet_data",
     "openai_vision_extract_orders",
 
+    # member_table
+    "MemberTable", "DateIndex", "ValueIndex", "QueryPlan", "get_member_table",
+
+    # name_index
+    "NameIndex", "get_name_index", "search_member_names",
+
+    # result_cache
+    "ResultCache", "result_cache", "store_results", "load_results",
+
+    # journal
+    "JournalWriter", "get_journal", "init_journal", "read_with_pending", "write_behind_enabled",
+
+    # pagination
+    "InvalidCursor", "encode_cursor", "decode_cursor", "paginate", "page_params",
+
+    # projection
+    "Projection", "parse_fields", "fields_param", "compile_projection",
+
+    # order_index
+    "OrderIndex", "OrderStore", "order_store",
+
+    # row_ids
+    "ROW_ID_HEADER", "RowPositions", "RowIdStore", "ensure_id_column", "row_id_store", "with_row_id", "without_row_id",
+
+    # unit_of_work
+    "UnitOfWork", "unit_of_work", "current_unit_of_work",
+
+    # single_flight
+    "SingleFlight", "SingleFlightTimeout", "sheet_flight",
+
+    # sheet_refresh
+    "SheetPolicy", "SheetSnapshots", "RefreshScheduler", "sheet_snapshots", "get_refresh_scheduler",
+    "drive_modified_time",
+
     # utils
     "now_kst", "process_order_date", "parse_dt",
     "remove_josa", "remove_spaces", "split_to_parts",
@@ -0,0 +1,426 @@
+"""
+utils/fake_gspread.py
+오프라인 gspread 대체 백엔드 (메모리 내 Spreadsheet / Worksheet)
+- 이 프로젝트가 사용하는 Worksheet 메서드만 구현
+  get_all_records / get_all_values / row_values / col_values
+  insert_row(s) / append_row(s) / update_cell / update / batch_update / delete_rows / clear
+- 지연시간(latency) / 429 쿼터 오류 주입 가능 → 재시도·성능 측정용
+- 계측 기록: 실제 API 처럼 A1 범위로 쓰는 호출(append/update/batch_update/clear)만 시트 이름 포함
+  (행 삽입/삭제는 sheetId 기준 → 시트 이름 없음, 호출자의 instrument.writing() 블록으로 구분)
+- Spreadsheet.get_lastUpdateTime(): 쓰기마다 바뀌는 수정 표시 (Drive modifiedTime 대체)
+- Spreadsheet.values_batch_get(): 열 범위('시트'!A1:A) 묶음 읽기 (majorDimension=COLUMNS 지원)
+- row_count 는 실제 시트처럼 데이터 아래 빈 격자 행까지 포함 (읽기 결과에는 빈 행 없음)
+- utils.sheets.use_spreadsheet() 또는 환경변수 SHEETS_BACKEND=fake 로 선택
+"""
+
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from gspread.exceptions import APIError, WorksheetNotFound
+
+from utils.instrument import record
+
+
+# =====================================================
+# 헤더 (실제 시트 구조와 동일)
+# =====================================================
+DB_HEADERS = [
+    "회원명", "회원번호", "휴대폰번호", "특수번호", "코드", "가입일자", "생년월일",
+    "통신사", "친밀도", "근무처", "계보도", "소개한분", "주소", "메모",
+    "카드사", "카드주인", "카드번호", "유효기간", "카드생년월일",
+    "분류", "회원단계", "연령/성별", "직업", "가족관계", "니즈", "애용제품",
+    "콘텐츠", "습관챌린지", "비즈니스시스템", "GLC프로젝트", "리더님",
+]
+MEMO_HEADERS = ["날짜", "회원명", "내용"]
+ORDER_HEADERS = [
+    "주문일자", "회원명", "회원번호", "휴대폰번호",
+    "제품명", "제품가격", "PV", "결재방법",
+    "소비자_고객명", "소비자_휴대폰번호", "배송처", "수령확인",
+]
+COMMISSION_HEADERS = ["지급일자", "회원명", "후원수당", "비고"]
+IMAGE_HEADERS = ["날짜", "회원명", "링크", "내용"]
+
+READ_METHODS = {
+    "get_all_records", "get_all_values", "row_values", "col_values", "get_lastUpdateTime", "values_batch_get",
+}
+
+
+# ======================================================================================
+# ✅ 지연/오류 주입 설정
+# ======================================================================================
+@dataclass
+class FakeBackendConfig:
+    """
+    - read_latency / write_latency: 호출당 지연(초)
+    - quota_error_every: N번째 호출마다 429 발생 (0 → 사용 안 함)
+    - quota_error_rate: 호출마다 429 발생 확률 (seed 고정)
+    - revision: 성공한 쓰기 호출 수 (get_lastUpdateTime 값)
+    """
+    read_latency: float = 0.0
+    write_latency: float = 0.0
+    quota_error_every: int = 0
+    quota_error_rate: float = 0.0
+    seed: int = 0
+    calls: Counter = field(default_factory=Counter)
+    revision: int = 0
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def before_call(self, method: str, sheet: Optional[str] = None) -> None:
+        with self._lock:
+            self.calls[method] += 1
+            self._count += 1
+            count = self._count
+            fail = bool(self.quota_error_every and count % self.quota_error_every == 0)
+            fail = fail or (self.quota_error_rate > 0 and self._random.random() < self.quota_error_rate)
+            if not fail and method not in READ_METHODS:
+                self.revision += 1
+
+        delay = self.read_latency if method in READ_METHODS else self.write_latency
+        if delay:
+            time.sleep(delay)
+        record("sheets", method, delay, error="429" if fail else None, sheet=sheet)
+        if fail:
+            raise APIError(_QuotaResponse())
+
+
+class _QuotaResponse:
+    """gspread APIError 생성용 429 응답"""
+    status_code = 429
+    text = "Quota exceeded for quota metric 'Read requests'"
+
+    def json(self):
+        return {"error": {"code": 429, "message": self.text, "status": "RESOURCE_EXHAUSTED"}}
+
+
+# =====================================================
+# 값 변환
+# =====================================================
+def _to_cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _numericise(value: str) -> Any:
+    """gspread get_all_records 와 같은 숫자 변환 (int → float → 원문)"""
+    if value == "":
+        return ""
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _a1_to_rowcol(label: str):
+    m = re.fullmatch(r"([A-Za-z]+)(\d+)", label.strip())
+    if not m:
+        raise ValueError(f"지원하지 않는 A1 표기: {label}")
+    col = 0
+    for ch in m.group(1).upper():
+        col = col * 26 + (ord(ch) - 64)
+    return int(m.group(2)), col
+
+
+# ======================================================================================
+# ✅ Worksheet
+# ======================================================================================
+class FakeWorksheet:
+    def __init__(self, title: str, rows: Optional[List[List[Any]]] = None,
+                 config: Optional[FakeBackendConfig] = None, sheet_id: int = 0,
+                 grid_rows: int = 0):
+        self.title = title
+        self.id = sheet_id
+        self.config = config or FakeBackendConfig()
+        self._rows: List[List[str]] = [[_to_cell(v) for v in r] for r in (rows or [])]
+        self._grid_rows = max(grid_rows, len(self._rows))   # 빈 행 포함 격자 행 수
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return f"<FakeWorksheet {self.title!r} rows={len(self._rows)}>"
+
+    @property
+    def row_count(self) -> int:
+        return max(self._grid_rows, len(self._rows))
+
+    @property
+    def col_count(self) -> int:
+        return max((len(r) for r in self._rows), default=0)
+
+    # --------------------------------------------------
+    # 읽기
+    # --------------------------------------------------
+    def get_all_values(self, *args, **kwargs) -> List[List[str]]:
+        self.config.before_call("get_all_values")
+        with self._lock:
+            width = self.col_count
+            return [r + [""] * (width - len(r)) for r in self._rows]
+
+    def get_all_records(self, head: int = 1, default_blank: Any = "", **kwargs) -> List[Dict[str, Any]]:
+        self.config.before_call("get_all_records")
+        with self._lock:
+            if len(self._rows) < head:
+                return []
+            headers = self._rows[head - 1]
+            width = len(headers)
+            records = []
+            for r in self._rows[head:]:
+                values = (r + [""] * (width - len(r)))[:width]
+                records.append({
+                    h: (_numericise(v) if v != "" else default_blank)
+                    for h, v in zip(headers, values)
+                })
+            return records
+
+    def row_values(self, row: int, **kwargs) -> List[str]:
+        self.config.before_call("row_values")
+        with self._lock:
+            if row < 1 or row > len(self._rows):
+                return []
+            values = list(self._rows[row - 1])
+        while values and values[-1] == "":
+            values.pop()
+        return values
+
+    def col_values(self, col: int, **kwargs) -> List[str]:
+        self.config.before_call("col_values")
+        with self._lock:
+            values = [r[col - 1] if col - 1 < len(r) else "" for r in self._rows]
+        while values and values[-1] == "":
+            values.pop()
+        return values
+
+    # --------------------------------------------------
+    # 쓰기
+    # --------------------------------------------------
+    def insert_row(self, values: List[Any], index: int = 1, **kwargs) -> None:
+        self.config.before_call("insert_row")
+        with self._lock:
+            self._rows.insert(index - 1, [_to_cell(v) for v in values])
+            self._grid_rows += 1
+
+    def insert_rows(self, values: List[List[Any]], row: int = 1, **kwargs) -> None:
+        self.config.before_call("insert_rows")
+        with self._lock:
+            self._rows[row - 1:row - 1] = [[_to_cell(v) for v in r] for r in values]
+            self._grid_rows += len(values)
+
+    def append_row(self, values: List[Any], **kwargs) -> None:
+        self.config.before_call("append_row", self.title)
+        with self._lock:
+            self._rows.append([_to_cell(v) for v in values])
+
+    def append_rows(self, values: List[List[Any]], **kwargs) -> None:
+        self.config.before_call("append_rows", self.title)
+        with self._lock:
+            self._rows.extend([_to_cell(v) for v in r] for r in values)
+
+    def _set(self, row: int, col: int, value: Any) -> None:
+        while len(self._rows) < row:
+            self._rows.append([])
+        cells = self._rows[row - 1]
+        if len(cells) < col:
+            cells.extend([""] * (col - len(cells)))
+        cells[col - 1] = _to_cell(value)
+
+    def _write_range(self, range_name: str, values: List[List[Any]]) -> None:
+        start = range_name.split("!")[-1].split(":")[0]
+        row, col = _a1_to_rowcol(start)
+        for i, r in enumerate(values):
+            for j, v in enumerate(r):
+                self._set(row + i, col + j, v)
+
+    def update_cell(self, row: int, col: int, value: Any) -> None:
+        self.config.before_call("update_cell", self.title)
+        with self._lock:
+            self._set(row, col, value)
+
+    def update(self, range_name: Any, values: Any = None, **kwargs) -> None:
+        """update("A2:C2", [[...]]) / update([[...]]) (A1 기준)"""
+        self.config.before_call("update", self.title)
+        if values is None:
+            range_name, values = "A1", range_name
+        with self._lock:
+            self._write_range(range_name, values)
+
+    def batch_update(self, data: List[Dict[str, Any]], **kwargs) -> None:
+        self.config.before_call("batch_update", self.title)
+        with self._lock:
+            for item in data:
+                self._write_range(item["range"], item["values"])
+
+    def delete_rows(self, start_index: int, end_index: Optional[int] = None) -> None:
+        self.config.before_call("delete_rows")
+        end_index = end_index or start_index
+        with self._lock:
+            del self._rows[start_index - 1:end_index]
+            self._grid_rows -= end_index - start_index + 1
+
+    def delete_row(self, index: int) -> None:
+        self.delete_rows(index)
+
+    def clear(self) -> None:
+        self.config.before_call("clear", self.title)
+        with self._lock:
+            self._rows = []
+
+
+# ======================================================================================
+# ✅ Spreadsheet
+# ======================================================================================
+class FakeSpreadsheet:
+    def __init__(self, title: str = "fake", config: Optional[FakeBackendConfig] = None):
+        self.title = title
+        self.id = "fake-spreadsheet"
+        self.config = config or FakeBackendConfig()
+        self._worksheets: Dict[str, FakeWorksheet] = {}
+
+    def worksheets(self) -> List[FakeWorksheet]:
+        return list(self._worksheets.values())
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        try:
+            return self._worksheets[title]
+        except KeyError:
+            raise WorksheetNotFound(title)
+
+    def add_worksheet(self, title: str, rows: Any = None, cols: Any = None,
+                      values: Optional[List[List[Any]]] = None) -> FakeWorksheet:
+        ws = FakeWorksheet(title, values, config=self.config, sheet_id=len(self._worksheets),
+                           grid_rows=int(rows or 0))
+        ws.spreadsheet = self
+        self._worksheets[title] = ws
+        return ws
+
+    def del_worksheet(self, worksheet: FakeWorksheet) -> None:
+        self._worksheets.pop(worksheet.title, None)
+
+    def values_batch_get(self, ranges: List[str], params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        열 범위 묶음 읽기 ("'DB'!A1:A", "DB!C2:C201" 형식만 지원)
+        - 실제 API 처럼 각 범위 끝의 빈 셀은 잘라내고, 값이 없으면 values 키 없음
+        """
+        self.config.before_call("values_batch_get")
+        columns = (params or {}).get("majorDimension") == "COLUMNS"
+        value_ranges = []
+        for label in ranges:
+            m = re.fullmatch(r"'?(.+?)'?!([A-Za-z]+)(\d+):([A-Za-z]+)(\d*)", label.strip())
+            if not m or m.group(2).upper() != m.group(4).upper():
+                raise ValueError(f"지원하지 않는 범위: {label}")
+            ws = self.worksheet(m.group(1).replace("''", "'"))
+            start, col = _a1_to_rowcol(m.group(2) + m.group(3))
+            end = int(m.group(5)) if m.group(5) else None
+            with ws._lock:
+                values = [r[col - 1] if col - 1 < len(r) else "" for r in ws._rows[start - 1:end]]
+            while values and values[-1] == "":
+                values.pop()
+            entry = {"range": label, "majorDimension": "COLUMNS" if columns else "ROWS"}
+            if values:
+                entry["values"] = [values] if columns else [[v] for v in values]
+            value_ranges.append(entry)
+        return {"spreadsheetId": self.id, "valueRanges": value_ranges}
+
+    def get_lastUpdateTime(self) -> str:
+        """Drive modifiedTime 대체 (쓰기가 있을 때만 바뀜)"""
+        self.config.before_call("get_lastUpdateTime")
+        return f"revision-{self.config.revision}"
+
+
+# ======================================================================================
+# ✅ 합성 데이터
+# ======================================================================================
+_SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+_GIVEN = "민서지현수영태호준우성진하은경희철소판상"
+_PRODUCTS = ["노니", "홍삼", "비타민", "애터미칫솔", "오메가3", "유산균"]
+
+
+def _name(rng: random.Random) -> str:
+    return rng.choice(_SURNAMES) + rng.choice(_GIVEN) + rng.choice(_GIVEN)
+
+
+def _date(rng: random.Random, start_year: int, end_year: int) -> str:
+    return f"{rng.randint(start_year, end_year)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+
+def make_member_rows(n: int, seed: int = 0) -> List[List[Any]]:
+    rng = random.Random(seed)
+    rows = [list(DB_HEADERS)]
+    for i in range(n):
+        row = dict.fromkeys(DB_HEADERS, "")
+        row.update({
+            "회원명": _name(rng),
+            "회원번호": str(10000000 + i),
+            "휴대폰번호": f"010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+            "코드": rng.choice("ABCD"),
+            "가입일자": _date(rng, 2015, 2025),
+            "생년월일": _date(rng, 1950, 2000),
+            "근무처": rng.choice(["", "대구", "서울", "부산"]),
+            "계보도": _name(rng),
+            "주소": rng.choice(["대구 북구", "서울 강남구", "부산 해운대구", ""]),
+        })
+        rows.append([row[h] for h in DB_HEADERS])
+    return rows
+
+
+def make_memo_rows(n: int, seed: int = 0, member_rows: Optional[List[List[Any]]] = None) -> List[List[Any]]:
+    rng = random.Random(seed + 1)
+    names = [r[0] for r in (member_rows or [])[1:]] or [_name(rng) for _ in range(100)]
+    words = ["상담", "제품", "방문", "전화", "추천", "건강", "주문", "교육"]
+    rows = [list(MEMO_HEADERS)]
+    for _ in range(n):
+        ts = f"{_date(rng, 2023, 2025)} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"
+        rows.append([ts, rng.choice(names), " ".join(rng.sample(words, 3))])
+    # 최신순 (2행이 가장 최근)
+    rows[1:] = sorted(rows[1:], key=lambda r: r[0], reverse=True)
+    return rows
+
+
+def make_order_rows(n: int, seed: int = 0, member_rows: Optional[List[List[Any]]] = None) -> List[List[Any]]:
+    rng = random.Random(seed + 2)
+    members = (member_rows or [])[1:] or make_member_rows(100, seed)[1:]
+    rows = [list(ORDER_HEADERS)]
+    for _ in range(n):
+        m = rng.choice(members)
+        price = rng.choice([15000, 30000, 45000])
+        rows.append([
+            _date(rng, 2023, 2025), m[0], m[1], m[2],
+            rng.choice(_PRODUCTS), price, price // 1000, rng.choice(["카드", "현금", "계좌이체"]),
+            _name(rng), "", "", "",
+        ])
+    rows[1:] = sorted(rows[1:], key=lambda r: r[0], reverse=True)
+    return rows
+
+
+SPARE_GRID_ROWS = 1000   # 데이터 아래 빈 격자 행 (row_count 에는 포함, 읽기 결과에는 없음)
+
+
+def build_synthetic_spreadsheet(members: int = 1000, memos: Optional[int] = None, orders: Optional[int] = None,
+                                config: Optional[FakeBackendConfig] = None, seed: int = 0) -> FakeSpreadsheet:
+    """DB / 상담·개인·활동일지 / 제품주문 / 후원수당 / 이미지메모 시트를 갖춘 가짜 스프레드시트"""
+    memos = members if memos is None else memos
+    orders = members if orders is None else orders
+
+    ss = FakeSpreadsheet(config=config)
+    add = lambda title, values: ss.add_worksheet(title, rows=len(values) + SPARE_GRID_ROWS, values=values)
+    member_rows = make_member_rows(members, seed)
+    add("DB", member_rows)
+    for offset, title in enumerate(("상담일지", "개인일지", "활동일지")):
+        add(title, make_memo_rows(memos, seed + offset, member_rows))
+    add("제품주문", make_order_rows(orders, seed, member_rows))
+    add("후원수당", [list(COMMISSION_HEADERS)])
+    add("이미지메모", [list(IMAGE_HEADERS)])
+    return ss
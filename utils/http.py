@@ -5,6 +5,8 @@ HTTP 요청 / 외부 API 연동 유틸
 
 import os
 import requests
+
+from utils.providers import get_http_session
 from typing import Any, Dict, Optional
 
 # ==========================================================
@@ -45,7 +47,7 @@ def _post_json(url: str, payload: Dict[str, Any], timeout: Optional[int] = None)
     """POST JSON 요청"""
     p = _ensure_json_payload(payload)
     to = _normalize_timeout(timeout)
-    r = requests.post(url, json=p, timeout=to)
+    r = get_http_session().post(url, json=p, timeout=to)
     r.raise_for_status()
     try:
         return r.json()
@@ -94,7 +96,7 @@ def call_impact_sync(payload: dict):
         raise ImpactError("IMPACT_API_URL 미설정")
 
     try:
-        r = requests.post(IMPACT_API_URL, json=payload, timeout=30)
+        r = get_http_session().post(IMPACT_API_URL, json=payload, timeout=30)
         r.raise_for_status()
         return r.json()
     except requests.RequestException as e:
@@ -0,0 +1,321 @@
+"""
+utils/instrument.py
+요청 단위 외부 호출 계측 (Sheets / OpenAI / HTTP)
+- before_request 에서 계측 컨텍스트 시작 → 요청 처리 중 외부 호출마다 record()
+- after_request 에서 Server-Timing 헤더 + 구조화 로그 1줄
+- 느린 요청은 샘플링하여 외부 호출 전체 목록을 로그로 남김
+- Sheets 쓰기 대상 시트: A1 범위로 알 수 있으면 호출에서, 아니면 writing(시트) 블록에서 (written_sheet())
+"""
+
+import contextvars
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+
+logger = logging.getLogger("instrument")
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "2000"))
+SLOW_REQUEST_SAMPLE = float(os.getenv("SLOW_REQUEST_SAMPLE", "1.0"))
+MAX_CALLS_KEPT = 500   # 요청당 보관하는 호출 상세 개수 (집계는 계속)
+
+KINDS = ("sheets", "openai", "http")
+SHEETS_READ_OPS = {
+    "get_all_records", "get_all_values", "row_values", "col_values", "get_lastUpdateTime", "values_batch_get",
+}
+
+
+# ======================================================================================
+# ✅ 요청 계측 컨텍스트
+# ======================================================================================
+class RequestStats:
+    """
+    한 요청 동안의 외부 호출 집계
+    - totals[kind] = {"count", "ms", "bytes", "errors"}
+    - calls: 개별 호출 상세 (느린 요청 덤프용)
+    """
+
+    def __init__(self, method: str = "", path: str = "", request_id: Optional[str] = None):
+        self.request_id = request_id or uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.tags: Dict[str, Any] = {}
+        self.started = time.perf_counter()
+        self.totals: Dict[str, Dict[str, float]] = {}
+        self.calls: List[Dict[str, Any]] = []
+        self.sheets: set = set()   # 이 요청에서 읽은 워크시트 이름
+
+    def record(self, kind: str, op: str, duration: float, nbytes: int = 0, error: Optional[str] = None) -> None:
+        total = self.totals.setdefault(kind, {"count": 0, "ms": 0.0, "bytes": 0, "errors": 0})
+        total["count"] += 1
+        total["ms"] += duration * 1000
+        total["bytes"] += nbytes
+        if error:
+            total["errors"] += 1
+        if len(self.calls) < MAX_CALLS_KEPT:
+            call = {
+                "kind": kind,
+                "op": op,
+                "ms": round(duration * 1000, 2),
+                "bytes": nbytes,
+                "at_ms": round((time.perf_counter() - self.started) * 1000 - duration * 1000, 2),
+            }
+            if error:
+                call["error"] = error
+            self.calls.append(call)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self, total_ms: Optional[float] = None) -> str:
+        """Server-Timing 헤더 값 (예: sheets;dur=812.4;desc="3 calls", total;dur=1020.1)"""
+        parts = []
+        for kind in KINDS + tuple(k for k in self.totals if k not in KINDS):
+            total = self.totals.get(kind)
+            if total:
+                parts.append(f'{kind};dur={total["ms"]:.1f};desc="{int(total["count"])} calls"')
+        parts.append(f"total;dur={self.elapsed_ms() if total_ms is None else total_ms:.1f}")
+        return ", ".join(parts)
+
+    def summary(self, status: Optional[int] = None, total_ms: Optional[float] = None) -> Dict[str, Any]:
+        return {
+            "request_id": self.request_id,
+            "method": self.method,
+            "path": self.path,
+            "status": status,
+            "total_ms": round(self.elapsed_ms() if total_ms is None else total_ms, 1),
+            **self.tags,
+            "external": {
+                kind: {k: (round(v, 1) if k == "ms" else int(v)) for k, v in total.items()}
+                for kind, total in self.totals.items()
+            },
+        }
+
+
+_current: contextvars.ContextVar = contextvars.ContextVar("request_stats", default=None)
+
+
+def current() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def start_request(method: str = "", path: str = "", request_id: Optional[str] = None) -> RequestStats:
+    stats = RequestStats(method, path, request_id)
+    _current.set(stats)
+    return stats
+
+
+def end_request() -> Optional[RequestStats]:
+    stats = _current.get()
+    _current.set(None)
+    return stats
+
+
+def annotate(**tags: Any) -> None:
+    """현재 요청에 태그 추가 (예: intent)"""
+    stats = _current.get()
+    if stats is not None:
+        stats.tags.update(tags)
+
+
+def touch_sheet(sheet_name: str) -> None:
+    """현재 요청이 읽은 워크시트 기록 (응답 캐시 무효화 범위 판단용)"""
+    stats = _current.get()
+    if stats is not None and sheet_name:
+        stats.sheets.add(str(sheet_name))
+
+
+def op_type(kind: str, op: str) -> str:
+    """외부 호출 분류: sheets → read / write, 그 외 → call"""
+    if kind != "sheets":
+        return "call"
+    if op in SHEETS_READ_OPS or op.startswith("GET") or "batchGet" in op:
+        return "read"
+    return "write"
+
+
+_listeners: List[Callable[..., None]] = []
+_writing: contextvars.ContextVar = contextvars.ContextVar("writing_sheet", default=None)
+
+
+@contextmanager
+def writing(sheet_name: Optional[str]):
+    """
+    with writing("DB"): ws.insert_row(...) → 블록 안 Sheets 호출을 해당 시트 쓰기로 기록
+    - 행 삽입/삭제처럼 요청에 시트 이름(A1 범위)이 없는 호출용
+    """
+    token = _writing.set(str(sheet_name) if sheet_name else None)
+    try:
+        yield
+    finally:
+        _writing.reset(token)
+
+
+def written_sheet() -> Optional[str]:
+    """지금 기록 중인 Sheets 호출의 대상 시트 (모르면 None) — 리스너에서 사용"""
+    return _writing.get()
+
+
+def add_listener(listener: Callable[..., None]) -> None:
+    """외부 호출마다 호출될 함수 등록 (예: 메트릭) — listener(kind, op, duration, nbytes, error)"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def record(kind: str, op: str, duration: float, nbytes: int = 0, error: Optional[str] = None,
+           sheet: Optional[str] = None) -> None:
+    """
+    외부 호출 1건 기록 (요청 컨텍스트 밖이면 요청 집계는 생략, 리스너는 항상 호출)
+    - sheet: 호출에서 알아낸 대상 시트 (없으면 writing() 블록의 시트)
+    """
+    stats = _current.get()
+    if stats is not None:
+        stats.record(kind, op, duration, nbytes, error)
+    token = _writing.set(sheet) if sheet else None
+    try:
+        for listener in _listeners:
+            try:
+                listener(kind, op, duration, nbytes, error)
+            except Exception:
+                logger.exception("instrument listener 실패")
+    finally:
+        if token is not None:
+            _writing.reset(token)
+
+
+# ======================================================================================
+# ✅ 계측 대상 연결
+# ======================================================================================
+def classify_url(url: str) -> str:
+    """URL → 계측 분류 (openai / sheets / http)"""
+    host = urlparse(url).netloc.lower()
+    if "openai" in host:
+        return "openai"
+    if host.endswith("googleapis.com"):
+        return "sheets"
+    return "http"
+
+
+def _range_sheet(a1: str) -> Optional[str]:
+    """'시트'!A1:B2 → 시트 (시트 이름이 없으면 None)"""
+    if "!" not in a1:
+        return None
+    name = a1.rsplit("!", 1)[0]
+    if name.startswith("'") and name.endswith("'"):
+        name = name[1:-1].replace("''", "'")
+    return name or None
+
+
+def sheet_of_request(endpoint: str, body: Any = None) -> Optional[str]:
+    """
+    Sheets API 요청 → 대상 시트 (values/<범위> 경로 또는 values:batchUpdate 본문 범위가 한 시트일 때)
+    - spreadsheets:batchUpdate (행 삽입/삭제 등 sheetId 기준) → None
+    """
+    path = unquote(urlparse(endpoint).path)
+    if "/values/" in path:
+        return _range_sheet(path.split("/values/", 1)[1].split(":")[0])
+    if path.endswith("values:batchUpdate") and isinstance(body, dict):
+        names = {_range_sheet(str(d.get("range", ""))) for d in body.get("data", [])}
+        if len(names) == 1:
+            return names.pop()
+    return None
+
+
+def requests_response_hook(response, *args, **kwargs):
+    """requests.Session 응답 hook → HTTP 호출 기록"""
+    req = response.request
+    op = f"{req.method} {urlparse(req.url).netloc}{urlparse(req.url).path}"
+    error = None if response.ok else str(response.status_code)
+    record(classify_url(req.url), op, response.elapsed.total_seconds(), len(response.content or b""), error)
+    return response
+
+
+def make_instrumented_transport():
+    """
+    httpx 전송 계층을 감싼 transport (OpenAI SDK 등 httpx 클라이언트용)
+    - DefaultHttpxClient(transport=...) / httpx.Client(transport=...) 에 전달
+    - 응답 헤더 수신까지의 시간 기록 (연결 실패 등 예외 포함)
+    """
+    import httpx
+
+    class InstrumentedTransport(httpx.HTTPTransport):
+        def handle_request(self, request):
+            start = time.perf_counter()
+            url = str(request.url)
+            op = f"{request.method} {request.url.host}{request.url.path}"
+            try:
+                response = super().handle_request(request)
+            except Exception as e:
+                record(classify_url(url), op, time.perf_counter() - start, error=type(e).__name__)
+                raise
+            error = str(response.status_code) if response.status_code >= 400 else None
+            nbytes = int(response.headers.get("content-length") or 0)
+            record(classify_url(url), op, time.perf_counter() - start, nbytes, error)
+            return response
+
+    return InstrumentedTransport()
+
+
+def make_instrumented_client_class():
+    """
+    gspread.Client.request 를 감싼 클라이언트 클래스
+    - gspread.authorize(creds, client_factory=...) 에 전달
+    """
+    import gspread
+
+    class InstrumentedClient(gspread.Client):
+        def request(self, method, endpoint, *args, **kwargs):
+            start = time.perf_counter()
+            op = f"{method.upper()} {urlparse(endpoint).path.rsplit('/', 1)[-1] or endpoint}"
+            sheet = sheet_of_request(endpoint, kwargs.get("json"))
+            try:
+                response = super().request(method, endpoint, *args, **kwargs)
+            except Exception as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                record("sheets", op, time.perf_counter() - start, error=str(status or type(e).__name__),
+                       sheet=sheet)
+                raise
+            record("sheets", op, time.perf_counter() - start, len(response.content or b""), sheet=sheet)
+            return response
+
+    return InstrumentedClient
+
+
+# ======================================================================================
+# ✅ Flask 연결
+# ======================================================================================
+def _emit(stats: RequestStats, status: Optional[int], total_ms: float) -> None:
+    summary = stats.summary(status, total_ms)
+    logger.info(json.dumps({"event": "request", **summary}, ensure_ascii=False))
+
+    if total_ms >= SLOW_REQUEST_MS and random.random() < SLOW_REQUEST_SAMPLE:
+        logger.warning(json.dumps({"event": "slow_request", **summary, "calls": stats.calls}, ensure_ascii=False))
+
+
+def init_instrumentation(app) -> None:
+    """
+    Flask 앱에 요청 계측 hook 등록
+    - 다른 before_request 보다 먼저 등록해야 함 (전처리에서 바로 응답하는 경우 포함)
+    """
+    from flask import request
+
+    @app.before_request
+    def _start_instrumentation():
+        start_request(request.method, request.path, request.headers.get("X-Request-ID"))
+
+    @app.after_request
+    def _finish_instrumentation(response):
+        stats = end_request()
+        if stats is None:
+            return response
+        total_ms = stats.elapsed_ms()
+        response.headers["Server-Timing"] = stats.server_timing(total_ms)
+        response.headers.setdefault("X-Request-ID", stats.request_id)
+        _emit(stats, response.status_code, total_ms)
+        return response
@@ -0,0 +1,348 @@
+"""
+utils/journal.py
+일지(상담일지/개인일지/활동일지) 저장 write-behind 큐
+- enqueue(): 로컬 append-only 로그에 기록 + fsync 후 바로 반환 (Sheets 응답을 기다리지 않음)
+- 백그라운드 스레드가 시트별로 모아 주기(JOURNAL_FLUSH_SECONDS) 또는 건수(JOURNAL_BATCH_SIZE) 기준으로 일괄 반영
+- 일지 시트는 최신순(2행 삽입)이므로 insert_rows(row=2) 1회로 여러 행 반영
+- 재시작 시 로그 재생 → 미반영 행 재전송 (반영 후 ack 기록 전 종료되면 중복 가능: at-least-once)
+- 워커(pid)별 로그 파일, 종료된 워커의 로그는 다음 워커가 rename 으로 선점한 뒤 인수
+- read_with_pending(): 아직 반영 전인 행을 읽기 결과 앞에 합쳐 "저장 직후 검색" 보장
+  · 대기 행은 그 행을 가진 워커에서만 보임 (다른 워커는 시트 반영 후에 보임)
+- init_journal(app): 워커의 첫 요청 때 기록기 시작 → 재시작 전 미반영 행 재생 / 종료된 워커 로그 인수를
+  첫 일지 저장까지 미루지 않음
+"""
+
+import atexit
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.providers import is_initialized, provider
+from utils.response_cache import bump_sheet
+from utils.row_ids import row_id_store
+
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_DIR = os.getenv("JOURNAL_DIR", os.path.join("logs", "journal"))
+DEFAULT_FLUSH_SECONDS = 2.0
+DEFAULT_BATCH_SIZE = 50
+
+MEMO_HEADERS = ["날짜", "회원명", "내용"]
+CLAIM_MARK = ".claimed-"   # 인수 중인 로그: journal-<종료된 pid>.log.claimed-<인수한 pid>
+
+
+def write_behind_enabled() -> bool:
+    """MEMO_WRITE_BEHIND=0 이면 기존처럼 저장 시 바로 insert_row"""
+    return os.getenv("MEMO_WRITE_BEHIND", "1") != "0"
+
+
+# ======================================================================================
+# ✅ 로그 파일
+# ======================================================================================
+def _read_pending(path: str) -> List[Tuple[str, list]]:
+    """로그 파일 → ack 되지 않은 (시트명, 행) 목록 (기록 순서)"""
+    added: Dict[int, Tuple[str, list]] = {}
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # 기록 도중 종료된 마지막 줄 (fsync 전) → 무시
+                    continue
+                if entry.get("op") == "add":
+                    added[entry["seq"]] = (entry["sheet"], entry["row"])
+                elif entry.get("op") == "ack":
+                    for seq in entry.get("seqs", []):
+                        added.pop(seq, None)
+    except FileNotFoundError:
+        return []
+    return [added[seq] for seq in sorted(added)]
+
+
+def _log_owner(name: str) -> Optional[int]:
+    """journal-<pid>.log → pid, 선점 중인 journal-<pid>.log.claimed-<pid2> → pid2 (형식이 다르면 None)"""
+    name, _, claimer = name.partition(CLAIM_MARK)
+    if not (name.startswith("journal-") and name.endswith(".log")):
+        return None
+    try:
+        return int(claimer or name[len("journal-"):-len(".log")])
+    except ValueError:
+        return None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        import psutil
+    except ImportError:  # pragma: no cover - psutil 은 requirements 에 포함
+        return True
+    return psutil.pid_exists(pid)
+
+
+# ======================================================================================
+# ✅ write-behind 기록기
+# ======================================================================================
+class JournalWriter:
+    """
+    시트별 대기 행 + 로그 파일
+    - pending[sheet] = [(seq, row), ...] (기록 순서, 오래된 것 먼저)
+    - flush(): 시트별 1회 insert_rows, 실패한 시트는 다음 주기에 재시도
+    """
+
+    def __init__(self, path: str, flush_interval: float = DEFAULT_FLUSH_SECONDS,
+                 batch_size: int = DEFAULT_BATCH_SIZE, sheet_getter: Optional[Callable[[str], Any]] = None):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.sheet_getter = sheet_getter
+        self._pending: Dict[str, List[Tuple[int, list]]] = {}
+        self._seq = 0
+        self._fh = None
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --------------------------------------------------
+    # 열기 / 재생
+    # --------------------------------------------------
+    def open(self) -> "JournalWriter":
+        """로그 파일 열기 (기존 파일이 있으면 미반영 행 재생)"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        replay = _read_pending(self.path)
+        with self._lock:
+            # 재생한 행만 남긴 새 로그를 임시 파일에 쓴 뒤 교체 (교체 전 종료돼도 원본 유지)
+            tmp_path = self.path + ".tmp"
+            self._fh = open(tmp_path, "w", encoding="utf-8")
+            for sheet_name, row in replay:
+                self._add(sheet_name, row)
+            self._fh.close()
+            os.replace(tmp_path, self.path)
+            self._fh = open(self.path, "a", encoding="utf-8")
+        if replay:
+            logger.info("[journal] 미반영 %d건 재생: %s", len(replay), self.path)
+        return self
+
+    def adopt_orphans(self) -> int:
+        """
+        같은 디렉터리의 종료된 워커 로그(journal-<pid>.log) 인수 → 인수한 행 수
+        - 재생 전에 이 워커 이름(journal-<pid>.log.claimed-<내 pid>)으로 바꿔 선점
+          → 동시에 뜬 워커 중 rename 에 성공한 하나만 재생 (같은 행 중복 삽입 방지)
+        - 선점한 워커도 재생 도중 종료됐으면 그 선점 파일을 다시 인수
+        """
+        adopted = 0
+        folder = os.path.dirname(self.path) or "."
+        for path in glob.glob(os.path.join(folder, "journal-*.log*")):
+            if os.path.abspath(path) == os.path.abspath(self.path):
+                continue
+            owner = _log_owner(os.path.basename(path))
+            if owner is None or (owner != os.getpid() and _pid_alive(owner)):
+                continue
+            claimed = self._claim(path)
+            if claimed is None:
+                continue
+            rows = _read_pending(claimed)
+            with self._lock:
+                for sheet_name, row in rows:
+                    self._add(sheet_name, row)
+            os.remove(claimed)
+            adopted += len(rows)
+        if adopted:
+            logger.info("[journal] 종료된 워커 로그에서 %d건 인수", adopted)
+            self._wake.set()
+        return adopted
+
+    def _claim(self, path: str) -> Optional[str]:
+        """로그 파일을 이 워커 이름으로 rename → 선점한 경로 (다른 워커가 먼저 가져갔으면 None)"""
+        base = os.path.basename(path).split(CLAIM_MARK)[0]
+        claimed = os.path.join(os.path.dirname(path), f"{base}{CLAIM_MARK}{os.getpid()}")
+        if path == claimed:
+            return claimed
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError:
+            return None
+        return claimed
+
+    # --------------------------------------------------
+    # 기록
+    # --------------------------------------------------
+    def _write(self, entry: Dict[str, Any]) -> None:
+        self._fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def _add(self, sheet_name: str, row: list) -> int:
+        self._seq += 1
+        self._write({"op": "add", "seq": self._seq, "sheet": sheet_name, "row": row, "ts": time.time()})
+        self._pending.setdefault(sheet_name, []).append((self._seq, row))
+        return self._seq
+
+    def enqueue(self, sheet_name: str, row: list) -> int:
+        """행 1건 기록 (fsync 까지 완료 후 반환) → seq"""
+        with self._lock:
+            seq = self._add(sheet_name, list(row))
+            if self.pending_count() >= self.batch_size:
+                self._wake.set()
+        # 시트 호출 없이 읽기 결과가 바뀜 → 응답 캐시 무효화
+        bump_sheet(sheet_name)
+        return seq
+
+    def pending_rows(self, sheet_name: str) -> List[list]:
+        """반영 대기 중인 행 (최신순 → 시트 2행부터의 순서와 같음)"""
+        with self._lock:
+            return [row for _, row in reversed(self._pending.get(sheet_name, []))]
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return sum(len(items) for items in self._pending.values())
+
+    # --------------------------------------------------
+    # 반영
+    # --------------------------------------------------
+    def _get_sheet(self, sheet_name: str):
+        if self.sheet_getter is not None:
+            return self.sheet_getter(sheet_name)
+        from utils.sheets import get_worksheet
+        return get_worksheet(sheet_name)
+
+    def flush(self) -> int:
+        """대기 행을 시트별 insert_rows 1회로 반영 → 반영한 행 수"""
+        with self._flush_lock:
+            with self._lock:
+                batches = {name: list(items) for name, items in self._pending.items() if items}
+
+            written = 0
+            for sheet_name, items in batches.items():
+                rows = [row for _, row in reversed(items)]
+                try:
+                    row_id_store.insert_rows_top(self._get_sheet(sheet_name), rows)
+                except Exception as e:
+                    logger.warning("[journal] %s %d건 반영 실패 (다음 주기에 재시도): %s", sheet_name, len(rows), e)
+                    continue
+
+                seqs = {seq for seq, _ in items}
+                with self._lock:
+                    self._write({"op": "ack", "seqs": sorted(seqs)})
+                    self._pending[sheet_name] = [it for it in self._pending[sheet_name] if it[0] not in seqs]
+                written += len(rows)
+                logger.info("[journal] %s %d건 반영", sheet_name, len(rows))
+
+            with self._lock:
+                if written and not self.pending_count():
+                    # 모두 반영됨 → 로그 비우기
+                    self._fh.seek(0)
+                    self._fh.truncate()
+            return written
+
+    # --------------------------------------------------
+    # 백그라운드 스레드
+    # --------------------------------------------------
+    def start(self) -> "JournalWriter":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self.pending_count():
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("[journal] flush 실패")
+
+    def close(self, flush: bool = True) -> None:
+        """스레드 종료 (+ 남은 행 반영 시도). 반영 못 한 행은 로그에 남아 다음 시작 때 재생"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        if flush and self._fh is not None and self.pending_count():
+            self.flush()
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+
+# =====================================================
+# 프로세스 단위 기록기
+# =====================================================
+@provider("journal")
+def get_journal() -> JournalWriter:
+    """
+    워커별 write-behind 기록기 (첫 저장 시 생성)
+    - JOURNAL_DIR / JOURNAL_FLUSH_SECONDS / JOURNAL_BATCH_SIZE 환경변수
+    """
+    writer = JournalWriter(
+        os.path.join(JOURNAL_DIR, f"journal-{os.getpid()}.log"),
+        flush_interval=float(os.getenv("JOURNAL_FLUSH_SECONDS", DEFAULT_FLUSH_SECONDS)),
+        batch_size=int(os.getenv("JOURNAL_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+    )
+    writer.open()
+    writer.adopt_orphans()
+    writer.start()
+    atexit.register(writer.close)
+    return writer
+
+
+def init_journal(app) -> None:
+    """
+    워커마다 첫 요청 때 기록기 생성 (fork 이후 → 워커 pid 기준 로그)
+    - 실패하면 로그만 남기고 다음 요청/저장 때 다시 시도
+    """
+    if not write_behind_enabled():
+        return
+
+    @app.before_request
+    def _start_journal():
+        if is_initialized("journal"):
+            return
+        try:
+            get_journal()
+        except Exception:
+            logger.exception("[journal] 기록기 시작 실패 (다음 요청 때 재시도)")
+
+
+def _row_key(values) -> tuple:
+    # 일지 열(날짜/회원명/내용)만 비교 — 시트 쪽 행 ID 열 등은 무시
+    return tuple(str(v).strip() for v in list(values)[:len(MEMO_HEADERS)])
+
+
+def read_with_pending(sheet_name: str, reader: Callable[[], list]) -> list:
+    """
+    시트 읽기 결과에 반영 대기 행을 합쳐 반환
+    - reader: ws.get_all_records (dict 목록) 또는 ws.get_all_values (헤더 포함 행 목록)
+    - 읽는 도중 반영이 끝난 행은 시트 상단 행과 비교해 중복 제외
+    - 이 워커의 대기 행만 합침 (다른 워커의 대기 행은 시트 반영 전까지 보이지 않음)
+    - 기록기가 아직 생성되지 않았으면 reader() 그대로
+    """
+    if not is_initialized("journal"):
+        return reader()
+
+    pending = get_journal().pending_rows(sheet_name)
+    data = reader()
+    if not pending:
+        return data
+
+    window = len(pending) * 2 + 10
+    if data and isinstance(data[0], list):
+        header, body = data[0], data[1:]
+        seen = {_row_key(r) for r in body[:window]}
+        fresh = [r for r in pending if _row_key(r) not in seen]
+        return [header] + fresh + body
+
+    headers = list(data[0].keys()) if data else MEMO_HEADERS
+    seen = {_row_key(r.values()) for r in data[:window]}
+    fresh = [dict(zip(headers, r)) for r in pending if _row_key(r) not in seen]
+    return fresh + data
@@ -0,0 +1,85 @@
+"""
+utils/log.py
+로깅 설정 (print() 대체)
+- 모듈마다 logging.getLogger(__name__) 사용, 메시지는 지연 %-포맷 (logger.debug("x=%s", x))
+- 레벨: LOG_LEVEL 환경변수 (기본 INFO) → 행 단위 DEBUG 로그는 운영에서 포맷/출력 자체가 생략됨
+- 형식: LOG_FORMAT=json 이면 한 줄 JSON, 그 외 사람이 읽는 텍스트
+- 모든 레코드에 request_id (utils.instrument 요청 컨텍스트) 부여
+"""
+
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Optional
+
+from utils import instrument
+
+
+DEFAULT_LEVEL = "INFO"
+TEXT_FORMAT = "[%(asctime)s] %(levelname)s %(name)s [%(request_id)s]: %(message)s"
+
+# LogRecord 기본 속성 (이 외의 속성은 extra=... 로 넘어온 값 → JSON 필드로 출력)
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+_HANDLER_NAME = "members_list"
+
+
+class RequestIdFilter(logging.Filter):
+    """현재 요청의 request_id 를 레코드에 부여 (요청 밖이면 "-")"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            stats = instrument.current()
+            record.request_id = stats.request_id if stats is not None else "-"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """레코드 → 한 줄 JSON (ts, level, logger, request_id, msg, extra 필드, exc)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def _resolve_level(level) -> int:
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level or DEFAULT_LEVEL).upper())
+    return value if isinstance(value, int) else logging.INFO
+
+
+def configure_logging(level=None, fmt: Optional[str] = None, stream=None) -> logging.Handler:
+    """
+    루트 로거 설정 (여러 번 호출해도 핸들러 1개 유지)
+    - level: 미지정 → LOG_LEVEL 환경변수
+    - fmt: "json" | "text", 미지정 → LOG_FORMAT 환경변수
+    """
+    level = _resolve_level(level if level is not None else os.getenv("LOG_LEVEL", DEFAULT_LEVEL))
+    fmt = (fmt or os.getenv("LOG_FORMAT", "text")).lower()
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if handler.get_name() == _HANDLER_NAME:
+            root.removeHandler(handler)
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.set_name(_HANDLER_NAME)
+    handler.addFilter(RequestIdFilter())
+    handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(level)
+    return handler
@@ -0,0 +1,157 @@
+"""
+utils/member_rows.py
+DB 시트 행 압축 보관 + 워커 단위 캐시
+- 헤더는 intern 된 tuple 하나, 행은 값 tuple 로 보관 (행마다 dict 를 두지 않음)
+- 코드/통신사/분류/회원단계 처럼 값 종류가 적은 컬럼은 문자열 intern → 같은 값은 객체 하나
+- MemberRow: 읽기 전용 Mapping 뷰 (__slots__) — 기존 코드의 row.get()/row["회원명"]/items() 그대로 사용
+- dict 는 응답 경계(JSON 직렬화, to_dict)에서만 생성
+- get_member_rows(): DB 시트 캐시 (utils.sheet_refresh 스냅샷 — MEMBER_CACHE_TTL 초 이후 백그라운드 갱신,
+  MEMBER_CACHE_HARD_TTL 초 이후 / 시트 쓰기 관측 시 다시 읽음)
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from utils.row_ids import ROW_ID_HEADER
+from utils.sheet_refresh import SheetSnapshots, sheet_snapshots
+
+
+MEMBER_SHEET = "DB"
+LOW_CARDINALITY_FIELDS = ("코드", "통신사", "분류", "회원단계")
+
+
+# ======================================================================================
+# ✅ 행 뷰
+# ======================================================================================
+class MemberRow(Mapping):
+    """
+    값 tuple + 공유 헤더 인덱스(컬럼명 → 위치) 로 만든 읽기 전용 행
+    - dict 와 같은 방식으로 조회 가능, 수정은 불가 (to_dict() 로 복사 후 수정)
+    """
+
+    __slots__ = ("_index", "_values")
+
+    def __init__(self, index: Dict[str, int], values: tuple):
+        self._index = index
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._index[key]]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        pos = self._index.get(key)
+        return default if pos is None else self._values[pos]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._index, self._values))
+
+    copy = to_dict
+
+    def __repr__(self) -> str:
+        return f"MemberRow({self.to_dict()!r})"
+
+
+# ======================================================================================
+# ✅ 압축 테이블
+# ======================================================================================
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+class CompactTable:
+    """
+    헤더 tuple + 행 tuple 목록
+    - from_records(): get_all_records() 결과 (list[dict]) 에서 생성
+    - rows(): MemberRow 목록 (매 호출 새 list, 뷰 객체는 공유)
+    """
+
+    def __init__(self, header: Sequence[str], values: Iterable[Sequence[Any]],
+                 intern_fields: Sequence[str] = LOW_CARDINALITY_FIELDS):
+        self.header: Tuple[str, ...] = tuple(sys.intern(str(h)) for h in header)
+        self.index: Dict[str, int] = {h: i for i, h in enumerate(self.header)}
+        interned = {self.index[f] for f in intern_fields if f in self.index}
+        width = len(self.header)
+
+        rows = []
+        for raw in values:
+            vals = list(raw[:width])
+            if len(vals) < width:
+                vals.extend([""] * (width - len(vals)))
+            for pos in interned:
+                vals[pos] = _intern(vals[pos])
+            rows.append(tuple(vals))
+        self.values: Tuple[tuple, ...] = tuple(rows)
+        self._views = tuple(MemberRow(self.index, v) for v in self.values)
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]], **kwargs) -> "CompactTable":
+        header = list(records[0].keys()) if records else []
+        return cls(header, ([r.get(h, "") for h in header] for r in records), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def rows(self) -> List[MemberRow]:
+        return list(self._views)
+
+    def column(self, name: str) -> tuple:
+        pos = self.index.get(name)
+        if pos is None:
+            return ("",) * len(self.values)
+        return tuple(v[pos] for v in self.values)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """응답 경계용 dict 목록 (숨김 ID 열 제외)"""
+        keep = [i for i, h in enumerate(self.header) if h != ROW_ID_HEADER]
+        header = [self.header[i] for i in keep]
+        return [dict(zip(header, (v[i] for i in keep))) for v in self.values]
+
+
+# ======================================================================================
+# ✅ DB 시트 캐시
+# ======================================================================================
+class MemberRowCache:
+    """
+    스프레드시트 1개의 DB 시트 → CompactTable
+    - 만료/교체/무효화 규칙은 SheetSnapshots (DB 정책) 를 따름
+    - soft 만료 후에는 이전 테이블을 응답하고 백그라운드에서 다시 읽음
+    """
+
+    def __init__(self, snapshots: SheetSnapshots = sheet_snapshots):
+        self.snapshots = snapshots
+
+    @property
+    def ttl(self) -> float:
+        return self.snapshots.policy(MEMBER_SHEET).soft_ttl
+
+    def get(self, spreadsheet, loader) -> CompactTable:
+        return self.snapshots.get(MEMBER_SHEET, spreadsheet,
+                                  lambda: CompactTable.from_records(loader()), cache="member_rows")
+
+    def clear(self) -> None:
+        self.snapshots.clear(MEMBER_SHEET)
+
+
+member_row_cache = MemberRowCache()
+
+
+def member_cache_enabled() -> bool:
+    return member_row_cache.ttl > 0
+
+
+def get_member_rows(spreadsheet, loader) -> List[MemberRow]:
+    """
+    DB 시트 행 (MemberRow 목록)
+    - loader: 캐시가 없거나 무효일 때만 호출 (get_all_records 결과 반환)
+    """
+    return member_row_cache.get(spreadsheet, loader).rows()
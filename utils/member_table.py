@@ -0,0 +1,531 @@
+"""
+utils/member_table.py
+회원(DB 시트) 컬럼형 테이블 + 벡터화 검색 엔진
+- DB 시트 행(list[dict])을 pandas DataFrame 으로 보관
+- 문자열 컬럼은 strip + 소문자 정규화 컬럼을 한 번만 만들어 재사용
+- 가입일자/생년월일 은 datetime64 컬럼으로 파싱
+- search_params(dict) → 조건별 boolean mask → 한 번에 필터링
+- 질의 계획(QueryPlan): 조건 모양(필드/연산자/모드)마다 1회 컴파일 후 재사용
+  · 인덱스 조건: exact/digits → 값 해시 인덱스(ValueIndex), 가입일자/생년월일 범위·월 → DateIndex
+  · 실행 시 각 인덱스 조건의 후보 수를 인덱스 통계(버킷 크기/이진 탐색 구간)로 추정
+    → 가장 적은 조건부터 후보 생성, 후보가 더 적으면 나머지 인덱스 조건은 후보에 대해서만 검사
+  · partial 등 나머지 조건은 후보 행에 대해서만 mask 계산 (인덱스 조건이 없을 때만 전체 훑기)
+- 조건 키: "필드" / "필드__gte" / "필드__lte" / "필드__month" / "필드__exact" / "필드__partial" / "필드__digits"
+- get_member_table(): 같은 DB 스냅샷(MemberRow 목록)이면 테이블·인덱스·계획 재사용
+"""
+
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.metrics import cache_event
+
+
+# =====================================================
+# 설정
+# =====================================================
+DATE_FORMAT = "%Y-%m-%d"
+INDEXED_DATE_FIELDS = ("가입일자", "생년월일")
+RANGE_OPS = ("gte", "lte")
+MATCH_MODES = ("exact", "partial", "digits")
+
+# 인덱스가 없는 조건의 추정 선택도 (residual 검사 순서용, 작을수록 먼저)
+RESIDUAL_SELECTIVITY = {"digits": 0.01, "exact": 0.05, "month": 1 / 12, "range": 0.3, "partial": 0.5}
+
+# parse_natural_query 가 만드는 축약 필드명 → 실제 DB 컬럼명
+FIELD_ALIASES = {
+    "가입일": "가입일자",
+}
+
+# 기본 검색 모드 (search_members 와 동일)
+DEFAULT_MATCH_MODE = {
+    "코드": "exact",
+    "회원번호": "exact",
+}
+
+
+def split_condition_key(key: str):
+    """
+    조건 키를 (필드, 연산자) 로 분리
+    - "회원명" → ("회원명", None)
+    - "가입일__gte" → ("가입일", "gte")
+    """
+    field, _, op = key.partition("__")
+    return field, (op or None)
+
+
+def _exact_key(value: Any) -> str:
+    return str(value if value is not None else "").strip().lower()
+
+
+def _digits_key(value: Any) -> str:
+    return re.sub(r"\D", "", str(value if value is not None else ""))
+
+
+def _parse_date(value: Any) -> Optional[datetime]:
+    try:
+        return datetime.strptime(str(value or "").strip(), DATE_FORMAT)
+    except ValueError:
+        return None
+
+
+# ======================================================================================
+# ✅ 날짜 정렬 인덱스
+# ======================================================================================
+class DateIndex:
+    """
+    (날짜 ordinal, 행 id) 정렬 배열
+    - range(): 날짜 범위 → 행 id 배열 (이진 탐색, O(log n + k))
+    - month_day_range(): 연도 무관 월/일 범위 (매년 반복되는 생일 검색용)
+    - 파싱 실패/빈 값 행은 인덱스에 포함하지 않음
+    """
+
+    def __init__(self, values: Iterable[Any]):
+        ordinals, month_days, row_ids = [], [], []
+        for row_id, value in enumerate(values):
+            d = _parse_date(value)
+            if d is None:
+                continue
+            ordinals.append(d.toordinal())
+            month_days.append(d.month * 100 + d.day)
+            row_ids.append(row_id)
+
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        month_days = np.asarray(month_days, dtype=np.int64)
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+
+        order = np.argsort(ordinals, kind="stable")
+        self.ordinals = ordinals[order]
+        self.row_ids = row_ids[order]
+
+        md_order = np.argsort(month_days, kind="stable")
+        self.month_days = month_days[md_order]
+        self.md_row_ids = row_ids[md_order]
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+    def range(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> np.ndarray:
+        """start ≤ 날짜 ≤ end 인 행 id (정렬되지 않은 상태로 반환)"""
+        lo = 0 if start is None else np.searchsorted(self.ordinals, start.toordinal(), side="left")
+        hi = len(self.ordinals) if end is None else np.searchsorted(self.ordinals, end.toordinal(), side="right")
+        return self.row_ids[lo:hi]
+
+    def month_day_range(self, start_md: int, end_md: int) -> np.ndarray:
+        """
+        월*100+일 범위 조회 (예: 501~531 → 5월)
+        - start_md > end_md 이면 연말을 넘어가는 범위로 처리 (1220~0110)
+        """
+        def _slice(lo_md, hi_md):
+            lo = np.searchsorted(self.month_days, lo_md, side="left")
+            hi = np.searchsorted(self.month_days, hi_md, side="right")
+            return self.md_row_ids[lo:hi]
+
+        if start_md <= end_md:
+            return _slice(start_md, end_md)
+        return np.concatenate([_slice(start_md, 1231), _slice(101, end_md)])
+
+    def month(self, month: int) -> np.ndarray:
+        return self.month_day_range(month * 100 + 1, month * 100 + 31)
+
+
+# ======================================================================================
+# ✅ 값 해시 인덱스
+# ======================================================================================
+class ValueIndex:
+    """
+    정규화 값 → 행 위치 배열 (exact / digits 조회)
+    - count(): 버킷 크기 = 해당 값 조건의 정확한 후보 수 (계획 단계 선택도)
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        buckets: Dict[str, List[int]] = {}
+        size = 0
+        for pos, key in enumerate(keys):
+            buckets.setdefault(key, []).append(pos)
+            size += 1
+        self.size = size
+        self.buckets = {k: np.asarray(v, dtype=np.int64) for k, v in buckets.items()}
+
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+    def count(self, key: str) -> int:
+        bucket = self.buckets.get(key)
+        return 0 if bucket is None else len(bucket)
+
+    def lookup(self, key: str) -> np.ndarray:
+        return self.buckets.get(key, np.array([], dtype=np.int64))
+
+
+# ======================================================================================
+# ✅ 질의 계획
+# ======================================================================================
+class Step(NamedTuple):
+    """
+    조건 1개 (범위는 같은 필드의 __gte/__lte 를 한 단계로)
+    - kind: exact / digits / partial / range / month
+    - indexed: 인덱스로 후보를 만들 수 있는지
+    """
+    kind: str
+    field: str
+    keys: Tuple[str, ...]
+    indexed: bool
+
+
+class QueryPlan(NamedTuple):
+    shape: tuple
+    index_steps: Tuple[Step, ...]
+    residual_steps: Tuple[Step, ...]   # 추정 선택도 순
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "index": [f"{s.kind}:{s.field}" for s in self.index_steps],
+            "residual": [f"{s.kind}:{s.field}" for s in self.residual_steps],
+        }
+
+
+# ======================================================================================
+# ✅ 컬럼형 회원 테이블
+# ======================================================================================
+class MemberTable:
+    """
+    회원 행 목록을 DataFrame 으로 감싼 검색용 테이블
+    - rows: get_all_records() 결과 (list[dict])
+    - 정규화 컬럼/날짜 컬럼은 처음 사용할 때 한 번 계산 후 재사용
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self.rows = list(rows or [])
+        self.df = pd.DataFrame(self.rows, dtype=object) if self.rows else pd.DataFrame()
+        self._norm_cols: Dict[str, pd.Series] = {}
+        self._date_cols: Dict[str, pd.Series] = {}
+        self._date_indexes: Dict[str, DateIndex] = {}
+        self._digit_cols: Dict[str, pd.Series] = {}
+        self._value_indexes: Dict[Tuple[str, str], ValueIndex] = {}
+        self._plans: Dict[tuple, QueryPlan] = {}
+        self._empty = pd.Series("", index=self.df.index, dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    # --------------------------------------------------
+    # 컬럼 접근
+    # --------------------------------------------------
+    def resolve_field(self, field: str) -> str:
+        """별칭 필드명을 실제 컬럼명으로 변환 (컬럼이 있으면 그대로)"""
+        if field in self.df.columns:
+            return field
+        return FIELD_ALIASES.get(field, field)
+
+    def raw_column(self, field: str) -> pd.Series:
+        """원본 값을 str + strip 한 컬럼 (없는 컬럼은 빈 문자열)"""
+        if field not in self.df.columns:
+            return self._empty
+        col = self.df[field]
+        return col.astype(str).where(col.notna(), "").str.strip()
+
+    def norm_column(self, field: str) -> pd.Series:
+        """strip + 소문자 정규화 컬럼 (캐시)"""
+        col = self._norm_cols.get(field)
+        if col is None:
+            col = self.raw_column(field).str.lower()
+            self._norm_cols[field] = col
+        return col
+
+    def digits_column(self, field: str) -> pd.Series:
+        """숫자만 남긴 컬럼 (휴대폰번호 하이픈 무시 비교, 캐시)"""
+        col = self._digit_cols.get(field)
+        if col is None:
+            col = self.raw_column(field).str.replace(r"\D", "", regex=True)
+            self._digit_cols[field] = col
+        return col
+
+    def value_index(self, field: str, kind: str = "exact") -> ValueIndex:
+        """exact(strip+소문자) / digits 값 해시 인덱스 (처음 사용할 때 생성)"""
+        index = self._value_indexes.get((field, kind))
+        if index is None:
+            col = self.digits_column(field) if kind == "digits" else self.norm_column(field)
+            index = ValueIndex(col.tolist())
+            self._value_indexes[(field, kind)] = index
+        return index
+
+    def date_column(self, field: str) -> pd.Series:
+        """YYYY-MM-DD 파싱 결과 datetime64 컬럼 (파싱 실패 → NaT)"""
+        col = self._date_cols.get(field)
+        if col is None:
+            col = pd.to_datetime(self.raw_column(field), format=DATE_FORMAT, errors="coerce")
+            self._date_cols[field] = col
+        return col
+
+    def date_index(self, field: str) -> DateIndex:
+        """날짜 정렬 인덱스 (처음 사용할 때 생성)"""
+        index = self._date_indexes.get(field)
+        if index is None:
+            values = self.df[field].tolist() if field in self.df.columns else []
+            index = DateIndex(values)
+            self._date_indexes[field] = index
+        return index
+
+    # --------------------------------------------------
+    # 조건 → mask 컴파일
+    # --------------------------------------------------
+    def compile_mask(self, search_params: Dict[str, Any], options: Optional[dict] = None,
+                     subset: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        search_params 를 boolean mask(np.ndarray) 로 변환
+        - "필드__gte" / "필드__lte" → 날짜 비교 (파싱 실패 행은 제외)
+        - "생년월일__month" → 연도 무관 월 비교
+        - 그 외 → match_mode 에 따라 exact(동등) / partial(포함) 비교
+        - subset(행 위치 배열)이 주어지면 해당 행들에 대해서만 계산
+        """
+        match_mode = dict(DEFAULT_MATCH_MODE)
+        if options and "match_mode" in options:
+            match_mode.update(options["match_mode"])
+
+        size = len(self.df.index) if subset is None else len(subset)
+        mask = np.ones(size, dtype=bool)
+
+        for key, value in (search_params or {}).items():
+            if not key:  # ✅ key가 None이면 스킵
+                continue
+
+            field, op = split_condition_key(key)
+
+            if op in RANGE_OPS:
+                mask &= self._date_mask(self.resolve_field(field), op, value, subset)
+            elif op == "month":
+                mask &= self._month_mask(self.resolve_field(field), value, subset)
+            else:
+                mode = op if op in MATCH_MODES else match_mode.get(field, "partial")
+                mask &= self._text_mask(self.resolve_field(field), value, mode, subset)
+
+            if not mask.any():
+                break
+
+        return mask
+
+    @staticmethod
+    def _take(col: pd.Series, subset: Optional[np.ndarray]) -> pd.Series:
+        return col if subset is None else col.iloc[subset]
+
+    def _date_mask(self, field: str, op: str, value: Any, subset=None) -> np.ndarray:
+        col = self._take(self.date_column(field), subset)
+        bound = pd.to_datetime(str(value or "").strip(), format=DATE_FORMAT, errors="coerce")
+        if pd.isna(bound):
+            return np.zeros(len(col), dtype=bool)
+
+        if op == "gte":
+            return (col >= bound).to_numpy()
+        return (col <= bound).to_numpy()
+
+    def _month_mask(self, field: str, value: Any, subset=None) -> np.ndarray:
+        col = self._take(self.date_column(field), subset)
+        try:
+            month = int(str(value).strip())
+        except ValueError:
+            return np.zeros(len(col), dtype=bool)
+        return (col.dt.month == month).to_numpy()
+
+    def _text_mask(self, field: str, value: Any, mode: str, subset=None) -> np.ndarray:
+        if mode == "digits":
+            col = self._take(self.digits_column(field), subset)
+            return (col == _digits_key(value)).to_numpy()
+
+        vv = str(value).strip().lower()
+        col = self._take(self.norm_column(field), subset)
+
+        if mode == "partial":
+            if not vv:
+                return np.ones(len(col), dtype=bool)
+            return col.str.contains(vv, regex=False).to_numpy()
+
+        # exact (잘못된 옵션도 exact 처리)
+        return (col == vv).to_numpy()
+
+    # --------------------------------------------------
+    # 질의 계획 (조건 모양별 캐시)
+    # --------------------------------------------------
+    def plan(self, search_params: Dict[str, Any], options: Optional[dict] = None) -> QueryPlan:
+        """
+        조건 모양(필드/연산자/모드) → QueryPlan (값은 보지 않으므로 같은 모양이면 재사용)
+        - exact/digits → 값 해시 인덱스, 가입일자/생년월일 범위·월 → DateIndex
+        - 그 외(partial, 인덱스 없는 날짜 필드) → residual
+        """
+        match_mode = dict(DEFAULT_MATCH_MODE)
+        if options and "match_mode" in options:
+            match_mode.update(options["match_mode"])
+
+        parsed = []
+        for key in search_params or {}:
+            if not key:
+                continue
+            field, op = split_condition_key(key)
+            if op not in RANGE_OPS and op != "month":
+                op = op if op in MATCH_MODES else match_mode.get(field, "partial")
+                op = op if op in MATCH_MODES else "exact"   # 잘못된 옵션 → exact (compile_mask 와 동일)
+            parsed.append((key, self.resolve_field(field), op))
+
+        shape = tuple(sorted(parsed))
+        plan = self._plans.get(shape)
+        if plan is not None:
+            cache_event("member_plan", hit=True)
+            return plan
+        cache_event("member_plan", hit=False)
+
+        steps: List[Step] = []
+        ranges: Dict[str, List[str]] = {}
+        for key, field, op in parsed:
+            if op in RANGE_OPS:
+                ranges.setdefault(field, []).append(key)
+            elif op == "month":
+                steps.append(Step("month", field, (key,), field in INDEXED_DATE_FIELDS))
+            else:
+                steps.append(Step(op, field, (key,), op != "partial"))
+        for field, keys in ranges.items():
+            steps.append(Step("range", field, tuple(keys), field in INDEXED_DATE_FIELDS))
+
+        residual = sorted((s for s in steps if not s.indexed), key=lambda s: RESIDUAL_SELECTIVITY[s.kind])
+        plan = QueryPlan(shape, tuple(s for s in steps if s.indexed), tuple(residual))
+        self._plans[shape] = plan
+        return plan
+
+    def _date_bounds(self, step: Step, params: Dict[str, Any]):
+        """범위 단계 → (start, end), 잘못된 날짜 → None"""
+        bounds = {split_condition_key(k)[1]: params[k] for k in step.keys}
+        start = _parse_date(bounds["gte"]) if "gte" in bounds else None
+        end = _parse_date(bounds["lte"]) if "lte" in bounds else None
+        if ("gte" in bounds and start is None) or ("lte" in bounds and end is None):
+            return None
+        return start, end
+
+    @staticmethod
+    def _month(value: Any) -> Optional[int]:
+        try:
+            return int(str(value).strip())
+        except ValueError:
+            return None
+
+    def _lookup(self, step: Step, params: Dict[str, Any]) -> Tuple[int, Any]:
+        """
+        인덱스 단계 → (추정 후보 수, 후보 생성 함수)
+        - 추정은 인덱스 통계만 사용 (버킷 크기 / 정렬 배열 이진 탐색 구간) → 후보 배열은 만들지 않음
+        """
+        value = params[step.keys[0]]
+        if step.kind in ("exact", "digits"):
+            index = self.value_index(step.field, step.kind)
+            key = _digits_key(value) if step.kind == "digits" else _exact_key(value)
+            return index.count(key), lambda: index.lookup(key)
+
+        index = self.date_index(step.field)
+        if step.kind == "month":
+            month = self._month(value)
+            if month is None:
+                return 0, lambda: np.array([], dtype=np.int64)
+            lo = np.searchsorted(index.month_days, month * 100 + 1, side="left")
+            hi = np.searchsorted(index.month_days, month * 100 + 31, side="right")
+            return int(hi - lo), lambda: index.month(month)
+
+        bounds = self._date_bounds(step, params)
+        if bounds is None:
+            return 0, lambda: np.array([], dtype=np.int64)
+        start, end = bounds
+        lo = 0 if start is None else np.searchsorted(index.ordinals, start.toordinal(), side="left")
+        hi = len(index.ordinals) if end is None else np.searchsorted(index.ordinals, end.toordinal(), side="right")
+        return int(max(hi - lo, 0)), lambda: index.range(start, end)
+
+    def _step_mask(self, step: Step, params: Dict[str, Any], subset: Optional[np.ndarray]) -> np.ndarray:
+        if step.kind == "range":
+            size = len(self.df.index) if subset is None else len(subset)
+            mask = np.ones(size, dtype=bool)
+            for key in step.keys:
+                mask &= self._date_mask(step.field, split_condition_key(key)[1], params[key], subset)
+            return mask
+        if step.kind == "month":
+            return self._month_mask(step.field, params[step.keys[0]], subset)
+        return self._text_mask(step.field, params[step.keys[0]], step.kind, subset)
+
+    # --------------------------------------------------
+    # 검색
+    # --------------------------------------------------
+    def positions(self, search_params: Dict[str, Any], options: Optional[dict] = None) -> np.ndarray:
+        """
+        조건에 맞는 행 위치 배열 (시트 순서)
+        1) 인덱스 조건을 추정 후보 수 순으로 정렬 → 가장 선택적인 조건으로 후보 생성
+        2) 다음 인덱스 조건: 후보보다 많으면 후보에 대해서만 검사, 아니면 교집합
+        3) residual 조건 → 후보 행에 대해서만 mask (인덱스 조건이 없으면 전체 훑기)
+        """
+        if not self.rows:
+            return np.array([], dtype=int)
+
+        plan = self.plan(search_params, options)
+        candidates: Optional[np.ndarray] = None
+        checks = list(plan.residual_steps)
+
+        lookups = sorted((self._lookup(s, search_params) + (s,) for s in plan.index_steps), key=lambda t: t[0])
+        for estimate, fetch, step in lookups:
+            if candidates is None:
+                candidates = np.unique(fetch())
+            elif len(candidates) <= estimate:
+                checks.insert(0, step)
+            else:
+                candidates = np.intersect1d(candidates, fetch())
+            if len(candidates) == 0:
+                return candidates
+
+        if candidates is None:
+            mask = np.ones(len(self.df.index), dtype=bool)
+            for step in checks:
+                mask &= self._step_mask(step, search_params, None)
+                if not mask.any():
+                    break
+            return np.flatnonzero(mask)
+
+        for step in checks:
+            candidates = candidates[self._step_mask(step, search_params, candidates)]
+            if len(candidates) == 0:
+                break
+        return candidates
+
+    def search(self, search_params: Dict[str, Any], options: Optional[dict] = None) -> List[Dict[str, Any]]:
+        """조건에 맞는 원본 행(dict) 목록 반환 (시트 순서 유지)"""
+        return [self.rows[i] for i in self.positions(search_params, options)]
+
+    def search_any(self, alternatives: Sequence[Dict[str, Any]],
+                   options: Optional[dict] = None) -> List[Dict[str, Any]]:
+        """조건 묶음 중 하나라도 맞는 행 (합집합, 시트 순서) — 빈 조건 묶음은 건너뜀"""
+        hits = [self.positions(c, options) for c in alternatives if c]
+        if not hits:
+            return []
+        return [self.rows[i] for i in np.unique(np.concatenate(hits))]
+
+
+# ======================================================================================
+# ✅ 테이블 재사용
+# ======================================================================================
+_cached_table: Optional[MemberTable] = None
+
+
+def _same_rows(a: Sequence[Any], b: Sequence[Any]) -> bool:
+    return len(a) == len(b) and all(x is y for x, y in zip(a, b))
+
+
+def get_member_table(rows: List[Dict[str, Any]]) -> MemberTable:
+    """
+    DB 행 목록에 맞는 MemberTable 반환
+    - 같은 스냅샷의 행(get_rows_from_sheet("DB") 의 공유 MemberRow)이면 기존 테이블/인덱스/계획 재사용
+    - 매번 새로 만든 dict 목록이면 새 테이블 (기존과 같은 비용)
+    """
+    global _cached_table
+    rows = list(rows or [])
+    cached = _cached_table
+    if cached is not None and _same_rows(cached.rows, rows):
+        cache_event("member_table", hit=True)
+        return cached
+    cache_event("member_table", hit=False)
+    table = MemberTable(rows)
+    _cached_table = table
+    return table
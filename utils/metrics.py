@@ -0,0 +1,148 @@
+"""
+utils/metrics.py
+Prometheus 메트릭 (/metrics)
+- 요청 지연 히스토그램: route + intent(INTENT_MAP 기준) 라벨
+- 외부 호출 카운터/히스토그램: utils.instrument 기록을 그대로 집계 (Sheets read/write, OpenAI, HTTP)
+- safe_update_cell 429 재시도 횟수, Vision 호출 시간, 캐시 hit/miss
+- gunicorn 다중 워커: PROMETHEUS_MULTIPROC_DIR 설정 시 multiprocess collector 사용
+- prometheus_client 미설치 시 모든 기록은 무시되고 /metrics 는 501
+"""
+
+import os
+import time
+from functools import wraps
+from typing import Iterable, Optional
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Histogram
+except ImportError:  # pragma: no cover - 선택 의존성
+    prometheus_client = None
+
+from utils import instrument
+
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32)
+
+
+# =====================================================
+# 메트릭 정의
+# =====================================================
+if prometheus_client is not None:
+    REQUEST_LATENCY = Histogram(
+        "members_request_duration_seconds", "요청 처리 시간",
+        ["route", "intent", "method"], buckets=LATENCY_BUCKETS,
+    )
+    EXTERNAL_CALLS = Counter(
+        "members_external_calls_total", "외부 호출 수 (kind=sheets/openai/http, op_type=read/write)",
+        ["kind", "op_type"],
+    )
+    EXTERNAL_ERRORS = Counter(
+        "members_external_errors_total", "외부 호출 오류 수", ["kind", "code"],
+    )
+    EXTERNAL_LATENCY = Histogram(
+        "members_external_call_duration_seconds", "외부 호출 시간", ["kind"], buckets=LATENCY_BUCKETS,
+    )
+    SHEETS_RETRIES = Counter(
+        "members_sheets_429_retries_total", "Sheets 429 재시도 횟수", ["func"],
+    )
+    VISION_LATENCY = Histogram(
+        "members_vision_duration_seconds", "OpenAI Vision 호출 시간", ["func"], buckets=LATENCY_BUCKETS,
+    )
+    CACHE_REQUESTS = Counter(
+        "members_cache_requests_total", "캐시 조회 (result=hit/miss)", ["cache", "result"],
+    )
+
+
+def enabled() -> bool:
+    return prometheus_client is not None
+
+
+# =====================================================
+# 기록 함수 (prometheus_client 없으면 무시)
+# =====================================================
+def observe_external(kind: str, op: str, duration: float, nbytes: int = 0, error: Optional[str] = None) -> None:
+    """utils.instrument 리스너 → 외부 호출 메트릭"""
+    if not enabled():
+        return
+    EXTERNAL_CALLS.labels(kind, instrument.op_type(kind, op)).inc()
+    EXTERNAL_LATENCY.labels(kind).observe(duration)
+    if error:
+        EXTERNAL_ERRORS.labels(kind, error).inc()
+
+
+def count_retry(func: str = "safe_update_cell") -> None:
+    if enabled():
+        SHEETS_RETRIES.labels(func).inc()
+
+
+def cache_event(cache: str, hit: bool) -> None:
+    if enabled():
+        CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def observe_vision(func):
+    """Vision 추출 함수 소요 시간 기록 데코레이터"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if enabled():
+                VISION_LATENCY.labels(func.__name__).observe(time.perf_counter() - start)
+    return wrapper
+
+
+instrument.add_listener(observe_external)
+
+
+# =====================================================
+# 노출
+# =====================================================
+def render_metrics():
+    """(본문 bytes, content-type) — 다중 워커 모드면 수집 디렉터리 합산"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import CollectorRegistry, multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """gunicorn child_exit hook 에서 호출 (종료된 워커의 live gauge 정리)"""
+    if enabled() and os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid)
+
+
+def init_metrics(app, intents: Iterable[str] = ()) -> None:
+    """
+    Flask 앱에 /metrics 및 요청 지연 기록 hook 등록
+    - init_instrumentation() 이후에 호출 (요청 계측 컨텍스트의 intent 태그 사용)
+    - intent 라벨은 intents(INTENT_MAP 키)에 있는 값만, 그 외는 "other"
+    """
+    from flask import Response, request
+
+    known_intents = set(intents)
+
+    @app.after_request
+    def _observe_request(response):
+        stats = instrument.current()
+        if not enabled() or stats is None or request.path == "/metrics":
+            return response
+        rule = request.url_rule.rule if request.url_rule else "unmatched"
+        intent = stats.tags.get("intent") or "none"
+        if intent != "none" and intent not in known_intents:
+            intent = "other"
+        REQUEST_LATENCY.labels(rule, intent, request.method).observe(stats.elapsed_ms() / 1000)
+        return response
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        if not enabled():
+            return Response("prometheus_client 미설치\n", status=501, mimetype="text/plain")
+        body, content_type = render_metrics()
+        return Response(body, mimetype=content_type.split(";")[0], content_type=content_type)
@@ -0,0 +1,304 @@
+"""
+utils/name_index.py
+회원명 검색 인덱스 (초성 / 자모 n-gram / 오타 허용)
+- 초성 키 인덱스: "ㄱㅅㅎ" → 김소희, 고상현 ...
+- 자모 분해 bigram 인덱스: 부분 입력/글자 순서가 조금 다른 입력 후보 수집
+- BK-tree (자모 단위 편집거리): "이태스" → 이태수
+- search() 는 순위가 매겨진 결과 목록을 반환
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.metrics import cache_event
+
+
+# =====================================================
+# 한글 자모 분해
+# =====================================================
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+             "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+CHOSEONG_SET = set(CHOSEONG)
+
+# 결과 순위 (작을수록 우선)
+MATCH_RANK = {
+    "exact": 0,
+    "choseong": 1,
+    "prefix": 2,
+    "contains": 3,
+    "fuzzy": 4,
+    "ngram": 5,
+}
+
+
+def _normalize_name(name: Any) -> str:
+    return "".join(str(name or "").split())
+
+
+def decompose(text: str) -> str:
+    """한글 음절 → 호환 자모 문자열 (그 외 문자는 소문자로 그대로)"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            offset = code - HANGUL_BASE
+            out.append(CHOSEONG[offset // 588])
+            out.append(JUNGSEONG[(offset % 588) // 28])
+            out.append(JONGSEONG[offset % 28])
+        else:
+            out.append(ch.lower())
+    return "".join(out)
+
+
+def choseong(text: str) -> str:
+    """한글 음절 → 초성 문자열 (이미 초성인 글자는 그대로)"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            out.append(CHOSEONG[(code - HANGUL_BASE) // 588])
+        else:
+            out.append(ch.lower())
+    return "".join(out)
+
+
+def is_choseong_query(text: str) -> bool:
+    """입력이 초성으로만 이루어졌는지 ("ㄱㅅㅎ")"""
+    return bool(text) and all(ch in CHOSEONG_SET for ch in text)
+
+
+def ngrams(text: str, n: int = 2) -> set:
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def levenshtein(a: str, b: str) -> int:
+    """편집거리 (삽입/삭제/치환 = 1)"""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        cur = [i]
+        for j, cb in enumerate(b, start=1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+# ======================================================================================
+# ✅ BK-tree (편집거리 근접 검색)
+# ======================================================================================
+class BKTree:
+    """
+    이산 거리 공간 트리
+    - add(): O(depth)
+    - query(term, max_distance): 삼각부등식으로 가지치기하며 근접 항목 수집
+    """
+
+    def __init__(self, distance=levenshtein):
+        self.distance = distance
+        self.root: Optional[Tuple[str, Dict[int, Any]]] = None
+
+    def add(self, term: str) -> None:
+        if self.root is None:
+            self.root = (term, {})
+            return
+        node = self.root
+        while True:
+            d = self.distance(term, node[0])
+            if d == 0:
+                return
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = (term, {})
+                return
+            node = child
+
+    def query(self, term: str, max_distance: int) -> List[Tuple[int, str]]:
+        """(거리, 항목) 목록 (거리 오름차순)"""
+        if self.root is None:
+            return []
+        found = []
+        stack = [self.root]
+        while stack:
+            node_term, children = stack.pop()
+            d = self.distance(term, node_term)
+            if d <= max_distance:
+                found.append((d, node_term))
+            lo, hi = d - max_distance, d + max_distance
+            stack.extend(child for dist, child in children.items() if lo <= dist <= hi)
+        found.sort()
+        return found
+
+
+# ======================================================================================
+# ✅ 회원명 인덱스
+# ======================================================================================
+class NameIndex:
+    """
+    회원명 → 행 위치 인덱스
+    - names: DB 시트 행 순서대로의 회원명 목록
+    - 행(dict) 자체는 보관하지 않음 → search() 호출 시 rows 를 넘겨 결과를 만든다
+    """
+
+    def __init__(self, names: Iterable[Any]):
+        self.names = tuple(_normalize_name(n) for n in names)
+        self.positions: Dict[str, List[int]] = defaultdict(list)
+        for pos, name in enumerate(self.names):
+            if name:
+                self.positions[name].append(pos)
+
+        self.jamo: Dict[str, str] = {}
+        self.choseong_keys: Dict[str, List[str]] = defaultdict(list)
+        self.grams: Dict[str, set] = defaultdict(set)
+        self.tree = BKTree()
+        self._jamo_to_names: Dict[str, List[str]] = defaultdict(list)
+
+        for name in self.positions:
+            jamo = decompose(name)
+            self.jamo[name] = jamo
+            self._jamo_to_names[jamo].append(name)
+            self.choseong_keys[choseong(name)].append(name)
+            for gram in ngrams(jamo):
+                self.grams[gram].add(name)
+            self.tree.add(jamo)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    # --------------------------------------------------
+    # 후보 수집
+    # --------------------------------------------------
+    def _choseong_candidates(self, query: str) -> Dict[str, Tuple[str, int]]:
+        found = {}
+        for key, names in self.choseong_keys.items():
+            if key == query:
+                rank = 0
+            elif key.startswith(query):
+                rank = 1
+            elif query in key:
+                rank = 2
+            else:
+                continue
+            for name in names:
+                found[name] = ("choseong", rank)
+        return found
+
+    def _ngram_candidates(self, jamo: str, min_overlap: float) -> Dict[str, float]:
+        query_grams = ngrams(jamo)
+        if not query_grams:
+            return {}
+        counts: Dict[str, int] = defaultdict(int)
+        for gram in query_grams:
+            for name in self.grams.get(gram, ()):
+                counts[name] += 1
+        scores = {}
+        for name, hit in counts.items():
+            # Dice 계수
+            score = 2 * hit / (len(query_grams) + len(ngrams(self.jamo[name])))
+            if score >= min_overlap:
+                scores[name] = score
+        return scores
+
+    # --------------------------------------------------
+    # 검색
+    # --------------------------------------------------
+    def rank(self, query: str, limit: int = 10, max_distance: Optional[int] = None,
+             min_overlap: float = 0.5) -> List[Dict[str, Any]]:
+        """
+        회원명 후보 순위 목록
+        반환: [{"회원명", "match", "distance", "score"}], match 는 MATCH_RANK 순서로 정렬
+        - max_distance 미지정 → 자모 길이 기준 자동 (3자모당 1, 최대 3)
+        """
+        q = _normalize_name(query)
+        if not q or not self.positions:
+            return []
+
+        scored: Dict[str, Dict[str, Any]] = {}
+
+        def _put(name: str, match: str, distance: int, score: float):
+            prev = scored.get(name)
+            cand = {"회원명": name, "match": match, "distance": distance, "score": round(score, 4)}
+            if prev is None or (MATCH_RANK[match], distance, -score) < (
+                    MATCH_RANK[prev["match"]], prev["distance"], -prev["score"]):
+                scored[name] = cand
+
+        if is_choseong_query(q):
+            for name, (_, rank) in self._choseong_candidates(q).items():
+                _put(name, "choseong", rank, 1.0)
+        else:
+            jamo = decompose(q)
+            if q in self.positions:
+                _put(q, "exact", 0, 1.0)
+
+            for name in self.positions:
+                if name != q and name.startswith(q):
+                    _put(name, "prefix", len(self.jamo[name]) - len(jamo), len(jamo) / len(self.jamo[name]))
+                elif name != q and q in name:
+                    _put(name, "contains", len(self.jamo[name]) - len(jamo), len(jamo) / len(self.jamo[name]))
+
+            if max_distance is None:
+                max_distance = min(3, max(1, len(jamo) // 3))
+            for distance, term in self.tree.query(jamo, max_distance):
+                for name in self._jamo_to_names[term]:
+                    _put(name, "fuzzy", distance, 1 - distance / max(len(jamo), len(term)))
+
+            for name, score in self._ngram_candidates(jamo, min_overlap).items():
+                _put(name, "ngram", levenshtein(jamo, self.jamo[name]), score)
+
+        ranked = sorted(scored.values(),
+                        key=lambda c: (MATCH_RANK[c["match"]], c["distance"], -c["score"], c["회원명"]))
+        return ranked[:limit]
+
+    def search(self, rows: List[Dict[str, Any]], query: str, limit: int = 10, **kwargs) -> List[Dict[str, Any]]:
+        """
+        rank() 결과를 행 단위로 펼친 목록 (동명이인은 각각 한 건)
+        반환: [{"row": dict, "match": str, "distance": int, "score": float}]
+        """
+        results = []
+        for cand in self.rank(query, limit=limit, **kwargs):
+            for pos in self.positions[cand["회원명"]]:
+                if pos < len(rows):
+                    results.append({
+                        "row": rows[pos],
+                        "match": cand["match"],
+                        "distance": cand["distance"],
+                        "score": cand["score"],
+                    })
+        return results[:limit]
+
+
+# =====================================================
+# 인덱스 재사용
+# =====================================================
+_cached_index: Optional[NameIndex] = None
+
+
+def get_name_index(rows: List[Dict[str, Any]]) -> NameIndex:
+    """
+    DB 행 목록에 맞는 NameIndex 반환
+    - 회원명 목록(순서 포함)이 직전과 같으면 기존 인덱스 재사용
+    - 등록/삭제/이름 변경으로 목록이 바뀌면 다시 생성
+    """
+    global _cached_index
+    names = tuple(_normalize_name(r.get("회원명", "")) for r in rows or [])
+    if _cached_index is None or _cached_index.names != names:
+        cache_event("name_index", hit=False)
+        _cached_index = NameIndex(names)
+    else:
+        cache_event("name_index", hit=True)
+    return _cached_index
+
+
+def search_member_names(rows: List[Dict[str, Any]], query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """DB 행 목록에서 회원명 초성/오타 허용 검색"""
+    return get_name_index(rows).search(rows, query, limit=limit)
@@ -0,0 +1,513 @@
+"""
+utils/order_index.py
+제품주문 시트 색인 (find_order / update_order / delete_order)
+- 회원명 / 회원번호 / 제품명 / 주문일자(일·월) → 주문 id 집합
+- 조건 여러 개는 교집합 ("이태수의 징코앤낫토 이번 달 주문")
+  · {"회원명": "이태수", "제품명": "징코앤낫토", "주문월": "2025-10"}
+  · {"회원번호": "22366", "주문일자__gte": "2025-10-01", "주문일자__lte": "2025-10-31"}
+- 행 번호 해석: 주문 id 는 시트 순서대로 증가하는 정수 (utils.row_ids.RowPositions)
+  · 2행 삽입(최신순 저장) → 맨 앞보다 작은 id, append → 맨 끝보다 큰 id
+  · 행 번호 = 2 + (id - 맨 앞 id) - (그 사이 삭제된 id 수)  → 이진 탐색 O(log n)
+- 주문 쓰기 경로(order_store)가 색인을 함께 갱신 → 전체 재조회는 처음/만료(ORDER_INDEX_TTL) 때만
+  · soft 만료 후에는 기존 색인으로 응답하고 백그라운드에서 재구축 (utils.sheet_refresh)
+  · 재구축 전 스프레드시트 수정 표시(Drive modifiedTime)를 먼저 확인 → 그대로면 재구축 생략
+- 수정/삭제 전에 대상 행 1줄을 다시 읽어 색인과 다르면(다른 워커/직접 편집) 재구축 후 재시도
+  · 색인에 없을 때는 수정 표시가 구축 때와 다를 때만 재구축
+- 시트 읽기/쓰기는 잠금 밖에서 → 느린 Sheets 호출이 다른 요청의 색인 조회를 막지 않음
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.instrument import writing
+from utils.metrics import cache_event
+from utils.row_ids import ROW_ID_HEADER, RowPositions, sheet_source as _source
+from utils.sheet_refresh import (
+    NOT_PROBED, SHEET_POLICIES, default_probe, get_refresh_scheduler, is_transient_error,
+)
+from utils.single_flight import sheet_flight
+
+logger = logging.getLogger(__name__)
+
+
+ORDER_SHEET = "제품주문"
+INDEX_FIELDS = ("회원명", "회원번호", "제품명")
+DATE_FIELD = "주문일자"
+MONTH_KEY = "주문월"
+
+_DATE_RE = re.compile(r"(\d{4})\D{1,2}(\d{1,2})\D{1,2}(\d{1,2})")
+
+
+def _norm(value: Any) -> str:
+    return str(value if value is not None else "").strip()
+
+
+def normalize_date(value: Any) -> str:
+    """'2025.10.5' / '2025-10-05 14:00' → '2025-10-05' (날짜 형식이 아니면 원문 strip)"""
+    text = _norm(value)
+    m = _DATE_RE.match(text)
+    if not m:
+        return text
+    y, mo, d = m.groups()
+    return f"{y}-{int(mo):02d}-{int(d):02d}"
+
+
+# ======================================================================================
+# ✅ 주문 색인
+# ======================================================================================
+class OrderIndex:
+    """
+    get_all_values() 결과(헤더 + 행) → 주문 색인
+    - rows[id] = 값 tuple (헤더 길이에 맞춤)
+    - postings[필드][값] = id 집합, months[YYYY-MM] = id 집합
+    """
+
+    def __init__(self, values: List[List[Any]]):
+        values = values or []
+        self.header: Tuple[str, ...] = tuple(_norm(h) for h in (values[0] if values else ()))
+        self.col = {h: i for i, h in enumerate(self.header)}
+        self.rows: Dict[int, tuple] = {}
+        self.postings: Dict[str, Dict[str, Set[int]]] = {f: {} for f in INDEX_FIELDS}
+        self.days: Dict[str, Set[int]] = {}
+        self.months: Dict[str, Set[int]] = {}
+        self.positions = RowPositions()
+        for raw in values[1:]:
+            self._add(self.positions.append(), raw)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    # --------------------------------------------------
+    # 색인 갱신
+    # --------------------------------------------------
+    def _fit(self, raw: Iterable[Any]) -> tuple:
+        vals = [_norm(v) for v in raw][:len(self.header)]
+        vals.extend([""] * (len(self.header) - len(vals)))
+        return tuple(vals)
+
+    def _keys(self, values: tuple):
+        for field in INDEX_FIELDS:
+            pos = self.col.get(field)
+            if pos is not None and values[pos]:
+                yield self.postings[field], values[pos]
+        pos = self.col.get(DATE_FIELD)
+        if pos is not None and values[pos]:
+            day = normalize_date(values[pos])
+            yield self.days, day
+            yield self.months, day[:7]
+
+    def _add(self, oid: int, raw: Iterable[Any]) -> int:
+        values = self._fit(raw)
+        self.rows[oid] = values
+        for table, key in self._keys(values):
+            table.setdefault(key, set()).add(oid)
+        return oid
+
+    def _unlink(self, oid: int) -> tuple:
+        values = self.rows.pop(oid)
+        for table, key in self._keys(values):
+            ids = table.get(key)
+            if ids is not None:
+                ids.discard(oid)
+                if not ids:
+                    del table[key]
+        return values
+
+    def insert_top(self, raw: Iterable[Any]) -> int:
+        """시트 2행 삽입과 같은 위치로 추가 → id"""
+        return self._add(self.positions.insert_top(), raw)
+
+    def append(self, raw: Iterable[Any]) -> int:
+        """시트 맨 아래 추가 → id"""
+        return self._add(self.positions.append(), raw)
+
+    def update(self, oid: int, changes: Dict[str, Any]) -> None:
+        values = list(self._unlink(oid))
+        for field, value in changes.items():
+            if field in self.col:
+                values[self.col[field]] = _norm(value)
+        self._add(oid, values)
+
+    def remove(self, oid: int) -> None:
+        self._unlink(oid)
+        self.positions.remove(oid)
+
+    # --------------------------------------------------
+    # 행 번호 해석
+    # --------------------------------------------------
+    def row_number(self, oid: int) -> int:
+        """주문 id → 현재 시트 행 번호 (헤더 = 1행)"""
+        return self.positions.row_number(oid)
+
+    def id_at(self, row: int) -> Optional[int]:
+        """시트 행 번호 → 주문 id (범위 밖 → None)"""
+        return self.positions.seq_at(row)
+
+    # --------------------------------------------------
+    # 조회
+    # --------------------------------------------------
+    def find(self, criteria: Dict[str, Any]) -> List[int]:
+        """조건 교집합 → 주문 id 목록 (시트 순서)"""
+        candidates: Optional[Set[int]] = None
+        residual: Dict[str, str] = {}
+        date_from = date_to = None
+
+        def _narrow(ids: Optional[Set[int]]):
+            nonlocal candidates
+            ids = ids or set()
+            candidates = set(ids) if candidates is None else candidates & ids
+
+        for key, value in (criteria or {}).items():
+            value = _norm(value)
+            if not value:
+                continue
+            field, _, op = key.partition("__")
+            if field in INDEX_FIELDS and not op:
+                _narrow(self.postings[field].get(value))
+            elif field == MONTH_KEY:
+                _narrow(self.months.get(normalize_date(value + "-01")[:7]))
+            elif field == DATE_FIELD and op == "gte":
+                date_from = normalize_date(value)
+            elif field == DATE_FIELD and op == "lte":
+                date_to = normalize_date(value)
+            elif field == DATE_FIELD:
+                _narrow(self.days.get(normalize_date(value)))
+            elif field in self.col:
+                residual[field] = value
+            else:
+                return []
+            if candidates is not None and not candidates:
+                return []
+
+        if date_from or date_to:
+            lo, hi = date_from or "", date_to or "9999-99-99"
+            ids: Set[int] = set()
+            for day, day_ids in self.days.items():
+                if lo <= day <= hi:
+                    ids |= day_ids
+            _narrow(ids)
+
+        if candidates is None:
+            candidates = set(self.rows)
+        result = sorted(candidates)
+        for field, value in residual.items():
+            pos = self.col[field]
+            result = [oid for oid in result if self.rows[oid][pos] == value]
+        return result
+
+    def first(self, criteria: Dict[str, Any]) -> Optional[int]:
+        ids = self.find(criteria)
+        return ids[0] if ids else None
+
+    def record(self, oid: int) -> Dict[str, str]:
+        """조회 응답용 dict (숨김 ID 열 제외)"""
+        record = dict(zip(self.header, self.rows[oid]))
+        record.pop(ROW_ID_HEADER, None)
+        return record
+
+    def matches_sheet_row(self, oid: int, sheet_values: List[Any]) -> bool:
+        """시트에서 다시 읽은 행이 색인의 행과 같은지 (빈 꼬리 셀 무시)"""
+        return self._fit(sheet_values) == self.rows.get(oid)
+
+
+# ======================================================================================
+# ✅ 색인 + 주문 시트 쓰기 경로
+# ======================================================================================
+class OrderStore:
+    """
+    워커 단위 주문 색인 보관 + 색인을 함께 갱신하는 쓰기 연산
+    - 다른 스프레드시트로 교체되었거나 hard TTL 이 지나면 요청 스레드에서 다시 구축
+    - soft TTL ~ hard TTL → 기존 색인 사용 + 백그라운드 재구축
+      (재구축 중 색인 쓰기가 있었으면 결과 폐기 — 색인에 반영된 쓰기를 잃지 않도록)
+    - 다시 읽다가 429/5xx → 기존 색인 유지
+    - hard TTL 전에는 수정 표시(probe)가 구축 때와 같으면 재구축 대신 확인 시각만 갱신
+    - 잠금은 색인 자료구조만 보호 (시트 호출은 잠금 밖, 동시 재구축은 single-flight 로 1회)
+      · 시트에 쓰는 동안 색인이 교체됐으면 쓰기를 반영하지 않고 색인 폐기
+    """
+
+    def __init__(self, ttl: Optional[float] = None, hard_ttl: Optional[float] = None,
+                 clock=time.monotonic, scheduler=None, probe=default_probe):
+        policy = SHEET_POLICIES[ORDER_SHEET]
+        self.ttl = policy.soft_ttl if ttl is None else ttl
+        self.hard_ttl = max(self.ttl, policy.hard_ttl if hard_ttl is None else hard_ttl)
+        self.clock = clock
+        self._scheduler = scheduler
+        self.probe = probe
+        self._lock = threading.RLock()
+        self._entry: Optional[tuple] = None   # (스프레드시트, 구축 시각, 색인, 확인 시각, 수정 표시)
+        self._writes = 0                      # 색인 변경 횟수 (백그라운드 재구축 충돌 확인용)
+
+    @property
+    def scheduler(self):
+        return self._scheduler or get_refresh_scheduler()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entry = None
+            self._writes += 1
+
+    def _index(self, sheet) -> Tuple[OrderIndex, bool]:
+        """(색인, 이번 호출에서 새로 구축했는지)"""
+        scheduler = self.scheduler
+        scheduler.touch(ORDER_SHEET)
+        with self._lock:
+            entry, writes = self._entry, self._writes
+        current = entry if entry is not None and entry[0] is _source(sheet) else None
+        marker = NOT_PROBED
+        if current is not None:
+            now = self.clock()
+            if now - current[3] < self.ttl:
+                cache_event("order_index", hit=True)
+                return current[2], False
+            if now - current[1] < self.hard_ttl:
+                if scheduler.enabled:
+                    cache_event("order_index", hit=True)
+                    scheduler.submit(ORDER_SHEET, lambda: self.rebuild(sheet, writes))
+                    return current[2], False
+                unchanged, marker = self._unchanged(sheet, current)
+                if unchanged:
+                    cache_event("order_index", hit=True)
+                    return current[2], False
+
+        cache_event("order_index", hit=False)
+        return self._build(sheet, current, writes, marker)
+
+    def _build(self, sheet, current: Optional[tuple], writes: int, marker=NOT_PROBED) -> Tuple[OrderIndex, bool]:
+        """
+        시트 전체를 다시 읽어 색인 구축 (잠금 밖, 같은 시점의 동시 구축은 1회) → (색인, 새로 구축했는지)
+        - 읽는 동안 색인 쓰기가 있었으면 이번 호출에만 쓰고 보관하지 않음 (다음 조회 때 다시 구축)
+        """
+        def load():
+            nonlocal marker
+            if marker is NOT_PROBED:
+                marker = self._probe(sheet) if current is not None else None   # 첫 구축은 확인 생략
+            try:
+                index = OrderIndex(sheet.get_all_values())
+            except Exception as e:
+                if current is not None and is_transient_error(e):
+                    logger.warning("[order_index] 다시 읽기 실패 → 기존 색인 사용: %s", e)
+                    return current[2], False
+                raise
+            with self._lock:
+                if self._writes == writes:
+                    self._store(sheet, index, marker)
+            return index, True
+
+        return sheet_flight.do((ORDER_SHEET, id(_source(sheet)), writes), load)
+
+    def _refresh(self, sheet) -> Tuple[OrderIndex, bool]:
+        """TTL 과 상관없이 다시 구축 (보관 중인 색인의 수정 표시는 새 구축에 이어서 기록)"""
+        with self._lock:
+            entry, writes = self._entry, self._writes
+        current = entry if entry is not None and entry[0] is _source(sheet) else None
+        cache_event("order_index", hit=False)
+        return self._build(sheet, current, writes)
+
+    def _store(self, sheet, index: OrderIndex, marker: Optional[str]) -> None:
+        now = self.clock()
+        self._entry = (_source(sheet), now, index, now, marker)
+        self.scheduler.watch(ORDER_SHEET, self.age, lambda: self.rebuild(sheet), self.ttl)
+
+    def _probe(self, sheet) -> Optional[str]:
+        return self.probe(_source(sheet)) if self.probe is not None else None
+
+    def _unchanged(self, sheet, entry: tuple) -> Tuple[bool, Optional[str]]:
+        """(구축 이후 스프레드시트 변경 없음 여부, 이번 수정 표시) — 변경 없으면 확인 시각 갱신"""
+        marker = self._probe(sheet)
+        unchanged = marker is not None and marker == entry[4]
+        cache_event("sheet_probe", hit=unchanged)
+        if unchanged:
+            with self._lock:
+                if self._entry is entry:
+                    self._entry = entry[:3] + (self.clock(), marker)
+        return unchanged, marker
+
+    def age(self) -> Optional[float]:
+        """마지막 구축/변경 확인 후 경과 초"""
+        entry = self._entry
+        return None if entry is None else self.clock() - entry[3]
+
+    def rebuild(self, sheet, writes: Optional[int] = None) -> bool:
+        """
+        백그라운드 재구축 (시트 읽기는 잠금 밖에서) → 교체 여부
+        - writes: 예약 시점의 색인 변경 횟수 (그 뒤로 색인 쓰기가 있었으면 결과 폐기)
+        """
+        with self._lock:
+            writes = self._writes if writes is None else writes
+            entry = self._entry
+        if entry is not None and entry[0] is not _source(sheet):
+            return False
+        marker = None
+        if entry is not None and self.clock() - entry[1] < self.hard_ttl:
+            unchanged, marker = self._unchanged(sheet, entry)
+            if unchanged:
+                return False
+        index = OrderIndex(sheet.get_all_values())
+        with self._lock:
+            if self._writes != writes:
+                return False
+            self._store(sheet, index, marker)
+            return True
+
+    def index(self, sheet) -> OrderIndex:
+        return self._index(sheet)[0]
+
+    # --------------------------------------------------
+    # 조회
+    # --------------------------------------------------
+    def find(self, sheet, criteria: Dict[str, Any]) -> List[Dict[str, str]]:
+        """조건 교집합에 맞는 주문 (시트 순서)"""
+        index = self.index(sheet)
+        with self._lock:
+            return [index.record(oid) for oid in index.find(criteria)]
+
+    def find_any(self, sheet, *criteria: Dict[str, Any]) -> List[Dict[str, str]]:
+        """조건 묶음 중 하나라도 맞는 주문 (합집합, 시트 순서)"""
+        index = self.index(sheet)
+        with self._lock:
+            ids: Set[int] = set()
+            for c in criteria:
+                if any(_norm(v) for v in c.values()):
+                    ids.update(index.find(c))
+            return [index.record(oid) for oid in sorted(ids)]
+
+    def locate(self, sheet, criteria: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+        """
+        조건에 맞는 첫 주문 → (id, 행 번호)
+        - 대상 행을 시트에서 1줄 다시 읽어 확인, 다르면 색인 재구축 후 1회 재시도
+        - 색인에 없을 때는 (다른 워커가 방금 저장했을 수 있으므로) 수정 표시를 확인해
+          구축 이후 바뀌었을 때만 새 색인으로 1회 재확인
+        """
+        index, built = self._index(sheet)
+        for _ in range(2):
+            with self._lock:
+                oid = index.first(criteria)
+                row = None if oid is None else index.row_number(oid)
+            if oid is not None:
+                values = sheet.row_values(row)
+                with self._lock:
+                    if index.matches_sheet_row(oid, values):
+                        return oid, row
+            elif built or self._still_current(sheet, index):
+                return None
+            index, built = self._refresh(sheet)
+        return None
+
+    def _still_current(self, sheet, index: OrderIndex) -> bool:
+        """보관 중인 색인이 index 이고 구축 이후 스프레드시트 변경이 없는지 (수정 표시 확인)"""
+        with self._lock:
+            entry = self._entry
+        if entry is None or entry[2] is not index or entry[0] is not _source(sheet):
+            return False
+        return self._unchanged(sheet, entry)[0]
+
+    # --------------------------------------------------
+    # 쓰기 (시트 반영 후 색인 갱신)
+    # - append/insert 는 호출자가 시트에 쓴 뒤 notify_* 로 알림
+    # --------------------------------------------------
+    def notify_append(self, sheet, values: List[Any]) -> None:
+        """시트 맨 아래에 추가된 행을 색인에 반영 (시트 쓰기는 호출자가 이미 수행)"""
+        self._apply(sheet, lambda index: index.append(values))
+
+    def notify_insert_top(self, sheet, values: List[Any]) -> None:
+        """시트 2행에 삽입된 행을 색인에 반영"""
+        self._apply(sheet, lambda index: index.insert_top(values))
+
+    def update(self, sheet, oid: int, row: int, changes: Dict[str, Any], writer) -> None:
+        """writer(row, col, value) 로 셀 반영 후 색인 갱신"""
+        index = self.index(sheet)
+        applied = {field: value for field, value in changes.items() if field in index.col}
+
+        def write():
+            for field, value in applied.items():
+                writer(row, index.col[field] + 1, value)
+
+        self._write(sheet, write, lambda current: current.update(oid, applied), index)
+
+    def delete(self, sheet, oid: int, row: int) -> None:
+        def write():
+            with writing(sheet.title):
+                sheet.delete_rows(row)
+
+        self._write(sheet, write, lambda index: index.remove(oid))
+
+    def delete_row(self, sheet, row: int) -> None:
+        """행 번호로 삭제 (색인에 없는 행이면 색인 폐기)"""
+        def write():
+            with writing(sheet.title):
+                sheet.delete_rows(row)
+
+        def change(index: OrderIndex):
+            oid = index.id_at(row)
+            if oid is None:
+                self.invalidate()
+            else:
+                index.remove(oid)
+
+        self._write(sheet, write, change)
+
+    def _write(self, sheet, write, change, index: Optional[OrderIndex] = None) -> None:
+        """
+        write() 로 시트에 쓰고 (잠금 밖) change(색인) 로 반영
+        - 쓰는 동안 색인이 교체/폐기됐거나 index 가 보관 중인 색인이 아니면 → 반영 대신 색인 폐기
+        """
+        with self._lock:
+            self._writes += 1   # 진행 중인 재구축 결과는 버림
+            entry = self._entry
+        write()
+        with self._lock:
+            self._writes += 1
+            if self._entry is not entry:
+                self._entry = None
+            elif entry is not None and entry[0] is _source(sheet):
+                if index is None or entry[2] is index:
+                    change(entry[2])
+                else:
+                    self._entry = None
+
+    def notify_cells(self, sheet, cells: Dict[Tuple[int, int], Any]) -> None:
+        """{(행, 열): 값} 셀 쓰기를 색인에 반영 (시트 쓰기는 호출자가 이미 수행, 색인에 없는 행이면 폐기)"""
+        with self._lock:
+            self._writes += 1
+            entry = self._entry
+            if entry is None or entry[0] is not _source(sheet):
+                return
+            index = entry[2]
+            changes: Dict[int, Dict[str, Any]] = {}
+            for (row, col), value in cells.items():
+                oid = index.id_at(row)
+                if oid is None:
+                    self.invalidate()
+                    return
+                if col - 1 < len(index.header):
+                    changes.setdefault(oid, {})[index.header[col - 1]] = value
+            for oid, applied in changes.items():
+                index.update(oid, applied)
+
+    def notify_delete_rows(self, sheet, start: int, end: int) -> None:
+        """시트에서 삭제된 연속 구간(start~end)을 색인에 반영"""
+        with self._lock:
+            self._writes += 1
+            entry = self._entry
+            if entry is None or entry[0] is not _source(sheet):
+                return
+            oids = [entry[2].id_at(row) for row in range(start, end + 1)]
+            if None in oids:
+                self.invalidate()
+                return
+            for oid in oids:
+                entry[2].remove(oid)
+
+    def _apply(self, sheet, change) -> None:
+        with self._lock:
+            self._writes += 1
+            entry = self._entry
+            if entry is None or entry[0] is not _source(sheet):
+                return   # 아직 색인 없음 → 다음 조회 때 구축
+            change(entry[2])
+
+
+order_store = OrderStore()
@@ -0,0 +1,133 @@
+"""
+utils/pagination.py
+검색 결과 커서 페이지네이션
+- 정렬 키(keyset) 기반: 마지막 항목의 정렬 키를 커서에 담고, 다음 페이지는 그 키 "이후" 항목부터
+  · 회원: (회원명, 회원번호) 오름차순 + 정렬된 목록 안의 위치 (positioned: 동명이인/빈 회원번호 동률 구분)
+  · 일지/이미지메모: 행 위치 최신순 — 시트 맨 아래부터 센 번호 (2행 삽입에도 변하지 않음)
+- 커서는 불투명 문자열 (base64url JSON), 다른 검색 조건에 재사용하면 InvalidCursor
+- paginate() 는 limit + 1 개까지만 소비 → 나머지 행은 dict 변환/직렬화하지 않음
+"""
+
+import base64
+import hashlib
+import json
+import os
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+
+DEFAULT_PAGE_SIZE = int(os.getenv("PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("PAGE_SIZE_MAX", "500"))
+
+
+class InvalidCursor(ValueError):
+    """형식이 잘못됐거나 다른 검색 조건에서 발급된 커서"""
+
+
+# ======================================================================================
+# ✅ 커서 인코딩
+# ======================================================================================
+def query_scope(*parts: Any) -> str:
+    """검색 조건 → 짧은 지문 (커서가 같은 조건에서만 쓰이도록)"""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def encode_cursor(scope: str, position: Any) -> str:
+    raw = json.dumps({"s": scope, "p": position}, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: Optional[str], scope: str) -> Any:
+    """커서 → 마지막 정렬 키 (커서 없음 → None)"""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursor("잘못된 cursor 입니다.") from e
+    if not isinstance(data, dict) or data.get("s") != scope:
+        raise InvalidCursor("cursor 가 현재 검색 조건과 맞지 않습니다.")
+    return data.get("p")
+
+
+# ======================================================================================
+# ✅ 페이지 자르기
+# ======================================================================================
+def paginate(items: Iterable[Any], key: Callable[[Any], tuple], limit: int,
+             after: Optional[list] = None, descending: bool = False) -> Tuple[List[Any], Optional[list], bool]:
+    """
+    정렬된 items → (페이지, 마지막 키, 다음 페이지 존재 여부)
+    - items 는 key 순서(descending 이면 내림차순)로 나열돼 있어야 함 (generator 가능)
+    - after: 이전 페이지의 마지막 키 → 그 키 이후 항목부터
+    """
+    page: List[Any] = []
+    last_key: Optional[list] = None
+    for item in items:
+        k = list(key(item))
+        if after is not None and ((k >= after) if descending else (k <= after)):
+            continue
+        if len(page) >= limit:
+            return page, last_key, True
+        page.append(item)
+        last_key = k
+    return page, last_key, False
+
+
+def page_info(scope: str, last_key: Optional[list], has_more: bool) -> dict:
+    """응답에 붙일 페이지 정보"""
+    return {
+        "has_more": has_more,
+        "next_cursor": encode_cursor(scope, last_key) if has_more else None,
+    }
+
+
+def clamp_limit(value: Any, default: int = DEFAULT_PAGE_SIZE) -> int:
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def request_value(name: str, extra: Optional[dict] = None) -> Any:
+    """
+    요청 파라미터 조회 (페이지/필드 선택 등 검색 옵션 공통)
+    - 우선순위: extra > g.query(dict) > g.query["query"](dict) > 쿼리스트링
+    """
+    from flask import g, has_request_context, request
+
+    sources = [extra] if extra else []
+    if has_request_context():
+        q = getattr(g, "query", None)
+        if isinstance(q, dict):
+            sources.append(q)
+            if isinstance(q.get("query"), dict):
+                sources.append(q["query"])
+        sources.append(request.args)
+
+    for src in sources:
+        value = src.get(name)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def page_params(default_limit: int = DEFAULT_PAGE_SIZE) -> Tuple[int, Optional[str]]:
+    """요청에서 (limit, cursor) 추출"""
+    return clamp_limit(request_value("limit"), default_limit), request_value("cursor")
+
+
+# ======================================================================================
+# ✅ 자주 쓰는 정렬 키
+# ======================================================================================
+def member_key(row: dict) -> tuple:
+    return (str(row.get("회원명", "")).strip(), str(row.get("회원번호", "")).strip())
+
+
+def positioned(key: Callable[[Any], tuple]) -> Callable[[Tuple[int, Any]], tuple]:
+    """
+    enumerate(정렬된 목록) 용 키: key + 위치
+    - key 가 같은 항목이 여럿이어도 커서 키가 유일 → "after" 건너뛰기에서 동률 항목이 빠지지 않음
+    """
+    return lambda item: tuple(key(item[1])) + (item[0],)
@@ -0,0 +1,64 @@
+"""
+utils/projection.py
+회원 검색 응답 필드 선택 (fields= 파라미터)
+- fields="회원명,회원번호,휴대폰번호" 또는 ["회원명", ...] → 지정한 필드만 응답
+- 프리셋: "brief" = 회원명/회원번호/휴대폰번호
+- "display" 를 포함해야 한 줄 요약(display) 문자열을 만듦 (fields 미지정 시에는 기존처럼 항상)
+- 필드 조합별 getter 는 한 번만 만들어 재사용 (lru_cache)
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+
+from utils.pagination import request_value
+
+
+DISPLAY_FIELD = "display"
+FIELD_PRESETS = {
+    "brief": ("회원명", "회원번호", "휴대폰번호"),
+}
+
+
+class Projection(NamedTuple):
+    fields: Optional[Tuple[str, ...]]   # None → 전체 필드
+    display: bool                       # display 문자열 생성 여부
+
+    @property
+    def full(self) -> bool:
+        return self.fields is None
+
+
+FULL = Projection(None, True)
+
+
+def parse_fields(value: Any) -> Projection:
+    """fields 파라미터 값 → Projection (없거나 "*"/"all" → 전체 필드)"""
+    if value in (None, "", "*", "all"):
+        return FULL
+    names = value.split(",") if isinstance(value, str) else list(value)
+
+    fields, display = [], False
+    for name in (str(n).strip() for n in names):
+        if not name:
+            continue
+        if name == DISPLAY_FIELD:
+            display = True
+        elif name in FIELD_PRESETS:
+            fields.extend(f for f in FIELD_PRESETS[name] if f not in fields)
+        elif name not in fields:
+            fields.append(name)
+    return Projection(tuple(fields), display)
+
+
+def fields_param(extra: Optional[dict] = None) -> Projection:
+    """요청의 fields 파라미터 → Projection"""
+    return parse_fields(request_value("fields", extra))
+
+
+@lru_cache(maxsize=64)
+def compile_projection(fields: Tuple[str, ...]) -> Callable[[dict], dict]:
+    """필드 목록 → row(dict) 에서 해당 필드만 꺼내는 getter (요청한 순서 유지)"""
+    def project(row: dict) -> dict:
+        get = row.get
+        return {f: get(f, "") for f in fields}
+    return project
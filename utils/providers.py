@@ -0,0 +1,126 @@
+"""
+utils/providers.py
+외부 연결 지연 생성(lazy provider)
+- OpenAI 클라이언트 / gspread 클라이언트 / 스프레드시트 / Drive 서비스 / HTTP 세션
+- import 시점에는 아무 연결도 만들지 않고, 처음 호출될 때 한 번 생성 후 재사용
+- gunicorn 워커 fork 이후 각 워커가 필요할 때만 연결
+"""
+
+import os
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict
+
+
+_instances: Dict[str, Any] = {}
+_lock = threading.RLock()
+
+
+def provider(name: str) -> Callable:
+    """
+    팩토리 함수를 1회 생성 provider 로 감싸는 데코레이터
+    - 첫 호출: 팩토리 실행 후 보관
+    - 이후 호출: 보관된 인스턴스 반환
+    - 팩토리에서 예외가 나면 보관하지 않음 (다음 호출 때 재시도)
+    """
+    def decorator(factory: Callable[[], Any]) -> Callable[[], Any]:
+        @wraps(factory)
+        def get() -> Any:
+            if name in _instances:
+                return _instances[name]
+            with _lock:
+                if name not in _instances:
+                    _instances[name] = factory()
+                return _instances[name]
+
+        get.provider_name = name
+        return get
+    return decorator
+
+
+def reset_providers(*names: str) -> None:
+    """보관된 인스턴스 제거 (인자 없으면 전체) → 다음 호출 때 새로 생성"""
+    with _lock:
+        if not names:
+            _instances.clear()
+        for name in names:
+            _instances.pop(name, None)
+
+
+def is_initialized(name: str) -> bool:
+    return name in _instances
+
+
+# ======================================================================================
+# ✅ 기본 provider
+# ======================================================================================
+@provider("openai")
+def get_openai_client():
+    """OpenAI SDK 클라이언트 (요청 단위 계측 transport 사용)"""
+    from openai import DefaultHttpxClient, OpenAI
+    from utils.instrument import make_instrumented_transport
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"),
+                  http_client=DefaultHttpxClient(transport=make_instrumented_transport()))
+
+
+@provider("gspread")
+def get_gspread_client_cached():
+    """인증된 gspread 클라이언트 (서비스 계정)"""
+    from utils.sheets import get_gspread_client
+    return get_gspread_client()
+
+
+@provider("spreadsheet")
+def get_spreadsheet_cached():
+    """GOOGLE_SHEET_KEY(우선) 또는 GOOGLE_SHEET_TITLE 로 연 스프레드시트"""
+    client = get_gspread_client_cached()
+    sheet_key = os.getenv("GOOGLE_SHEET_KEY")
+    sheet_title = os.getenv("GOOGLE_SHEET_TITLE")
+
+    if sheet_key:
+        return client.open_by_key(sheet_key)
+    elif sheet_title:
+        return client.open(sheet_title)
+    else:
+        raise EnvironmentError("❌ GOOGLE_SHEET_KEY 또는 GOOGLE_SHEET_TITLE 필요")
+
+
+@provider("fake_spreadsheet")
+def get_fake_spreadsheet():
+    """
+    SHEETS_BACKEND=fake 일 때 사용하는 메모리 내 스프레드시트
+    - FAKE_SHEETS_ROWS: 시트별 합성 행 수 (기본 1000)
+    - FAKE_SHEETS_LATENCY_MS: 호출당 지연 (기본 0)
+    """
+    from utils.fake_gspread import FakeBackendConfig, build_synthetic_spreadsheet
+
+    latency = float(os.getenv("FAKE_SHEETS_LATENCY_MS", "0")) / 1000
+    config = FakeBackendConfig(read_latency=latency, write_latency=latency)
+    return build_synthetic_spreadsheet(int(os.getenv("FAKE_SHEETS_ROWS", "1000")), config=config)
+
+
+@provider("drive_user")
+def get_drive_service():
+    """이미지 업로드용 Drive v3 서비스 (OAuth 사용자 계정)"""
+    from routes.routes_image import get_drive_service_user
+    return get_drive_service_user()
+
+
+@provider("http")
+def get_http_session():
+    """
+    외부 API 호출용 requests.Session
+    - 커넥션 풀 재사용 (매 요청마다 TCP/TLS 핸드셰이크 방지)
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=int(os.getenv("HTTP_POOL_SIZE", "10")))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    # ✅ 요청 단위 계측 (utils.instrument)
+    from utils.instrument import requests_response_hook
+    session.hooks["response"].append(requests_response_hook)
+    return session
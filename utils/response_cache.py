@@ -0,0 +1,245 @@
+"""
+utils/response_cache.py
+읽기 intent 응답 캐시 + ETag / If-None-Match (304)
+- 키: 라우트 + 정규화한 요청 본문/쿼리스트링 (→ intent 와 query 가 같으면 같은 키)
+- 저장 대상: READ_INTENTS 로 처리된 200 JSON 응답 (intent 는 utils.instrument 태그)
+- 유효성: 응답을 만들 때 읽은 워크시트들의 데이터 버전이 그대로일 때만 재사용
+  · Sheets 쓰기 호출이 관측되면 그 시트 버전 증가 (대상 시트를 알 수 없는 쓰기만 전체 세대 증가)
+  · 일지 write-behind 저장은 해당 시트 버전 증가
+  · 다른 워커/시트 직접 편집은 감지할 수 없으므로 RESPONSE_CACHE_TTL(기본 30초)로 상한
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from utils import instrument
+from utils.metrics import cache_event
+
+
+READ_INTENTS = {
+    "search_member", "search_by_code_logic",
+    "memo_search", "search_memo", "search_memo_from_text",
+    "search_image",
+}
+
+DEFAULT_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+DEFAULT_MAXSIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+
+
+# ======================================================================================
+# ✅ 시트 데이터 버전
+# ======================================================================================
+class DataVersions:
+    """
+    워크시트별 데이터 버전
+    - bump(name): 해당 시트 버전 +1
+    - bump(): 어느 시트인지 모르는 쓰기 → 전체 세대(generation) +1
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+        self.generation = 0
+
+    def bump(self, sheet_name: Optional[str] = None) -> None:
+        with self._lock:
+            if sheet_name:
+                self._versions[sheet_name] = self._versions.get(sheet_name, 0) + 1
+            else:
+                self.generation += 1
+
+    def snapshot(self) -> Tuple[int, Dict[str, int]]:
+        with self._lock:
+            return self.generation, dict(self._versions)
+
+    def token(self, sheets: Iterable[str], snapshot: Optional[Tuple[int, Dict[str, int]]] = None) -> tuple:
+        generation, versions = snapshot or self.snapshot()
+        return (generation,) + tuple((s, versions.get(s, 0)) for s in sorted(sheets))
+
+
+data_versions = DataVersions()
+
+
+def bump_sheet(sheet_name: Optional[str] = None) -> None:
+    data_versions.bump(sheet_name)
+
+
+def _on_external(kind: str, op: str, duration: float, nbytes: int = 0, error: Optional[str] = None) -> None:
+    # 실패한 호출도 일부 반영됐을 수 있으므로 쓰기 시도면 무조건 무효화
+    # (대상 시트: A1 범위 / writing() 블록 → 그 시트만, 모르면 전체 세대)
+    if kind == "sheets" and instrument.op_type(kind, op) == "write":
+        data_versions.bump(instrument.written_sheet())
+
+
+instrument.add_listener(_on_external)
+
+
+# ======================================================================================
+# ✅ 응답 보관소
+# ======================================================================================
+class CachedResponse:
+    __slots__ = ("body", "etag", "token", "sheets", "handle", "expires_at")
+
+    def __init__(self, body: bytes, etag: str, token: tuple, sheets: tuple,
+                 handle: Optional[str], expires_at: float):
+        self.body = body
+        self.etag = etag
+        self.token = token
+        self.sheets = sheets
+        self.handle = handle
+        self.expires_at = expires_at
+
+
+class ResponseCache:
+    """키 → CachedResponse (TTL + LRU, 조회 시 시트 버전 확인)"""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, ttl: float = DEFAULT_TTL,
+                 versions: DataVersions = data_versions, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.versions = versions
+        self.clock = clock
+        self._items: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= self.clock() or entry.token != self.versions.token(entry.sheets):
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return entry
+
+    def put(self, key: str, body: bytes, sheets: Iterable[str], snapshot: Tuple[int, Dict[str, int]],
+            handle: Optional[str] = None) -> CachedResponse:
+        sheets = tuple(sorted(sheets))
+        entry = CachedResponse(body, make_etag(body), self.versions.token(sheets, snapshot), sheets,
+                               handle, self.clock() + self.ttl)
+        with self._lock:
+            self._items[key] = entry
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+response_cache = ResponseCache()
+
+
+# ======================================================================================
+# ✅ 키 / ETag
+# ======================================================================================
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def make_key(path: str, payload: Any = None, args: Optional[Dict[str, Any]] = None) -> str:
+    """라우트 + 정규화한 본문/쿼리스트링 → 캐시 키"""
+    raw = json.dumps([path, _normalize(payload), _normalize(args or {})],
+                     ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def make_etag(body: bytes) -> str:
+    return hashlib.sha1(body).hexdigest()[:20]
+
+
+# ======================================================================================
+# ✅ Flask 연결
+# ======================================================================================
+def init_response_cache(app, cache: ResponseCache = response_cache) -> None:
+    """
+    Flask 앱에 응답 캐시 hook 등록
+    - init_instrumentation() 이후에 호출 (intent 태그 / 읽은 시트 정보 사용)
+    - before_request: 유효한 캐시가 있으면 라우트 실행 없이 응답 (If-None-Match 일치 → 304)
+    - after_request: 읽기 intent 의 200 JSON 응답 저장 + ETag 부여
+    """
+    from flask import Response, g, request, session
+
+    def _request_key() -> Optional[str]:
+        if request.method not in ("GET", "POST") or request.files:
+            return None
+        if request.mimetype and request.mimetype.startswith("multipart/"):
+            return None
+        payload = request.get_json(silent=True) if request.is_json else request.get_data(as_text=True) or None
+        return make_key(request.path, payload, request.args.to_dict(flat=False))
+
+    def _respond(entry: CachedResponse, source: str = "hit"):
+        if request.if_none_match.contains_weak(entry.etag):
+            response = Response(status=304)
+        else:
+            response = Response(entry.body, status=200, mimetype="application/json")
+        response.set_etag(entry.etag)
+        response.headers["Cache-Control"] = "no-cache"
+        response.headers["X-Response-Cache"] = source
+        return response
+
+    @app.before_request
+    def _response_cache_lookup():
+        if cache.ttl <= 0:
+            return None
+        key = _request_key()
+        if key is None:
+            return None
+        g.response_cache_key = key
+        g.response_cache_snapshot = cache.versions.snapshot()
+
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        cache_event("response", hit=True)
+        g.response_cache_hit = True
+        if entry.handle:
+            # search_member 결과 handle → 세션 복원 (routes_member.member_select 가 사용)
+            try:
+                session["last_search_handle"] = entry.handle
+            except RuntimeError:
+                # secret_key 미설정 → 본문의 handle 만 사용
+                pass
+        return _respond(entry)
+
+    @app.after_request
+    def _response_cache_store(response):
+        key = g.pop("response_cache_key", None)
+        snapshot = g.pop("response_cache_snapshot", None)
+        if key is None or g.pop("response_cache_hit", False):
+            return response
+
+        stats = instrument.current()
+        if (stats is None or stats.tags.get("intent") not in READ_INTENTS or not stats.sheets
+                or response.status_code != 200 or not response.is_json or response.direct_passthrough):
+            return response
+
+        body = response.get_data()
+        payload = response.get_json(silent=True)
+        handle = payload.get("handle") if isinstance(payload, dict) else None
+        entry = cache.put(key, body, stats.sheets, snapshot, handle)
+        cache_event("response", hit=False)
+
+        response.set_etag(entry.etag)
+        response.headers["Cache-Control"] = "no-cache"
+        response.headers["X-Response-Cache"] = "miss"
+        if request.if_none_match.contains_weak(entry.etag):
+            return _respond(entry, "miss")
+        return response
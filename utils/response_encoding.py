@@ -0,0 +1,139 @@
+"""
+utils/response_encoding.py
+응답 직렬화 / 압축
+- FastJSONProvider: orjson 이 있으면 orjson, 없으면 표준 json (Flask app.json 교체)
+  · 한글 그대로 출력 (ensure_ascii=False), 키 정렬 안 함 → sort_fields_by_field_map 의 OrderedDict 순서 유지
+  · date / Decimal / UUID / dataclass 처리는 Flask 기본과 동일, dict 가 아닌 Mapping 은 dict 로 변환 (숨김 ID 열 제외)
+- 압축: Accept-Encoding 협상 (br → gzip), COMPRESS_MIN_BYTES 이상 응답만
+  · brotli 모듈은 선택 설치 (없으면 gzip 만)
+"""
+
+import gzip
+import os
+from collections.abc import Mapping
+from typing import Any, Optional
+
+from flask.json.provider import DefaultJSONProvider, _default as _flask_default
+
+from utils.row_ids import without_row_id
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 선택 의존성
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+COMPRESSIBLE_MIMETYPES = {"application/json", "text/plain", "text/html"}
+
+
+# ======================================================================================
+# ✅ JSON 직렬화
+# ======================================================================================
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    jsonify / dict 반환 응답 직렬화
+    - orjson 미지원 값(64bit 초과 정수 등)이나 indent 외 옵션이 오면 표준 json 으로 처리
+    """
+
+    ensure_ascii = False
+    sort_keys = False
+
+    @staticmethod
+    def default(o: Any) -> Any:
+        # dict 가 아닌 Mapping (캐시의 MemberRow 등) 은 응답 경계에서 dict 로 (숨김 ID 열 제외)
+        if isinstance(o, Mapping):
+            return without_row_id(o)
+        return _flask_default(o)
+
+    if orjson is not None:
+        _OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                    | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+
+    def _orjson_bytes(self, obj: Any, indent: bool = False) -> Optional[bytes]:
+        if orjson is None:
+            return None
+        option = self._OPTIONS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=self.default, option=option)
+        except (orjson.JSONEncodeError, TypeError):
+            return None
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is not None and set(kwargs) <= {"indent", "separators"}:
+            body = self._orjson_bytes(obj, indent=bool(kwargs.get("indent")))
+            if body is not None:
+                return body.decode("utf-8")
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = self._orjson_bytes(obj, indent=indent)
+        if body is None:
+            return super().response(obj)
+        # str → bytes 재인코딩 없이 그대로 응답 본문으로 사용
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+
+# ======================================================================================
+# ✅ 압축
+# ======================================================================================
+def choose_encoding(accept_encodings) -> Optional[str]:
+    """Accept-Encoding → "br" / "gzip" / None (q=0 은 제외)"""
+    if brotli is not None and accept_encodings["br"] > 0:
+        return "br"
+    if accept_encodings["gzip"] > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str, level: int = COMPRESS_LEVEL) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=min(level, 11))
+    return gzip.compress(body, compresslevel=level)
+
+
+def init_response_encoding(app, min_bytes: Optional[int] = None) -> None:
+    """
+    app.json 을 FastJSONProvider 로 교체 + 압축 after_request 등록
+    - 응답 캐시(init_response_cache)보다 먼저 호출 → 캐시에는 압축 전 본문이 저장됨
+    """
+    from flask import request
+
+    app.json = FastJSONProvider(app)
+    threshold = COMPRESS_MIN_BYTES if min_bytes is None else min_bytes
+
+    @app.after_request
+    def _compress_response(response):
+        if (response.status_code != 200 or response.direct_passthrough
+                or "Content-Encoding" in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        body = response.get_data()
+        if len(body) < threshold:
+            return response
+
+        response.set_data(compress(body, encoding))
+        response.headers["Content-Encoding"] = encoding
+        # 인코딩별로 본문이 달라지므로 ETag 는 약한 비교용으로
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
@@ -0,0 +1,94 @@
+"""
+utils/result_cache.py
+검색 결과 서버측 보관소 (opaque handle → 결과 목록)
+- 응답에는 짧은 handle 만 내려보내고, 결과 행은 서버 메모리에 보관
+- TTL 만료 + LRU(최근 사용 순) 개수 제한
+- member_select / 전체정보 / 번호 선택 시 DB 시트 재조회 없이 결과 복원
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+from utils.metrics import cache_event
+
+
+DEFAULT_TTL = 600          # 초 (10분)
+DEFAULT_MAXSIZE = 256      # 보관할 결과 묶음 수
+
+
+class ResultCache:
+    """
+    handle → (만료시각, 결과) 저장소
+    - put(): 새 handle 발급
+    - get(): 조회 시 만료 확인 + 최근 사용으로 갱신
+    - 용량 초과 시 가장 오래 사용되지 않은 항목부터 제거
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, ttl: float = DEFAULT_TTL, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, results: List[Any]) -> str:
+        handle = secrets.token_urlsafe(12)
+        with self._lock:
+            self._purge_expired()
+            self._items[handle] = (self.clock() + self.ttl, list(results))
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return handle
+
+    def get(self, handle: Optional[str]) -> Optional[List[Any]]:
+        if not handle:
+            return None
+        with self._lock:
+            item = self._items.get(handle)
+            if item is None:
+                cache_event("result_cache", hit=False)
+                return None
+            expires_at, results = item
+            if expires_at <= self.clock():
+                del self._items[handle]
+                cache_event("result_cache", hit=False)
+                return None
+            self._items.move_to_end(handle)
+            cache_event("result_cache", hit=True)
+            return results
+
+    def drop(self, handle: Optional[str]) -> None:
+        with self._lock:
+            self._items.pop(handle, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def _purge_expired(self) -> None:
+        now = self.clock()
+        expired = [h for h, (expires_at, _) in self._items.items() if expires_at <= now]
+        for h in expired:
+            del self._items[h]
+
+
+# =====================================================
+# 전역 보관소 (프로세스 단위)
+# =====================================================
+result_cache = ResultCache()
+
+
+def store_results(results: List[Any]) -> str:
+    """검색 결과 보관 → handle 반환"""
+    return result_cache.put(results)
+
+
+def load_results(handle: Optional[str]) -> Optional[List[Any]]:
+    """handle → 결과 목록 (없거나 만료 → None)"""
+    return result_cache.get(handle)
@@ -0,0 +1,369 @@
+"""
+utils/row_ids.py
+행 ID 열 — 2행 삽입(최신순 저장)에도 바뀌지 않는 행 식별자
+- 관리 시트 맨 오른쪽 숨김 열(ROW_ID_HEADER, 기본 "_id")에 행마다 고유 ID
+  · 열 추가/기존 행 채우기: flask ensure-row-ids (ensure_id_column)
+  · 새 행은 row_id_store.insert_top() / append() 로 쓰면서 ID 기록
+- RowPositions: 시트 순서를 보존하는 정수 위치 ↔ 현재 행 번호 (삽입/삭제 후 산술로 보정)
+- RowIdStore: 시트별 ID 열 → 위치 (워커 단위)
+  · 이 저장소를 거친 삽입/삭제는 ID 열을 다시 읽지 않고 반영
+  · row_of(): 계산한 행을 1줄 읽어 ID 확인 → 다르면(다른 워커/직접 편집) ID 열만 다시 읽고 재시도
+  · ID 열이 없는 시트 → None (호출자는 기존처럼 행을 훑어 찾음)
+- ID 는 내부 위치용 → 응답 경계에서 without_row_id() 로 제외
+"""
+
+import bisect
+import logging
+import os
+import re
+import threading
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import gspread
+
+from utils.instrument import writing
+from utils.metrics import cache_event
+
+logger = logging.getLogger(__name__)
+
+
+ROW_ID_HEADER = os.getenv("ROW_ID_HEADER", "_id")
+MANAGED_SHEETS = ("DB", "제품주문", "상담일지", "개인일지", "활동일지", "이미지메모")
+
+
+def new_row_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def without_row_id(record) -> Dict[str, Any]:
+    """응답용 dict (숨김 ID 열 제외, 키 순서 유지)"""
+    return {k: v for k, v in record.items() if k != ROW_ID_HEADER}
+
+
+def with_row_id(values: Sequence[Any], header: Sequence[Any], row_id: Optional[str]) -> List[Any]:
+    """저장소가 기록한 ID 를 채운 행 값 (색인 알림용, ID 열/ID 가 없으면 그대로)"""
+    header = [str(h).strip() for h in header]
+    values = list(values)
+    if row_id and ROW_ID_HEADER in header:
+        col = header.index(ROW_ID_HEADER)
+        values += [""] * max(0, col + 1 - len(values))
+        values[col] = row_id
+    return values
+
+
+def sheet_source(sheet):
+    """워크시트가 속한 스프레드시트 (gspread Worksheet.spreadsheet, 없으면 워크시트 자신)"""
+    return getattr(sheet, "spreadsheet", None) or sheet
+
+
+# ======================================================================================
+# ✅ 행 위치
+# ======================================================================================
+class RowPositions:
+    """
+    시트 순서대로 증가하는 정수 위치(seq) ↔ 현재 행 번호 (헤더 = 1행)
+    - 2행 삽입 → 맨 앞보다 작은 seq, append → 맨 끝보다 큰 seq
+    - 행 번호 = 2 + (seq - 맨 앞 seq) - (그 사이 삭제된 seq 수)  → 이진 탐색 O(log n)
+    """
+
+    def __init__(self):
+        self.top = 0                   # 가장 위(2행) seq
+        self.bottom = 0                # 다음 append seq
+        self._deleted: List[int] = []  # 삭제된 seq (정렬)
+        self._deleted_set: Set[int] = set()
+
+    def __len__(self) -> int:
+        return self.bottom - self.top - len(self._deleted)
+
+    def insert_top(self) -> int:
+        self.top -= 1
+        return self.top
+
+    def append(self) -> int:
+        seq = self.bottom
+        self.bottom += 1
+        return seq
+
+    def remove(self, seq: int) -> None:
+        bisect.insort(self._deleted, seq)
+        self._deleted_set.add(seq)
+
+    def _rank(self, seq: int) -> int:
+        return (seq - self.top) - bisect.bisect_left(self._deleted, seq)
+
+    def row_number(self, seq: int) -> int:
+        return 2 + self._rank(seq)
+
+    def seq_at(self, row: int) -> Optional[int]:
+        """시트 행 번호 → seq (범위 밖 → None)"""
+        k = row - 2
+        if k < 0 or k >= len(self):
+            return None
+        lo, hi = self.top, self.bottom - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._rank(mid) < k:
+                lo = mid + 1
+            else:
+                hi = mid
+        while lo in self._deleted_set:
+            lo += 1
+        return lo
+
+
+class RowLocator:
+    """
+    ID 열 값 목록(2행부터) → ID ↔ 위치
+    - ID 가 빈 행도 위치는 차지 (행 번호 계산용)
+    """
+
+    def __init__(self, ids: Sequence[Any]):
+        self.positions = RowPositions()
+        self.seqs: Dict[str, int] = {}
+        self.ids: Dict[int, str] = {}
+        for row_id in ids:
+            self._put(self.positions.append(), row_id)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def _put(self, seq: int, row_id: Any) -> None:
+        row_id = str(row_id or "").strip()
+        if row_id:
+            self.seqs[row_id] = seq
+            self.ids[seq] = row_id
+
+    def row_of(self, row_id: str) -> Optional[int]:
+        seq = self.seqs.get(row_id)
+        return None if seq is None else self.positions.row_number(seq)
+
+    def id_at(self, row: int) -> Optional[str]:
+        seq = self.positions.seq_at(row)
+        return None if seq is None else self.ids.get(seq)
+
+    def insert_top(self, row_id: str) -> None:
+        self._put(self.positions.insert_top(), row_id)
+
+    def append(self, row_id: str) -> None:
+        self._put(self.positions.append(), row_id)
+
+    def remove_row(self, row: int) -> None:
+        seq = self.positions.seq_at(row)
+        if seq is None:
+            return
+        self.positions.remove(seq)
+        row_id = self.ids.pop(seq, None)
+        if row_id is not None:
+            self.seqs.pop(row_id, None)
+
+
+# ======================================================================================
+# ✅ ID 열 추가 (일회성)
+# ======================================================================================
+def _column_letter(col: int) -> str:
+    return re.sub(r"\d+$", "", gspread.utils.rowcol_to_a1(1, col))
+
+
+def _hide_column(ws, col: int) -> None:
+    """실제 스프레드시트에서만 열 숨김 (지원하지 않으면 건너뜀)"""
+    batch_update = getattr(sheet_source(ws), "batch_update", None)
+    if batch_update is None:
+        return
+    try:
+        batch_update({"requests": [{"updateDimensionProperties": {
+            "range": {"sheetId": ws.id, "dimension": "COLUMNS", "startIndex": col - 1, "endIndex": col},
+            "properties": {"hiddenByUser": True},
+            "fields": "hiddenByUser",
+        }}]})
+    except Exception as e:
+        logger.warning("[row_ids] %s ID 열 숨기기 실패: %s", ws.title, e)
+
+
+def ensure_id_column(ws, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    시트에 ID 열이 없으면 맨 오른쪽에 추가(숨김)하고, ID 가 빈 행을 채움
+    → {"sheet", "column", "added", "filled", "dry_run"}
+    """
+    header = [str(h).strip() for h in ws.row_values(1)]
+    added = ROW_ID_HEADER not in header
+    col = len(header) + 1 if added else header.index(ROW_ID_HEADER) + 1
+
+    height = len(ws.get_all_values())
+    ids = [] if added else ws.col_values(col)[1:]
+    ids = [str(v).strip() for v in ids] + [""] * (height - 1 - len(ids))
+    filled = sum(1 for v in ids if not v)
+
+    if not dry_run:
+        if added:
+            ws.update_cell(1, col, ROW_ID_HEADER)
+            _hide_column(ws, col)
+        if filled:
+            letter = _column_letter(col)
+            ws.update(f"{letter}2:{letter}{height}", [[v or new_row_id()] for v in ids])
+        row_id_store.invalidate(ws)
+    return {"sheet": ws.title, "column": col, "added": added, "filled": filled, "dry_run": dry_run}
+
+
+# ======================================================================================
+# ✅ ID → 행 번호 저장소
+# ======================================================================================
+class RowIdStore:
+    """
+    시트 이름 → (스프레드시트, ID 열 번호, RowLocator)
+    - ID 열 번호는 헤더 1행으로 확인 (없으면 0 → 이 시트는 ID 미사용)
+      · 다른 워커에서 ID 열을 추가했으면 재시작 또는 invalidate() 후 반영
+    - 삽입/삭제는 이 저장소 메서드로 → 위치 산술 갱신
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Tuple[Any, int, Optional[RowLocator]]] = {}
+
+    def invalidate(self, ws=None) -> None:
+        with self._lock:
+            if ws is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(ws.title, None)
+
+    def _entry(self, ws, header: Optional[Sequence[Any]] = None) -> Tuple[Any, int, Optional[RowLocator]]:
+        entry = self._entries.get(ws.title)
+        if entry is None or entry[0] is not sheet_source(ws):
+            header = [str(h).strip() for h in (header if header is not None else ws.row_values(1))]
+            col = header.index(ROW_ID_HEADER) + 1 if ROW_ID_HEADER in header else 0
+            entry = self._entries[ws.title] = (sheet_source(ws), col, None)
+        return entry
+
+    def id_column(self, ws, header: Optional[Sequence[Any]] = None) -> int:
+        """ID 열 번호 (1부터, 없으면 0)"""
+        with self._lock:
+            return self._entry(ws, header)[1]
+
+    def _locator(self, ws, rebuild: bool = False) -> Optional[RowLocator]:
+        if rebuild:
+            self._entries.pop(ws.title, None)   # 열 이동 대비 헤더도 다시 확인
+        source, col, locator = self._entry(ws)
+        if not col:
+            return None
+        if locator is None:
+            cache_event("row_ids", hit=False)
+            locator = RowLocator(ws.col_values(col)[1:])
+            self._entries[ws.title] = (source, col, locator)
+        else:
+            cache_event("row_ids", hit=True)
+        return locator
+
+    # --------------------------------------------------
+    # 조회
+    # --------------------------------------------------
+    def row_of(self, ws, row_id: Any) -> Optional[int]:
+        """
+        ID → 현재 행 번호 (없으면 None)
+        - 계산한 행을 1줄 읽어 ID 확인, 다르면 ID 열을 다시 읽고 1회 재시도
+        """
+        row_id = str(row_id or "").strip()
+        if not row_id:
+            return None
+        with self._lock:
+            for attempt in range(2):
+                locator = self._locator(ws, rebuild=attempt > 0)
+                if locator is None:
+                    return None
+                row = locator.row_of(row_id)
+                if row is not None:
+                    values = ws.row_values(row)
+                    col = self._entries[ws.title][1]
+                    if len(values) >= col and str(values[col - 1]).strip() == row_id:
+                        return row
+                elif attempt > 0:
+                    return None
+            return None
+
+    # --------------------------------------------------
+    # 쓰기 (시트 반영 + 위치 갱신)
+    # --------------------------------------------------
+    def _with_id(self, ws, values: List[Any], header: Optional[Sequence[Any]]) -> Tuple[List[Any], Optional[str]]:
+        col = self.id_column(ws, header)
+        if not col:
+            return values, None
+        row_id = new_row_id()
+        values = list(values) + [""] * max(0, col - len(values))
+        values[col - 1] = row_id
+        return values, row_id
+
+    def insert_top(self, ws, values: List[Any], header: Optional[Sequence[Any]] = None, **kwargs) -> Optional[str]:
+        """2행에 삽입 (ID 열이 있으면 새 ID 기록) → ID"""
+        with self._lock:
+            values, row_id = self._with_id(ws, values, header)
+            with writing(ws.title):   # 행 삽입은 요청에 시트 이름이 없음 → 이 시트 쓰기로 기록
+                ws.insert_row(values, 2, **kwargs)
+            locator = self._entries[ws.title][2]
+            if locator is not None:
+                locator.insert_top(row_id)
+            return row_id
+
+    def insert_rows_top(self, ws, rows: List[List[Any]], header: Optional[Sequence[Any]] = None,
+                        **kwargs) -> List[Optional[str]]:
+        """여러 행을 2행부터 한 번에 삽입 (rows[0] 이 2행) → ID 목록"""
+        with self._lock:
+            stamped = [self._with_id(ws, values, header) for values in rows]
+            with writing(ws.title):
+                ws.insert_rows([values for values, _ in stamped], row=2, **kwargs)
+            locator = self._entries[ws.title][2]
+            if locator is not None:
+                for _, row_id in reversed(stamped):
+                    locator.insert_top(row_id)
+            return [row_id for _, row_id in stamped]
+
+    def append(self, ws, values: List[Any], header: Optional[Sequence[Any]] = None, **kwargs) -> Optional[str]:
+        """맨 아래에 추가 → ID"""
+        with self._lock:
+            values, row_id = self._with_id(ws, values, header)
+            with writing(ws.title):
+                ws.append_row(values, **kwargs)
+            locator = self._entries[ws.title][2]
+            if locator is not None:
+                locator.append(row_id)
+            return row_id
+
+    def delete_row(self, ws, row: int) -> None:
+        """행 번호로 삭제 후 위치 갱신"""
+        self.delete_rows(ws, row, row)
+
+    def delete_rows(self, ws, start: int, end: int) -> None:
+        """연속 구간(start~end) 1회 삭제 후 위치 갱신"""
+        with self._lock:
+            with writing(ws.title):
+                ws.delete_rows(start, end)
+            entry = self._entries.get(ws.title)
+            if entry is not None and entry[2] is not None and entry[0] is sheet_source(ws):
+                for row in range(end, start - 1, -1):
+                    entry[2].remove_row(row)
+
+    def locate(self, ws, record, match_fields: Sequence[str] = ("회원명", "회원번호")) -> Optional[int]:
+        """
+        캐시된 행(record) → 현재 행 번호
+        - ID 가 있으면 row_of() (전체 재조회 없음)
+        - ID 가 없거나 찾지 못하면 get_all_records 로 match_fields 가 같은 첫 행
+        """
+        row = self.row_of(ws, record.get(ROW_ID_HEADER)) if self.id_column(ws) else None
+        if row is not None:
+            return row
+        want = [str(record.get(f, "")).strip() for f in match_fields]
+        for i, r in enumerate(ws.get_all_records(), start=2):
+            if [str(r.get(f, "")).strip() for f in match_fields] == want:
+                return i
+        return None
+
+    def delete(self, ws, row_id: Any) -> bool:
+        """ID 로 삭제 → 삭제 여부"""
+        with self._lock:
+            row = self.row_of(ws, row_id)
+            if row is None:
+                return False
+            self.delete_row(ws, row)
+            return True
+
+
+row_id_store = RowIdStore()
@@ -0,0 +1,397 @@
+"""
+utils/sheet_refresh.py
+자주 읽는 시트 스냅샷 stale-while-revalidate + 백그라운드 갱신
+- 시트별 soft/hard TTL (SheetPolicy)
+  · soft 이내 → 캐시 그대로
+  · soft ~ hard → 캐시(이전 스냅샷)를 바로 응답하고 백그라운드에서 다시 읽음
+  · hard 초과 / 시트 쓰기 관측(데이터 버전 변경) → 요청 스레드에서 다시 읽음
+- 다시 읽다가 429/5xx → 이전 스냅샷 유지 (쓰기 이후가 아니면 그대로 응답)
+- RefreshScheduler: 최근 조회된 hot 시트(DB/제품주문/상담일지)는 soft 만료 전에 미리 갱신
+- SHEET_REFRESH=0 → 백그라운드 갱신 끔 (soft 만료 = 요청 스레드에서 다시 읽음)
+- soft 만료 시 먼저 변경 확인(Drive modifiedTime, 요청 1건) → 바뀌지 않았으면 전체 다시 읽기 생략
+  · hard 만료 때는 확인 결과와 관계없이 전체 다시 읽음 (modifiedTime 반영 지연 대비)
+  · SHEET_CHANGE_PROBE=0 → 변경 확인 없이 항상 전체 다시 읽기
+- 같은 시트의 부분 읽기(열 선택 등)는 "시트#부분" 이름으로 따로 보관 (정책/데이터 버전은 시트 기준)
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from utils.metrics import cache_event
+from utils.providers import provider
+from utils.response_cache import data_versions
+from utils.single_flight import sheet_flight
+
+logger = logging.getLogger(__name__)
+
+
+class SheetPolicy(NamedTuple):
+    soft_ttl: float   # 이 시간까지는 캐시 그대로
+    hard_ttl: float   # 이 시간까지는 이전 스냅샷 응답 + 백그라운드 갱신
+
+
+def _policy(env_prefix: str, soft: float, hard: float) -> SheetPolicy:
+    soft = float(os.getenv(f"{env_prefix}_TTL", soft))
+    hard = float(os.getenv(f"{env_prefix}_HARD_TTL", hard))
+    return SheetPolicy(soft, max(soft, hard))
+
+
+SHEET_POLICIES: Dict[str, SheetPolicy] = {
+    "DB": _policy("MEMBER_CACHE", 30, 300),
+    "제품주문": _policy("ORDER_INDEX", 300, 1800),
+    "상담일지": _policy("JOURNAL_CACHE", 30, 300),
+}
+HOT_SHEETS = ("DB", "제품주문", "상담일지")
+HOT_WINDOW = float(os.getenv("SHEET_HOT_WINDOW", "300"))         # 최근 n초 안에 조회 → hot
+REFRESH_INTERVAL = float(os.getenv("SHEET_REFRESH_INTERVAL", "5"))
+PROACTIVE_RATIO = 0.8                                             # soft TTL 의 80% 경과 시 미리 갱신
+
+
+def refresh_enabled() -> bool:
+    return os.getenv("SHEET_REFRESH", "1") != "0"
+
+
+def probe_enabled() -> bool:
+    return os.getenv("SHEET_CHANGE_PROBE", "1") != "0"
+
+
+def is_transient_error(e: BaseException) -> bool:
+    """429 / 5xx (gspread APIError, requests HTTPError) → 이전 스냅샷 유지 대상"""
+    status = getattr(getattr(e, "response", None), "status_code", None)
+    return status == 429 or (isinstance(status, int) and status >= 500)
+
+
+# ======================================================================================
+# ✅ 갱신 스케줄러
+# ======================================================================================
+class _Watch(NamedTuple):
+    age: Callable[[], Optional[float]]   # 마지막 읽기 후 경과 초 (없으면 None)
+    refresh: Callable[[], Any]
+    soft_ttl: float
+
+
+class RefreshScheduler:
+    """
+    백그라운드 갱신 작업 + hot 시트 추적
+    - submit(name, fn): 시트별로 대기 중인 작업은 1개만
+    - touch(name): 조회 기록 → hot 판단 (hot_sheets 중 hot_window 안에 조회된 시트)
+    - watch(name, ...): 캐시가 등록한 갱신 함수 → tick() 에서 soft 만료 전에 미리 실행
+    - enabled=False → 캐시는 soft 만료 시 요청 스레드에서 다시 읽음 (백그라운드 갱신 없음)
+    - start() 전에는 run_pending() / tick() 으로 직접 실행 (테스트용)
+    """
+
+    def __init__(self, hot_sheets=HOT_SHEETS, hot_window: float = HOT_WINDOW,
+                 interval: float = REFRESH_INTERVAL, proactive_ratio: float = PROACTIVE_RATIO,
+                 clock=time.monotonic, enabled: bool = True):
+        self.enabled = enabled
+        self.hot_candidates = tuple(hot_sheets)
+        self.hot_window = hot_window
+        self.interval = interval
+        self.proactive_ratio = proactive_ratio
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Callable[[], Any]] = {}
+        self._running: set = set()
+        self._last_access: Dict[str, float] = {}
+        self._watches: Dict[str, _Watch] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --------------------------------------------------
+    # hot 시트
+    # --------------------------------------------------
+    def touch(self, name: str) -> None:
+        self._last_access[name] = self.clock()
+
+    def is_hot(self, name: str) -> bool:
+        last = self._last_access.get(name)
+        return name in self.hot_candidates and last is not None and self.clock() - last <= self.hot_window
+
+    def hot_sheets(self) -> Tuple[str, ...]:
+        return tuple(n for n in self.hot_candidates if self.is_hot(n))
+
+    def watch(self, name: str, age: Callable[[], Optional[float]], refresh: Callable[[], Any],
+              soft_ttl: float) -> None:
+        with self._lock:
+            self._watches[name] = _Watch(age, refresh, soft_ttl)
+
+    # --------------------------------------------------
+    # 작업
+    # --------------------------------------------------
+    def submit(self, name: str, fn: Callable[[], Any]) -> bool:
+        """갱신 작업 예약 (같은 시트 작업이 대기/실행 중이면 무시) → 예약 여부"""
+        with self._lock:
+            if name in self._jobs or name in self._running:
+                return False
+            self._jobs[name] = fn
+        self._wake.set()
+        return True
+
+    def run_pending(self) -> int:
+        """대기 작업 실행 → 실행한 작업 수"""
+        with self._lock:
+            jobs, self._jobs = self._jobs, {}
+            self._running.update(jobs)
+        for name, fn in jobs.items():
+            try:
+                fn()
+            except Exception as e:
+                if is_transient_error(e):
+                    logger.warning("[refresh] %s 갱신 실패 (이전 스냅샷 유지): %s", name, e)
+                else:
+                    logger.exception("[refresh] %s 갱신 실패", name)
+            finally:
+                with self._lock:
+                    self._running.discard(name)
+        return len(jobs)
+
+    def tick(self) -> int:
+        """hot 시트 중 soft 만료가 가까운 스냅샷 갱신 예약 → 예약 수"""
+        with self._lock:
+            watches = dict(self._watches)
+        scheduled = 0
+        for name, w in watches.items():
+            if not self.is_hot(name):
+                continue
+            age = w.age()
+            if age is not None and age >= w.soft_ttl * self.proactive_ratio:
+                scheduled += self.submit(name, w.refresh)
+        return scheduled
+
+    # --------------------------------------------------
+    # 백그라운드 스레드
+    # --------------------------------------------------
+    def start(self) -> "RefreshScheduler":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sheet-refresh", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.tick()
+                self.run_pending()
+            except Exception:
+                logger.exception("[refresh] 갱신 루프 오류")
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 5)
+            self._thread = None
+
+
+@provider("sheet_refresh")
+def get_refresh_scheduler() -> RefreshScheduler:
+    """워커별 갱신 스케줄러 (첫 스냅샷 조회 시 생성, SHEET_REFRESH=0 이면 스레드 없이)"""
+    scheduler = RefreshScheduler(enabled=refresh_enabled())
+    if scheduler.enabled:
+        scheduler.start()
+        atexit.register(scheduler.close)
+    return scheduler
+
+
+# ======================================================================================
+# ✅ 변경 확인 (전체 다시 읽기 전)
+# ======================================================================================
+def drive_modified_time(spreadsheet) -> Optional[str]:
+    """
+    스프레드시트 수정 표시 (gspread get_lastUpdateTime → Drive files.get modifiedTime)
+    - 지원하지 않거나 실패하면 None (→ 전체 다시 읽기)
+    - 같은 스프레드시트 동시 확인은 1건으로 합침
+    """
+    getter = getattr(spreadsheet, "get_lastUpdateTime", None)
+    if getter is None:
+        return None
+    try:
+        return sheet_flight.do(("modifiedTime", id(spreadsheet)), getter)
+    except Exception as e:
+        logger.debug("[refresh] 변경 확인 실패 → 전체 다시 읽기: %s", e)
+        return None
+
+
+def default_probe(spreadsheet) -> Optional[str]:
+    return drive_modified_time(spreadsheet) if probe_enabled() else None
+
+
+# ======================================================================================
+# ✅ 시트 스냅샷 캐시
+# ======================================================================================
+NOT_PROBED = object()   # 아직 변경 확인을 하지 않음 (읽기 직전에 확인)
+PART_SEP = "#"
+
+
+def sheet_of(name: str) -> str:
+    """스냅샷 이름 → 시트 이름 ("DB#회원명" → "DB")"""
+    return name.split(PART_SEP, 1)[0]
+
+
+class _Snapshot(NamedTuple):
+    spreadsheet: Any
+    token: tuple
+    fetched_at: float   # 전체 읽기 시각 (hard TTL 기준)
+    checked_at: float   # 마지막 확인 시각 (soft TTL 기준, 변경 없음 확인 시 갱신)
+    marker: Optional[str]
+    value: Any
+
+
+class SheetSnapshots:
+    """
+    시트 이름 → 마지막으로 읽은 값 (loader 반환값 그대로: records 목록, CompactTable 등)
+    - get(name, spreadsheet, loader): soft/hard TTL 에 따라 캐시 / 이전 값 + 백그라운드 갱신 / 다시 읽기
+    - 동시에 다시 읽는 요청은 utils.single_flight 로 한 번만 호출
+    - probe(spreadsheet): 수정 표시 — 이전 읽기 때와 같으면 전체 읽기 생략 (None → 항상 읽기)
+    - peek(name, spreadsheet): soft TTL 이내 값만 (없으면 None, 읽기/갱신 없음)
+    """
+
+    def __init__(self, policies: Dict[str, SheetPolicy] = SHEET_POLICIES, versions=data_versions,
+                 clock=time.monotonic, flight=sheet_flight,
+                 scheduler: Optional[RefreshScheduler] = None,
+                 probe: Optional[Callable[[Any], Optional[str]]] = default_probe):
+        self.policies = policies
+        self.versions = versions
+        self.clock = clock
+        self.flight = flight
+        self.probe = probe
+        self._scheduler = scheduler
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Snapshot] = {}
+
+    @property
+    def scheduler(self) -> RefreshScheduler:
+        return self._scheduler or get_refresh_scheduler()
+
+    def policy(self, name: str) -> SheetPolicy:
+        return self.policies.get(sheet_of(name), SheetPolicy(0, 0))
+
+    def enabled(self, name: str) -> bool:
+        return self.policy(name).soft_ttl > 0
+
+    def get(self, name: str, spreadsheet, loader: Callable[[], Any], cache: Optional[str] = None) -> Any:
+        cache = cache or f"sheet:{name}"
+        policy = self.policy(name)
+        scheduler = self.scheduler
+        scheduler.touch(sheet_of(name))
+
+        token = self.versions.token([sheet_of(name)])
+        with self._lock:
+            entry = self._entries.get(name)
+        stale = entry if entry is not None and entry.spreadsheet is spreadsheet else None
+
+        marker = NOT_PROBED
+        if stale is not None and stale.token == token:
+            now = self.clock()
+            if now - stale.checked_at < policy.soft_ttl:
+                cache_event(cache, hit=True)
+                return stale.value
+            if now - stale.fetched_at < policy.hard_ttl:
+                if scheduler.enabled:
+                    # soft 만료 → 이전 스냅샷 응답, 백그라운드에서 확인/다시 읽기
+                    cache_event(cache, hit=True)
+                    scheduler.submit(name, lambda: self.refresh(name, spreadsheet, loader))
+                    return stale.value
+                unchanged, marker = self._unchanged(name, spreadsheet, stale)
+                if unchanged:
+                    cache_event(cache, hit=True)
+                    return stale.value
+
+        cache_event(cache, hit=False)
+        try:
+            return self._load(name, spreadsheet, loader, marker)
+        except Exception as e:
+            if stale is not None and stale.token == token and is_transient_error(e):
+                logger.warning("[refresh] %s 다시 읽기 실패 → 이전 스냅샷 응답: %s", name, e)
+                return stale.value
+            raise
+
+    def peek(self, name: str, spreadsheet) -> Any:
+        """soft TTL 이내이고 쓰기가 없었던 값 (없으면 None) — 다른 읽기의 값을 빌려 쓸 때"""
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is None or entry.spreadsheet is not spreadsheet:
+            return None
+        if entry.token != self.versions.token([sheet_of(name)]):
+            return None
+        if self.clock() - entry.checked_at >= self.policy(name).soft_ttl:
+            return None
+        return entry.value
+
+    def refresh(self, name: str, spreadsheet, loader: Callable[[], Any]) -> None:
+        """
+        백그라운드 갱신 (그 사이 다른 스프레드시트로 바뀌었으면 건너뜀)
+        - hard 만료 전이면 변경 확인 먼저, 바뀌지 않았으면 확인 시각만 갱신
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is not None and entry.spreadsheet is not spreadsheet:
+            return
+        marker = NOT_PROBED
+        if entry is not None and self.clock() - entry.fetched_at < self.policy(name).hard_ttl:
+            unchanged, marker = self._unchanged(name, spreadsheet, entry)
+            if unchanged:
+                return
+        self._load(name, spreadsheet, loader, marker)
+
+    def _probe(self, spreadsheet) -> Optional[str]:
+        return self.probe(spreadsheet) if self.probe is not None else None
+
+    def _unchanged(self, name: str, spreadsheet, entry: _Snapshot) -> Tuple[bool, Any]:
+        """(이전 읽기 이후 변경 없음 여부, 이번 확인 값) — 변경 없으면 확인 시각 갱신"""
+        if entry.token != self.versions.token([sheet_of(name)]):
+            return False, NOT_PROBED
+        marker = self._probe(spreadsheet)
+        if entry.marker is None:
+            return False, marker
+        unchanged = marker is not None and marker == entry.marker
+        cache_event("sheet_probe", hit=unchanged)
+        if unchanged:
+            with self._lock:
+                if self._entries.get(name) is entry:
+                    self._entries[name] = entry._replace(checked_at=self.clock())
+        return unchanged, marker
+
+    def _load(self, name: str, spreadsheet, loader: Callable[[], Any], marker: Any = NOT_PROBED) -> Any:
+        # 읽기 전 버전/수정 표시로 기록 → 읽는 도중 바뀌었으면 다음 확인에서 다시 읽음
+        # (첫 읽기는 확인 생략 — 표시가 없는 스냅샷은 다음 갱신 때 전체 읽기와 함께 기록)
+        token = self.versions.token([sheet_of(name)])
+        if marker is NOT_PROBED:
+            with self._lock:
+                entry = self._entries.get(name)
+            known = entry is not None and entry.spreadsheet is spreadsheet
+            marker = self._probe(spreadsheet) if known else None
+        value = self.flight.do((name, id(spreadsheet), token), loader)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry.spreadsheet is not spreadsheet or entry.token <= token:
+                now = self.clock()
+                self._entries[name] = _Snapshot(spreadsheet, token, now, now, marker, value)
+        self.scheduler.watch(name, lambda: self.age(name),
+                             lambda: self.refresh(name, spreadsheet, loader), self.policy(name).soft_ttl)
+        return value
+
+    def age(self, name: str) -> Optional[float]:
+        """마지막 읽기/변경 확인 후 경과 초"""
+        with self._lock:
+            entry = self._entries.get(name)
+        return None if entry is None else self.clock() - entry.checked_at
+
+    def clear(self, name: Optional[str] = None) -> None:
+        """시트 이름이면 그 시트의 부분 읽기 스냅샷도 함께 삭제"""
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k == name or k.startswith(name + PART_SEP)]:
+                self._entries.pop(key, None)
+
+
+sheet_snapshots = SheetSnapshots()
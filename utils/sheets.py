@@ -7,6 +7,7 @@ import re
 import time
 import json
 import base64
+import logging
 from typing import Any, Dict, List, Optional
 
 # =====================================================
@@ -17,6 +18,18 @@ import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 from gspread.exceptions import WorksheetNotFound, APIError
 
+from utils.providers import get_fake_spreadsheet, get_http_session, get_spreadsheet_cached
+from utils import instrument
+from utils.instrument import make_instrumented_client_class
+from utils.metrics import cache_event, count_retry, observe_vision
+from utils.journal import read_with_pending
+from utils.member_rows import MEMBER_SHEET, get_member_rows, member_cache_enabled
+from utils.response_cache import data_versions
+from utils.sheet_refresh import PART_SEP, sheet_snapshots
+from utils.single_flight import sheet_flight
+
+logger = logging.getLogger(__name__)
+
 # =====================================================
 # 환경변수 기반 설정
 # =====================================================
@@ -43,20 +56,36 @@ def get_gspread_client():
     else:  # 로컬 개발용
         creds_path = os.getenv("GOOGLE_CREDENTIALS_PATH", "credentials.json")
         creds = ServiceAccountCredentials.from_json_keyfile_name(creds_path, scope)
-    return gspread.authorize(creds)
+    # ✅ 요청 단위 계측 (호출 수/시간/바이트) 이 가능한 클라이언트
+    return gspread.authorize(creds, client_factory=make_instrumented_client_class())
+
+
+# 테스트/벤치마크용 스프레드시트 교체 (use_spreadsheet)
+_spreadsheet_override = None
+
+
+def use_spreadsheet(spreadsheet=None):
+    """
+    get_spreadsheet() 가 반환할 스프레드시트를 교체
+    - FakeSpreadsheet 등을 넘기면 모든 시트 접근이 해당 객체로 향함
+    - None → 기본 연결(환경변수 기반)로 복귀
+    """
+    global _spreadsheet_override
+    _spreadsheet_override = spreadsheet
 
 
 def get_spreadsheet():
-    client = get_gspread_client()
-    sheet_key = os.getenv("GOOGLE_SHEET_KEY")
-    sheet_title = os.getenv("GOOGLE_SHEET_TITLE")
-
-    if sheet_key:
-        return client.open_by_key(sheet_key)
-    elif sheet_title:
-        return client.open(sheet_title)
-    else:
-        raise EnvironmentError("❌ GOOGLE_SHEET_KEY 또는 GOOGLE_SHEET_TITLE 필요")
+    """
+    스프레드시트 핸들 (처음 호출 시 연결 후 재사용)
+    - use_spreadsheet() 로 지정된 객체가 있으면 우선
+    - SHEETS_BACKEND=fake → 메모리 내 가짜 시트 (utils.fake_gspread)
+    - 그 외 GOOGLE_SHEET_KEY 우선, 없으면 GOOGLE_SHEET_TITLE
+    """
+    if _spreadsheet_override is not None:
+        return _spreadsheet_override
+    if os.getenv("SHEETS_BACKEND", "").strip().lower() == "fake":
+        return get_fake_spreadsheet()
+    return get_spreadsheet_cached()
 
 
 # --------------------------------------------------
@@ -102,6 +131,7 @@ def get_worksheet(sheet_name):
 
     for ws in sheet.worksheets():
         if normalize_text(ws.title).lower() == target:
+            instrument.touch_sheet(ws.title)
             return ws
 
     raise FileNotFoundError(f"❌ 워크시트를 찾을 수 없습니다: {sheet_name}")
@@ -111,34 +141,225 @@ def get_worksheet(sheet_name):
 
 
 
+# --------------------------------------------------
+# ✅ 동시 읽기 합치기
+# --------------------------------------------------
+def _copy_records(records: list) -> list:
+    return [dict(r) for r in records]
+
+
+def read_shared(spreadsheet, sheet_name: str, op: str, fetch, share=None):
+    """
+    같은 시트/범위(op)의 동시 읽기를 API 호출 한 번으로 합침
+    - key 에 시트 데이터 버전 포함 → 쓰기 이후 요청은 쓰기 전 읽기에 합류하지 않음
+    - share: 기다린 요청에 넘길 때 적용할 복사 함수
+    """
+    key = (id(spreadsheet), sheet_name, op, data_versions.token([sheet_name]))
+    return sheet_flight.do(key, fetch, share=share)
+
+
 # --------------------------------------------------
 # ✅ 시트에서 모든 행 불러오기
 # --------------------------------------------------
 def get_rows_from_sheet(sheet_name: str):
     try:
-        client = get_gspread_client()
+        # 환경변수(GOOGLE_SHEET_KEY/TITLE) 기반 스프레드시트 (연결 재사용)
+        spreadsheet = get_spreadsheet()
+
+        if sheet_name == MEMBER_SHEET and member_cache_enabled():
+            # ✅ DB 시트는 압축 행 캐시 (적중 시 워크시트 조회/시트 호출 없음, 행은 읽기 전용 MemberRow)
+            instrument.touch_sheet(sheet_name)
+            return get_member_rows(spreadsheet, lambda: spreadsheet.worksheet(sheet_name).get_all_records())
 
-        # 환경변수에서 Sheet key/title 불러오기
-        sheet_key = os.getenv("GOOGLE_SHEET_KEY")
-        sheet_title = os.getenv("GOOGLE_SHEET_TITLE")
+        if sheet_snapshots.enabled(sheet_name):
+            # ✅ 상담일지 등 hot 시트는 스냅샷 (soft 만료 후 백그라운드 갱신), 호출자 수정 대비 복사본
+            instrument.touch_sheet(sheet_name)
+            return read_with_pending(sheet_name, lambda: _copy_records(sheet_snapshots.get(
+                sheet_name, spreadsheet, lambda: spreadsheet.worksheet(sheet_name).get_all_records())))
 
-        if sheet_key:
-            sheet = client.open_by_key(sheet_key).worksheet(sheet_name)
-        elif sheet_title:
-            sheet = client.open(sheet_title).worksheet(sheet_name)
-        else:
-            raise ValueError("❌ GOOGLE_SHEET_KEY 또는 GOOGLE_SHEET_TITLE 환경변수가 필요합니다.")
+        sheet = spreadsheet.worksheet(sheet_name)
+        instrument.touch_sheet(sheet_name)
 
-        # ✅ dict 리스트 반환
-        return sheet.get_all_records()
+        # ✅ dict 리스트 반환 (일지 write-behind 대기 행 포함, 동시 읽기는 한 번으로)
+        return read_with_pending(sheet_name, lambda: read_shared(
+            spreadsheet, sheet_name, "get_all_records", sheet.get_all_records, share=_copy_records))
 
     except WorksheetNotFound:
         raise ValueError(f"❌ 시트 '{sheet_name}'을(를) 찾을 수 없습니다.")
     except Exception as e:
         raise RuntimeError(f"❌ 시트 데이터 불러오기 실패: {e}")
-    
 
 
+# --------------------------------------------------
+# ✅ 필요한 열만 읽기 (values_batch_get)
+# --------------------------------------------------
+_header_cache: Dict[tuple, tuple] = {}
+
+
+def _sheet_header(spreadsheet, sheet_name: str, refresh: bool = False) -> tuple:
+    """시트 1행(헤더) — 스프레드시트/시트별로 한 번만 읽음 (refresh=True → 다시 읽기)"""
+    key = (id(spreadsheet), sheet_name)
+    header = None if refresh else _header_cache.get(key)
+    if header is None:
+        header = tuple(str(h).strip() for h in spreadsheet.worksheet(sheet_name).row_values(1))
+        _header_cache[key] = header
+    return header
+
+
+def _cell(value) -> str:
+    return "" if value is None else str(value)
+
+
+def _project(value, columns: tuple) -> List[tuple]:
+    """전체 읽기 스냅샷 (CompactTable 또는 records 목록) → 열 tuple 목록"""
+    if hasattr(value, "column"):
+        cols = [value.column(c) for c in columns]
+        return [tuple(_cell(v) for v in row) for row in zip(*cols)] if cols else []
+    return [tuple(_cell(r.get(c, "")) for c in columns) for r in value]
+
+
+def _fetch_columns(spreadsheet, sheet_name: str, columns: tuple,
+                   first: int = 2, last: Optional[int] = None) -> List[tuple]:
+    """
+    헤더 이름 → 열 문자 → '시트'!X1:X 범위 묶음 1회 요청
+    - first/last: 읽을 시트 행 번호 구간 (기본: 2행 ~ 끝)
+    - 2행부터 읽을 때는 헤더 셀도 함께 받아, 열 첫 값이 헤더 이름과 다르면(열 이동/삽입)
+      헤더를 다시 읽고 한 번 더 시도
+    - 헤더에 없는 열은 빈 문자열 (캐시된 헤더였으면 다시 읽어 확인)
+    """
+    check = first <= 2
+    start, end = (1 if check else first), ("" if last is None else last)
+    cached = (id(spreadsheet), sheet_name) in _header_cache
+    for attempt in range(2):
+        header = _sheet_header(spreadsheet, sheet_name, refresh=attempt > 0)
+        present = [c for c in columns if c in header]
+        if attempt == 0 and cached and len(present) < len(columns):
+            continue   # 캐시된 헤더 이후 열이 추가됐을 수 있음
+        ranges = []
+        for c in present:
+            letter = re.sub(r"\d+$", "", gspread.utils.rowcol_to_a1(1, header.index(c) + 1))
+            ranges.append(gspread.utils.absolute_range_name(sheet_name, f"{letter}{start}:{letter}{end}"))
+        data = spreadsheet.values_batch_get(ranges, params={"majorDimension": "COLUMNS"}) if ranges else {}
+
+        fetched = {}
+        for c, vr in zip(present, data.get("valueRanges", [])):
+            fetched[c] = (vr.get("values") or [[]])[0]
+        if check and attempt == 0 and any(not v or str(v[0]).strip() != c for c, v in fetched.items()):
+            continue
+        break
+
+    cols = [fetched.get(c, [])[1 if check else 0:] for c in columns]
+    height = max((len(v) for v in cols), default=0)
+    return [tuple(_cell(v[i]) if i < len(v) else "" for v in cols) for i in range(height)]
+
+
+def read_columns(sheet_name: str, columns, spreadsheet=None) -> List[tuple]:
+    """
+    지정한 열만 읽어 행 tuple 목록 반환 (헤더 제외, 값은 문자열, 순서는 columns 순)
+    - 같은 시트 전체 스냅샷이 soft TTL 이내면 API 호출 없이 거기서 추림
+    - 정책 시트(DB/제품주문/상담일지)는 "시트#열" 스냅샷으로 캐시, 그 외 시트는 동시 읽기만 합침
+    - get_all_records 대비 필요한 열만 전송
+    """
+    columns = tuple(columns)
+    try:
+        spreadsheet = spreadsheet or get_spreadsheet()
+        instrument.touch_sheet(sheet_name)
+        full = sheet_snapshots.peek(sheet_name, spreadsheet)
+        if full is not None:
+            cache_event("sheet_columns", hit=True)
+            return _project(full, columns)
+
+        fetch = lambda: _fetch_columns(spreadsheet, sheet_name, columns)
+        if sheet_snapshots.enabled(sheet_name):
+            name = f"{sheet_name}{PART_SEP}{','.join(columns)}"
+            return list(sheet_snapshots.get(name, spreadsheet, fetch, cache="sheet_columns"))
+        return list(read_shared(spreadsheet, sheet_name, f"columns:{','.join(columns)}", fetch))
+
+    except WorksheetNotFound:
+        raise ValueError(f"❌ 시트 '{sheet_name}'을(를) 찾을 수 없습니다.")
+    except Exception as e:
+        raise RuntimeError(f"❌ 시트 열 불러오기 실패: {e}")
+
+
+# --------------------------------------------------
+# ✅ 최신순 시트 위에서부터 구간 읽기
+# --------------------------------------------------
+WINDOW_ROWS = int(os.getenv("SHEET_WINDOW_ROWS", "200"))   # 첫 구간 행 수
+WINDOW_GROWTH = 2                                         # 다음 구간은 직전의 2배
+
+
+class TopDownRows:
+    """
+    최신순 시트(새 행은 2행에 삽입)를 위에서부터 점점 큰 구간으로 읽는 반복자
+    - 2~201행 → 다음 400행 → 다음 800행 ... 반복을 멈추면 남은 구간은 요청하지 않음
+    - 구간마다 필요한 열만 values_batch_get 1회 (read_columns 와 같은 헤더 확인)
+    - 구간이 통째로 비어 돌아오면 데이터 끝 → 아래 빈 격자 행(row_count 에 포함)은 더 요청하지 않음
+      (구간 끝의 빈 행만으로는 끝으로 보지 않음: COLUMNS 읽기는 끝의 빈 셀을 잘라서 줌)
+    - 요청한 열이 모두 빈 행은 건너뜀 (index 는 건너뛴 행도 셈)
+    - 같은 시트 전체 스냅샷이 soft TTL 이내면 API 호출 없이 거기서 추림
+    - 반영 대기 중인 일지 행은 첫 구간 앞에 합침
+    - total: 대기 행 포함 전체 행 수 (워크시트 격자 행 수 기준, 첫 행을 받기 전에 확정)
+    - index: 마지막으로 내보낸 행의 위치 (대기 행 포함 1부터) → total - index + 1 은 아래에서부터 위치
+    - windows: 실제로 요청한 구간 수
+    """
+
+    def __init__(self, sheet_name: str, columns, spreadsheet=None,
+                 first: int = WINDOW_ROWS, growth: int = WINDOW_GROWTH):
+        self.sheet_name = sheet_name
+        self.columns = tuple(columns)
+        self.spreadsheet = spreadsheet
+        self.first = first
+        self.growth = growth
+        self.total = 0
+        self.index = 0
+        self.windows = 0
+
+    def __iter__(self):
+        try:
+            for row in self._rows():
+                self.index += 1
+                if any(str(v).strip() for v in row):
+                    yield row
+        except WorksheetNotFound:
+            raise ValueError(f"❌ 시트 '{self.sheet_name}'을(를) 찾을 수 없습니다.")
+
+    def _rows(self):
+        ss = self.spreadsheet or get_spreadsheet()
+        name, cols = self.sheet_name, self.columns
+        instrument.touch_sheet(name)
+        header = [list(cols)]
+        row_count = ss.worksheet(name).row_count   # 헤더 포함 (행 위치 키 기준)
+
+        full = sheet_snapshots.peek(name, ss)
+        if full is not None:
+            cache_event("sheet_columns", hit=True)
+            projected = _project(full, cols)
+            rows = read_with_pending(name, lambda: header + projected)[1:]
+            self.total = row_count - 1 + len(rows) - len(projected)
+            yield from rows
+            return
+
+        first, size = 2, self.first
+        while True:
+            last = min(first + size - 1, row_count)
+            window = []
+            if first <= last:
+                window = read_shared(ss, name, f"window:{first}:{last}:{','.join(cols)}",
+                                     lambda: _fetch_columns(ss, name, cols, first, last))
+                self.windows += 1
+                if window and last < row_count:
+                    # 구간 끝 빈 행은 잘려서 옴 → 자리 채움 (다음 구간 행 위치가 밀리지 않음, 순회 때 건너뜀)
+                    window = window + [("",) * len(cols)] * (last - first + 1 - len(window))
+            rows = window
+            if first == 2:
+                rows = read_with_pending(name, lambda: header + window)[1:]
+                self.total = row_count - 1 + len(rows) - len(window)
+            yield from rows
+            # 통째로 빈 구간 → 데이터 끝 (아래 빈 격자 행은 더 요청하지 않음)
+            if last >= row_count or not window:
+                return
+            first, size = last + 1, size * self.growth
+
 
 # --------------------------------------------------
 # ✅ 공통 I/O 유틸
@@ -163,7 +384,8 @@ def delete_row(sheet_or_name, row: int):
         ws = get_worksheet(sheet_or_name)
     else:
         ws = sheet_or_name
-    ws.delete_rows(row)
+    with instrument.writing(ws.title):
+        ws.delete_rows(row)
 
 
 
@@ -171,21 +393,22 @@ def safe_update_cell(sheet, row, col, value, clear_first=True, max_retries=3, de
     """Google Sheets 셀 안전 업데이트 (재시도 포함)"""
     for attempt in range(1, max_retries + 1):
         try:
-            if clear_first:
-                sheet.update_cell(row, col, "")
+            with instrument.writing(sheet.title):
+                if clear_first:
+                    sheet.update_cell(row, col, "")
 
-            print(f"[DEBUG] 시트 업데이트: row={row}, col={col}, value={value}")
-            sheet.update_cell(row, col, value)
+                logger.debug("시트 업데이트: row=%s, col=%s, value=%s", row, col, value)
+                sheet.update_cell(row, col, value)
             return True
         except APIError as e:
             if "429" in str(e):
-           
-                print(f"[⏳ 재시도 {attempt}] 429 오류 → {delay}초 대기")
+                logger.warning("[재시도 %d] 429 오류 → %s초 대기", attempt, delay)
+                count_retry("safe_update_cell")
                 time.sleep(delay)
                 delay *= 2
             else:
                 raise
-    print("[❌ 실패] 최대 재시도 초과")
+    logger.error("safe_update_cell 실패: 최대 재시도 초과 (row=%s, col=%s)", row, col)
     return False
 
 
@@ -237,11 +460,9 @@ def get_backup_sheet():
 
 def get_member_info(member_name: str):
     """DB 시트에서 회원명으로 회원번호/휴대폰번호 조회"""
-    ws = get_member_sheet()
-    records = ws.get_all_records()
-    for row in records:
-        if (row.get("회원명") or "").strip() == member_name.strip():
-            return row.get("회원번호", ""), row.get("휴대폰번호", "")
+    for name, number, phone in read_columns("DB", ("회원명", "회원번호", "휴대폰번호")):
+        if name.strip() == member_name.strip():
+            return number, phone
     return "", ""
 
 
@@ -284,6 +505,7 @@ def _ensure_orders_list(data: Any) -> List[Dict[str, Any]]:
     return []
 
 
+@observe_vision
 def openai_vision_extract_orders(image_bytes: io.BytesIO) -> List[Dict[str, Any]]:
     """
     이미지 → 주문 JSON 추출 (OpenAI Vision 모델)
@@ -321,7 +543,7 @@ def openai_vision_extract_orders(image_bytes: io.BytesIO) -> List[Dict[str, Any]
         "temperature": 0
     }
 
-    r = requests.post(OPENAI_API_URL, headers=headers, json=payload, timeout=60)
+    r = get_http_session().post(OPENAI_API_URL, headers=headers, json=payload, timeout=60)
     r.raise_for_status()
 
     resp = r.json()
@@ -370,15 +592,10 @@ def openai_vision_extract_orders(image_bytes: io.BytesIO) -> List[Dict[str, Any]
 
 
 # --------------------------------------------------
-# ✅ 시트 연결 (전역)
+# ✅ 시트 연결
+# - import 시점에는 연결하지 않음 (utils.providers 에서 첫 사용 시 생성)
 # --------------------------------------------------
-client = get_gspread_client()
 SHEET_KEY = os.getenv("GOOGLE_SHEET_KEY")
-if not SHEET_KEY:
-    raise EnvironmentError("환경변수 GOOGLE_SHEET_KEY가 설정되지 않았습니다.")
-
-spreadsheet = client.open_by_key(SHEET_KEY)
-print(f"시트에 연결되었습니다. (ID={SHEET_KEY})")
 
 
 # ✅ 별칭 (호환성)
@@ -411,8 +628,8 @@ get_delete_order_confirm_sheet = get_product_order_sheet
 
 
 def get_sheet():
-    """스프레드시트 핸들 반환 (전역 spreadsheet 객체)"""
-    return spreadsheet
+    """스프레드시트 핸들 반환 (get_spreadsheet 와 동일, 연결 재사용)"""
+    return get_spreadsheet()
 
 
 # ======================================================================================
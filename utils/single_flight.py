@@ -0,0 +1,94 @@
+"""
+utils/single_flight.py
+같은 시트 읽기 동시 요청 합치기 (single-flight)
+- 같은 key 로 동시에 들어온 읽기는 먼저 온 스레드(leader) 한 번만 실제 호출
+- 나머지(follower)는 leader 결과를 기다려 그대로 받음 (예외도 그대로 전달)
+- follower 대기 시간 초과 → SingleFlightTimeout
+- 호출이 끝나면 key 제거 → 이후 요청은 새로 읽음 (결과를 보관하는 캐시가 아님)
+- 시트 key 에 데이터 버전을 넣으면 쓰기 이후 요청은 쓰기 전에 시작된 읽기에 합류하지 않음
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from utils.metrics import cache_event
+
+
+DEFAULT_TIMEOUT = float(os.getenv("SHEETS_FLIGHT_TIMEOUT", "30"))
+
+
+class SingleFlightTimeout(TimeoutError):
+    """진행 중인 읽기를 기다리다 시간 초과"""
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "followers")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    key → 진행 중인 호출
+    - do(key, fn): 진행 중이면 합류, 없으면 직접 호출
+    - share: follower 에게 넘길 때 적용할 복사 함수 (호출자가 결과를 수정하는 경우)
+      · leader 반환 전에 원본을 복사해 두고, follower 는 그 복사본에서 다시 복사해 받음
+    """
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, name: str = "single_flight"):
+        self.timeout = timeout
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None,
+           share: Optional[Callable[[Any], Any]] = None) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.followers += 1
+
+        if leader:
+            cache_event(self.name, hit=False)
+            result = None
+            try:
+                result = fn()
+                return result
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)   # 이후로는 합류하는 follower 없음
+                    followers = call.followers
+                try:
+                    # leader 가 결과를 돌려받아 수정하기 전에 follower 몫을 복사해 둠
+                    call.result = share(result) if share and followers and call.error is None else result
+                except BaseException as e:
+                    call.error = e   # 복사 실패 → follower 에게도 같은 예외
+                    raise
+                finally:
+                    call.done.set()
+
+        cache_event(self.name, hit=True)
+        wait = self.timeout if timeout is None else timeout
+        if not call.done.wait(wait):
+            raise SingleFlightTimeout(f"진행 중인 읽기 대기 시간 초과 ({wait}s): {key!r}")
+        if call.error is not None:
+            raise call.error
+        return share(call.result) if share else call.result
+
+
+sheet_flight = SingleFlight(name="sheet_read")
@@ -0,0 +1,233 @@
+"""
+utils/unit_of_work.py
+요청 단위 시트 쓰기 묶음 (Unit of Work)
+- 한 요청의 2행 삽입 / 셀 수정·비우기 / 행 삭제를 모아 두었다가 commit() 때 최소 호출로 반영
+  · 셀 수정·비우기 → 시트마다 batch_update 1회 (values.batchUpdate, USER_ENTERED, 같은 행의 연속 열은 한 범위로)
+  · 행 삭제 → 연속 구간마다 delete_rows 1회 (아래 구간부터 → 앞 구간 행 번호 유지)
+  · 2행 삽입 → 시트마다 insert_rows 1회 (먼저 넣은 행이 위)
+- 행 번호는 모두 "묶음 시작 시점" 시트 기준 (반영 순서: 수정 → 삭제 → 삽입)
+  · 같은 셀을 여러 번 쓰면 마지막 값만, 삭제할 행의 수정은 버림
+- 반영 후 row_id_store / order_store 위치·색인을 산술로 함께 갱신
+  · 도중 실패 → 해당 시트 위치·색인 폐기 (다음 조회 때 다시 구축) 후 예외 전달
+- unit_of_work(): with 블록이 중첩되면 바깥 묶음에 합류 → 가장 바깥 블록 종료 때 1회 commit
+  · 블록 안에서 예외 → 모은 쓰기 폐기 (시트에는 아무것도 쓰지 않음)
+"""
+
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import gspread
+from gspread.exceptions import APIError
+
+from utils.metrics import count_retry
+from utils.order_index import ORDER_SHEET, order_store
+from utils.row_ids import row_id_store
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRIES = 3
+RETRY_DELAY = 2
+
+
+def as_written(value: Any) -> str:
+    """시트에 기록된 뒤 다시 읽었을 때의 표시 값 (71000.0 → "71000")"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _retrying(op: str, call, max_retries: int = MAX_RETRIES, delay: float = RETRY_DELAY):
+    """429 → 대기 후 재시도 (safe_update_cell 과 같은 규칙, 429 는 반영되지 않은 요청)"""
+    for attempt in range(1, max_retries + 1):
+        try:
+            return call()
+        except APIError as e:
+            if "429" not in str(e) or attempt == max_retries:
+                raise
+            logger.warning("[unit_of_work] %s 429 → %s초 후 재시도 (%d)", op, delay, attempt)
+            count_retry(f"unit_of_work.{op}")
+            time.sleep(delay)
+            delay *= 2
+
+
+def _runs(rows: Sequence[int]) -> List[Tuple[int, int]]:
+    """행 번호 → 연속 구간 (start, end) 목록 (아래 구간부터)"""
+    runs: List[Tuple[int, int]] = []
+    for row in sorted(set(rows), reverse=True):
+        if runs and runs[-1][0] == row + 1:
+            runs[-1] = (row, runs[-1][1])
+        else:
+            runs.append((row, row))
+    return runs
+
+
+def _ranges(cells: Dict[Tuple[int, int], Any]) -> List[Dict[str, Any]]:
+    """{(행, 열): 값} → batch_update 항목 (같은 행의 연속 열은 한 범위)"""
+    data: List[Dict[str, Any]] = []
+    last: Optional[Tuple[int, int]] = None
+    for row, col in sorted(cells):
+        if last is not None and last == (row, col - 1):
+            data[-1]["values"][0].append(cells[(row, col)])
+            start = data[-1]["range"].split(":")[0]
+            data[-1]["range"] = f"{start}:{gspread.utils.rowcol_to_a1(row, col)}"
+        else:
+            a1 = gspread.utils.rowcol_to_a1(row, col)
+            data.append({"range": f"{a1}:{a1}", "values": [[cells[(row, col)]]]})
+        last = (row, col)
+    return data
+
+
+# ======================================================================================
+# ✅ 시트별 대기 쓰기
+# ======================================================================================
+class _SheetWrites:
+    __slots__ = ("ws", "header", "cells", "deletes", "inserts")
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.header: Optional[List[str]] = None
+        self.cells: Dict[Tuple[int, int], Any] = {}
+        self.deletes: set = set()
+        self.inserts: List[List[Any]] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.cells or self.deletes or self.inserts)
+
+
+class UnitOfWork:
+    """
+    uow.insert_top(ws, values) / uow.update_cell(ws, row, col, value) / uow.clear(ws, row, col)
+    uow.delete_row(ws, row) → uow.commit()
+    - 시트는 워크시트 title 로 구분 (처음 쓴 순서대로 반영)
+    """
+
+    def __init__(self):
+        self._sheets: Dict[str, _SheetWrites] = {}
+        self.calls = 0   # commit 에서 보낸 쓰기 요청 수
+
+    def _writes(self, ws) -> _SheetWrites:
+        writes = self._sheets.get(ws.title)
+        if writes is None:
+            writes = self._sheets[ws.title] = _SheetWrites(ws)
+        return writes
+
+    def __len__(self) -> int:
+        return sum(len(w.cells) + len(w.deletes) + len(w.inserts) for w in self._sheets.values())
+
+    def header(self, ws) -> List[str]:
+        """1행 헤더 (묶음마다 시트당 1회 읽기)"""
+        writes = self._writes(ws)
+        if writes.header is None:
+            writes.header = [str(h).strip() for h in ws.row_values(1)]
+        return writes.header
+
+    # --------------------------------------------------
+    # 모으기
+    # --------------------------------------------------
+    def insert_top(self, ws, values: List[Any]) -> None:
+        """2행 삽입 예약 (같은 묶음에서 먼저 넣은 행이 위)"""
+        self._writes(ws).inserts.append(list(values))
+
+    def update_cell(self, ws, row: int, col: int, value: Any) -> None:
+        self._writes(ws).cells[(row, col)] = value
+
+    def clear(self, ws, row: int, col: int) -> None:
+        self.update_cell(ws, row, col, "")
+
+    def delete_row(self, ws, row: int) -> None:
+        self._writes(ws).deletes.add(row)
+
+    def discard(self) -> None:
+        self._sheets.clear()
+
+    # --------------------------------------------------
+    # 반영
+    # --------------------------------------------------
+    def commit(self) -> Dict[str, Dict[str, int]]:
+        """모은 쓰기 반영 → {시트: {"cells", "deleted", "inserted"}}"""
+        summary: Dict[str, Dict[str, int]] = {}
+        sheets, self._sheets = self._sheets, {}
+        for title, writes in sheets.items():
+            if not writes:
+                continue
+            try:
+                summary[title] = self._commit_sheet(writes)
+            except Exception:
+                logger.exception("[unit_of_work] %s 반영 실패 → 위치/색인 폐기", title)
+                row_id_store.invalidate(writes.ws)
+                if title == ORDER_SHEET:
+                    order_store.invalidate()
+                raise
+        return summary
+
+    def _send(self, op: str, call):
+        result = _retrying(op, call)
+        self.calls += 1
+        return result
+
+    def _commit_sheet(self, writes: _SheetWrites) -> Dict[str, int]:
+        ws, is_order = writes.ws, writes.ws.title == ORDER_SHEET
+        cells = {k: v for k, v in writes.cells.items() if k[0] not in writes.deletes}
+
+        if cells:
+            self._send("batch_update", lambda: ws.batch_update(_ranges(cells), value_input_option="USER_ENTERED"))
+            if is_order:
+                order_store.notify_cells(ws, {k: as_written(v) for k, v in cells.items()})
+
+        for start, end in _runs(writes.deletes):
+            self._send("delete_rows", lambda: row_id_store.delete_rows(ws, start, end))
+            if is_order:
+                order_store.notify_delete_rows(ws, start, end)
+
+        if writes.inserts:
+            rows = writes.inserts
+            ids = self._send("insert_rows", lambda: row_id_store.insert_rows_top(ws, rows, header=writes.header))
+            if is_order:
+                col = row_id_store.id_column(ws, writes.header)
+                for values, row_id in reversed(list(zip(rows, ids))):
+                    values = [as_written(v) for v in values]
+                    if col and row_id:
+                        values += [""] * max(0, col - len(values))
+                        values[col - 1] = row_id
+                    order_store.notify_insert_top(ws, values)
+
+        logger.debug("[unit_of_work] %s: 셀 %d, 삭제 %d, 삽입 %d",
+                     ws.title, len(cells), len(writes.deletes), len(writes.inserts))
+        return {"cells": len(cells), "deleted": len(writes.deletes), "inserted": len(writes.inserts)}
+
+
+# ======================================================================================
+# ✅ 요청 범위
+# ======================================================================================
+_current: contextvars.ContextVar = contextvars.ContextVar("unit_of_work", default=None)
+
+
+def current_unit_of_work() -> Optional[UnitOfWork]:
+    return _current.get()
+
+
+@contextmanager
+def unit_of_work():
+    """
+    with unit_of_work() as uow: ... → 블록 종료 때 commit (예외면 폐기)
+    - 이미 열린 묶음이 있으면 그 묶음에 합류 (commit 은 가장 바깥 블록)
+    """
+    outer = _current.get()
+    if outer is not None:
+        yield outer
+        return
+    uow = UnitOfWork()
+    token = _current.set(uow)
+    try:
+        yield uow
+    except BaseException:
+        uow.discard()
+        raise
+    finally:
+        _current.reset(token)
+    uow.commit()
@@ -14,6 +14,10 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 from flask import request, g
 from utils.sheets import get_worksheet
+from utils.providers import get_http_session
+from utils.metrics import observe_vision
+
+logger = logging.getLogger(__name__)
 
 # =====================================================
 # 외부 라이브러리
@@ -26,9 +30,9 @@ from flask import request, Response, jsonify
 # 내부 모듈
 # =====================================================
 from utils.sheets import (
-    get_gsheet_data,
     get_member_sheet,
     get_rows_from_sheet,
+    read_columns,
 )
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -107,7 +111,7 @@ def process_order_date(raw_date: str) -> str:
             return f"{int(y):04d}-{int(m):02d}-{int(d):02d}"
 
     except Exception as e:
-        print(f"[날짜 파싱 오류] {e}")
+        logger.warning("[날짜 파싱 오류] %s", e)
 
     return now_kst().strftime('%Y-%m-%d')
 
@@ -308,9 +312,7 @@ def clean_member_query(text: str) -> str:
 
     # ✅ 디버그 로그 출력
     if removed_tokens:
-        print(f"[clean_member_query] 원문: '{original}'")
-        print(f"[clean_member_query] 제거된 토큰: {removed_tokens}")
-        print(f"[clean_member_query] 최종 query: '{cleaned}'")
+        logger.debug("[clean_member_query] 원문='%s', 제거된 토큰=%s, 최종 query='%s'", original, removed_tokens, cleaned)
 
     return cleaned
 
@@ -347,9 +349,7 @@ def clean_memo_query(text: str, intent: str = None) -> str:
             text = text.replace(t, "")
 
     if removed_tokens:
-        print(f"[clean_memo_query] 원문: '{original}'")
-        print(f"[clean_memo_query] 제거된 토큰: {removed_tokens}")
-        print(f"[clean_memo_query] 최종 query: '{text.strip()}'")
+        logger.debug("[clean_memo_query] 원문='%s', 제거된 토큰=%s, 최종 query='%s'", original, removed_tokens, text.strip())
 
     return text.strip()
 
@@ -439,18 +439,8 @@ def match_condition(text: str, keywords: list[str], mode: str = "any") -> bool:
 # utils_search
 # ======================================================================================
 
-# ---------------------------------------------------------
-# 로거 설정 (중복 방지 포함)
-# ---------------------------------------------------------
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-if not logger.handlers:  # ✅ 중복 방지
-    handler = logging.StreamHandler()  # 콘솔 출력
-    formatter = logging.Formatter("[%(asctime)s] %(levelname)s in %(module)s: %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-
 from utils.sheets import get_member_sheet
+from utils.member_table import get_member_table
 
 
 
@@ -518,8 +508,6 @@ def search_members(data, search_params, options=None):
     else:
         rows = data
 
-    results = []
-
     # ✅ 검색 모드 기본값
     default_match_mode = {
         "코드": "exact",
@@ -550,54 +538,8 @@ def search_members(data, search_params, options=None):
             # query 가 "회원명" 검색어로 들어왔다고 가정
             search_params = {"회원명": query}
 
-    # ✅ 실제 검색 수행
-    for row in rows:
-        match = True
-        for key, value in search_params.items():
-            if not key:   # ✅ key가 None이면 스킵
-                continue            
-
-            field = key.split("__")[0]
-            field_value = str(row.get(field, "")).strip()  # ✅ 공백 제거
-            mode = match_mode.get(field, "partial")  # 기본은 부분 일치
-
-            # 날짜 비교 (__gte, __lte)
-            if "__gte" in key or "__lte" in key:
-                try:
-                    field_date = datetime.strptime(field_value, "%Y-%m-%d")
-                    search_date = datetime.strptime(value, "%Y-%m-%d")
-                except ValueError:
-                    match = False
-                    break
-
-                if "__gte" in key and field_date < search_date:
-                    match = False
-                    break
-                if "__lte" in key and field_date > search_date:
-                    match = False
-                    break
-                
-            else:
-                fv = field_value.lower()
-                vv = value.strip().lower()
-
-                if mode == "exact":
-                    if fv != vv:
-                        match = False
-                        break
-                elif mode == "partial":
-                    if vv not in fv:
-                        match = False
-                        break
-                else:  # 잘못된 옵션 → exact 처리
-                    if fv != vv:
-                        match = False
-                        break
-
-        if match:
-            results.append(row)
-
-    return results
+    # ✅ 실제 검색 수행 (질의 계획: 인덱스 조건 → 후보, 나머지만 후보에 대해 검사)
+    return get_member_table(rows).search(search_params, {"match_mode": match_mode})
 
 
 
@@ -636,12 +578,25 @@ def parse_natural_query(query: str):
     if "어제" in query:
         yesterday = today - timedelta(days=1)
         conditions["가입일"] = yesterday.strftime("%Y-%m-%d")
-    if "이번 달" in query:
+    # ✅ 생일 (연도 무관, 매년 반복) → 생년월일__month
+    birthday = "생일" in query
+    if birthday:
+        month_match = re.search(r"(\d{1,2})\s*월", query)
+        if month_match and 1 <= int(month_match.group(1)) <= 12:
+            conditions["생년월일__month"] = int(month_match.group(1))
+        elif re.search(r"다음\s*달", query):
+            conditions["생년월일__month"] = today.month % 12 + 1
+        elif re.search(r"지난\s*달", query):
+            conditions["생년월일__month"] = (today.month - 2) % 12 + 1
+        elif re.search(r"이번\s*달", query):
+            conditions["생년월일__month"] = today.month
+
+    if "이번 달" in query and not birthday:
         first_day = today.replace(day=1)
         last_day = today.replace(day=calendar.monthrange(today.year, today.month)[1])
         conditions["가입일__gte"] = first_day.strftime("%Y-%m-%d")
         conditions["가입일__lte"] = last_day.strftime("%Y-%m-%d")
-    if "지난 달" in query:
+    if "지난 달" in query and not birthday:
         last_month = today.month - 1 or 12
         year = today.year if today.month > 1 else today.year - 1
         first_day = datetime(year, last_month, 1)
@@ -710,24 +665,26 @@ def searchMemberByNaturalText(query: str):
     """
 
     query = query.strip().lower()
-    logger.info(f"searchMemberByNaturalText called with query='{query}'")
+    logger.info("searchMemberByNaturalText called with query='%s'", query)
+
+    table = get_member_table(get_rows_from_sheet("DB"))
 
     # ✅ "코드a" 또는 "코드 a"
     if query in ["코드a", "코드 a"]:
         logger.info("→ 특수 규칙 매칭: 코드=A")
-        return find_all_members_from_sheet("DB", field="코드", value="A")
+        return table.search({"코드__exact": "A"})
 
     # ✅ "코드 + 알파벳" 패턴
     if query.startswith("코드"):
         code_value = query.replace("코드", "").strip().upper()
         if code_value:
-            logger.info(f"→ 코드 패턴 매칭: 코드={code_value}")
-            return find_all_members_from_sheet("DB", field="코드", value=code_value)
+            logger.info("→ 코드 패턴 매칭: 코드=%s", code_value)
+            return table.search({"코드__exact": code_value})
 
     # ✅ fallback 경로
     conditions = fallback_natural_search(query)
-    logger.info(f"→ fallback 경로 실행, conditions={conditions}")
-    return search_members(get_gsheet_data(), conditions)
+    logger.info("→ fallback 경로 실행, conditions=%s", conditions)
+    return search_members(table.rows, conditions)
 
 
 
@@ -735,48 +692,12 @@ def searchMemberByNaturalText(query: str):
 # 3. 검색 실행 (구글시트 데이터 필터링)
 # ---------------------------------------------------------
 def search_member(query: str) -> Dict:
-    members_data = get_gsheet_data()
+    members_data = get_rows_from_sheet("DB")
     normalized = normalize_query(query)
     conditions = parse_natural_query(normalized)
 
-    results = []
-    for row in members_data:
-        match = True
-        for key, value in conditions.items():
-            field = key.replace("__gte", "").replace("__lte", "")
-            field_value = row.get(field, "")
-
-            # ✅ 날짜 비교
-            if "__gte" in key or "__lte" in key:
-                try:
-                    field_date = datetime.strptime(str(field_value), "%Y-%m-%d")
-                    search_date = datetime.strptime(value, "%Y-%m-%d")
-                except ValueError:
-                    match = False
-                    break
-
-                if "__gte" in key and field_date < search_date:
-                    match = False
-                    break
-                if "__lte" in key and field_date > search_date:
-                    match = False
-                    break
-
-            else:
-                # ✅ 일반 비교 (대소문자 무시, 코드/회원번호는 exact)
-                fv = str(field_value).strip().lower()
-                vv = value.strip().lower()
-                if field in ["코드", "회원번호"]:
-                    if fv != vv:
-                        match = False
-                        break
-                else:
-                    if vv not in fv:  # 부분 일치 허용
-                        match = False
-                        break
-
-        if match:
-            results.append(row)
+    # ✅ 날짜(__gte/__lte) 비교 + 코드/회원번호 exact, 나머지 부분 일치
+    results = get_member_table(members_data).search(conditions)
 
     return {
         "original": query,
@@ -799,8 +720,7 @@ def find_member_in_text(text: str) -> str | None:
     if not text:
         return None
 
-    sheet = get_member_sheet()
-    member_names = sheet.col_values(1)[1:]  # 첫 행은 헤더 제외
+    member_names = [name for (name,) in read_columns("DB", ("회원명",))]  # 회원명 열만
 
     # 긴 이름부터 매칭되도록 정렬 (예: '김철수' > '김')
     member_names = sorted([n.strip() for n in member_names if n], key=len, reverse=True)
@@ -927,15 +847,6 @@ def filter_results_by_member(results, member_name):
 
 
 
-# 로거 설정
-logger = logging.getLogger("utils_memo")
-logger.setLevel(logging.DEBUG)
-if not logger.handlers:  # 중복 등록 방지
-    ch = logging.StreamHandler()
-    ch.setLevel(logging.DEBUG)
-    formatter = logging.Formatter('[%(asctime)s] [%(levelname)s] %(message)s')
-    ch.setFormatter(formatter)
-    logger.addHandler(ch)
 
 
 
@@ -949,7 +860,7 @@ def handle_search_memo(data: dict):
     # 1) 자연어 요청 (text 필드가 있는 경우)
     if "text" in data:
         query = data["text"].strip()
-        logger.info(f"[FromText-Direct] text 필드 감지 → searchMemoFromText 실행 | query='{query}'")
+        logger.info("[FromText-Direct] text 필드 감지 → searchMemoFromText 실행 | query='%s'", query)
 
         res = call_searchMemoFromText({"text": query})
 
@@ -975,7 +886,7 @@ def handle_search_memo(data: dict):
             date_text = f"{data['start_date']}부터 {data['end_date']}까지"
 
         query = f"{mode}일지 검색 {search_mode_text} {date_text}".strip()
-        logger.info(f"[FromText-Converted] keywords 없음 → query 변환 후 searchMemoFromText 실행 | query='{query}'")
+        logger.info("[FromText-Converted] keywords 없음 → query 변환 후 searchMemoFromText 실행 | query='%s'", query)
 
         res = call_searchMemoFromText({"text": query})
 
@@ -993,7 +904,7 @@ def handle_search_memo(data: dict):
         return res
 
     # 3) 정상 content 기반 요청 → searchMemo 실행
-    logger.info(f"[Content-Mode] keywords 감지 → searchMemo 실행 | keywords={data.get('keywords')}, mode={data.get('mode')}")
+    logger.info("[Content-Mode] keywords 감지 → searchMemo 실행 | keywords=%s, mode=%s", data.get("keywords"), data.get("mode"))
     return call_searchMemo(data)
 
 
@@ -1016,17 +927,21 @@ def handle_search_memo(data: dict):
 # ✅ 환경변수에서 API URL 읽기
 MEMBERSLIST_API_URL = os.getenv("MEMBERSLIST_API_URL")
 
-if not MEMBERSLIST_API_URL:
-    raise RuntimeError("❌ 환경변수 MEMBERSLIST_API_URL 이 설정되지 않았습니다. .env 파일을 확인하세요.")
+
+def _memberslist_url(path: str) -> str:
+    """MEMBERSLIST_API_URL + path (미설정 시 호출 시점에 오류)"""
+    if not MEMBERSLIST_API_URL:
+        raise RuntimeError("❌ 환경변수 MEMBERSLIST_API_URL 이 설정되지 않았습니다. .env 파일을 확인하세요.")
+    return f"{MEMBERSLIST_API_URL.rstrip('/')}{path}"
 
 
 def call_searchMemo(payload: dict):
     """
     searchMemo API 호출 (키워드 기반 검색)
     """
-    url = f"{MEMBERSLIST_API_URL.rstrip('/')}/search_memo"
+    url = _memberslist_url("/search_memo")
     try:
-        r = requests.post(url, json=payload, timeout=30)
+        r = get_http_session().post(url, json=payload, timeout=30)
         r.raise_for_status()
         return r.json().get("results", [])
     except requests.RequestException as e:
@@ -1037,9 +952,9 @@ def call_searchMemoFromText(payload: dict):
     """
     searchMemoFromText API 호출 (자연어 검색)
     """
-    url = f"{MEMBERSLIST_API_URL.rstrip('/')}/search_memo"
+    url = _memberslist_url("/search_memo")
     try:
-        r = requests.post(url, json=payload, timeout=30)
+        r = get_http_session().post(url, json=payload, timeout=30)
         r.raise_for_status()
         return r.json().get("results", [])
     except requests.RequestException as e:
@@ -1229,26 +1144,22 @@ def run_intent_func(func, query=None, options=None, **extra_kwargs):
 # ===============================================
 # ✅ GPT Vision 기반 이미지 파서
 # ===============================================
+@observe_vision
 def extract_order_from_uploaded_image(image_bytes):
     """
     주문서 이미지에서 JSON 구조의 주문 데이터를 추출합니다.
     """
     import os
-    print("📌 [DEBUG] extract_order_from_uploaded_image 함수 호출됨")  # ✅ 디버깅 로그 추가
-
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     OPENAI_API_URL = os.getenv("OPENAI_API_URL")
 
-    print(f"📌 [DEBUG] OPENAI_API_KEY 설정됨? {bool(OPENAI_API_KEY)}")
-    print(f"📌 [DEBUG] OPENAI_API_URL: {OPENAI_API_URL}")
-
     if not OPENAI_API_KEY or not OPENAI_API_URL:
         return {
             "error": "❌ OPENAI_API_KEY 또는 OPENAI_API_URL 환경변수가 설정되지 않았습니다."
         }
 
     image_base64 = base64.b64encode(image_bytes.getvalue()).decode("utf-8")
-    print(f"📌 [DEBUG] base64 변환 완료, 길이={len(image_base64)}")
+    logger.debug("[vision] base64 변환 완료, 길이=%d", len(image_base64))
 
     headers = {
         "Authorization": f"Bearer {OPENAI_API_KEY}",
@@ -1281,29 +1192,26 @@ def extract_order_from_uploaded_image(image_bytes):
     }
 
     try:
-        print(f"📌 [DEBUG] OpenAI API 호출 시작 → {OPENAI_API_URL}")
-        response = requests.post(OPENAI_API_URL, headers=headers, json=payload)
-        print(f"📌 [DEBUG] 응답 코드: {response.status_code}")
+        response = get_http_session().post(OPENAI_API_URL, headers=headers, json=payload)
+        logger.debug("[vision] 응답 코드: %s", response.status_code)
         response.raise_for_status()
         result_text = response.json()["choices"][0]["message"]["content"]
-        print(f"📌 [DEBUG] 응답 내용: {result_text[:200]}...")  # 앞 200자만 출력
+        logger.debug("[vision] 응답 내용(앞 200자): %.200s", result_text)
     except Exception as e:
-        print(f"❌ [DEBUG] OpenAI API 호출 실패: {str(e)}")
+        logger.error("[vision] OpenAI API 호출 실패: %s", e)
         return {"error": f"OpenAI API 호출 실패: {str(e)}"}
 
     # ✅ 코드블록 제거
     clean_text = re.sub(r"```(?:json)?(.*?)```", r"\1", result_text, flags=re.DOTALL).strip()
-    print(f"📌 [DEBUG] 코드블록 제거 후 텍스트: {clean_text[:200]}...")
 
     try:
         order_data = json.loads(clean_text)
         if not isinstance(order_data, dict) or "orders" not in order_data:
-            print("❌ [DEBUG] orders 필드 없음")
+            logger.warning("[vision] orders 필드 없음")
             return {"error": "orders 필드가 없습니다", "raw_text": result_text}
-        print("✅ [DEBUG] JSON 파싱 성공")
         return order_data
     except json.JSONDecodeError:
-        print("❌ [DEBUG] JSON 파싱 실패")
+        logger.warning("[vision] JSON 파싱 실패")
         return {"error": "JSON 파싱 실패", "raw_text": result_text}
 
 
@@ -1328,7 +1236,7 @@ def parse_order_from_text(text: str):
         "temperature": 0.0
     }
 
-    resp = requests.post(OPENAI_API_URL, headers=headers, json=payload)
+    resp = get_http_session().post(OPENAI_API_URL, headers=headers, json=payload)
     resp.raise_for_status()
     return resp.json()
 